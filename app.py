@@ -7,7 +7,8 @@ import streamlit as st
 import os
 from dotenv import load_dotenv
 from datetime import datetime
-from utils.path_generator import LearningPathGenerator
+from utils.path_generator import get_shared_generator
+from utils.focus_suggestions import get_focus_suggestions
 from utils.auth import init_cookie_manager, check_password, render_login_screen, logout
 
 # Page configuration
@@ -587,7 +588,8 @@ def render_template_conversation(generator):
             with st.spinner("🧠 AI is analyzing and generating personalized focus areas..."):
                 try:
                     ai_client = generator.get_ai_client()
-                    suggestions = ai_client.get_ai_suggestions_for_focus_areas(template.to_dict(), proficiency)
+                    # Served from the precomputed artifact when available
+                    suggestions = get_focus_suggestions(ai_client, template, proficiency)
                     custom_state['ai_suggestions'] = suggestions
                     custom_state['show_ai_suggestions'] = True
                     st.rerun()
@@ -1118,8 +1120,10 @@ def render_custom_goal_form(generator, template=None, key_prefix=""):
 
         with st.spinner(f"🤖 AI is creating your personalized {selected_type.split()[0].lower()} plan..."):
             try:
-                # Generate goal plan with scheduling parameters
-                learning_path = generator.create_learning_path(
+                # Generate goal plan with scheduling parameters; days are saved as they arrive
+                progress = st.progress(0.0, text="Waiting for the first day...")
+                learning_path = None
+                for event in generator.create_learning_path_stream(
                     goal,
                     timeframe,
                     goal_type,
@@ -1128,7 +1132,19 @@ def render_custom_goal_form(generator, template=None, key_prefix=""):
                     unavailable_dates_input=unavailable_dates_input if unavailable_dates_input.strip() else None,
                     skip_weekends=skip_weekends,
                     skip_weekdays=skip_weekdays if skip_weekdays else None
-                )
+                ):
+                    if event['type'] == 'days':
+                        latest = event['topics'][-1]
+                        progress.progress(
+                            min(1.0, event['saved'] / max(timeframe, 1)),
+                            text=f"📝 {event['saved']} of {timeframe} days ready — Day {latest['day']}: {latest['topic']}"
+                        )
+                    else:
+                        learning_path = event['plan']
+                progress.empty()
+
+                if learning_path.get('truncated'):
+                    st.warning("⚠️ Generation stopped early; every completed day was saved.")
 
                 # Store in session state
                 st.session_state.generated_path = learning_path
@@ -1231,7 +1247,8 @@ def render_saved_paths(generator):
         "Archived": "archived"
     }
 
-    paths = generator.get_paths_by_status(status_map[status_filter])
+    # Paths and their progress in one query, so the sidebar cost doesn't grow per goal
+    paths = generator.get_paths_with_stats(status_map[status_filter])
 
     if not paths:
         st.info("No learning paths yet. Create your first one above!")
@@ -1245,9 +1262,7 @@ def render_saved_paths(generator):
         status = path.get('status', 'active')
         goal_type = path.get('goal_type', 'learning')
 
-        # Get progress stats
-        stats = generator.get_progress_stats(path_id)
-        progress = stats['progress_percentage']
+        progress = path['stats']['progress_percentage']
 
         # Status badge
         status_colors = {
@@ -1524,6 +1539,21 @@ Your goal plan tasks will appear as scheduled events with all details!
     if start_date:
         st.markdown("---")
 
+        # Result of the last reschedule, shown once after the rerun
+        from utils.date_scheduler import format_date_display
+
+        reschedule_result = st.session_state.pop('rescheduled_topics', None)
+        if reschedule_result and reschedule_result['path_id'] == path_id:
+            moved = reschedule_result['moved']
+            if moved:
+                st.success(f"✅ Plan rescheduled: {len(moved)} topic{'s' if len(moved) != 1 else ''} moved")
+                for topic in curriculum:
+                    if topic['id'] in moved:
+                        old_display = format_date_display(moved[topic['id']]) or "no date"
+                        st.caption(f"Day {topic['day']}: {topic['topic']} — {old_display} → {format_date_display(topic['due_date'])}")
+            else:
+                st.info("Schedule updated; no due dates needed to change.")
+
         with st.expander("📅 Reschedule Plan"):
             st.caption("Adjust your schedule for incomplete topics while keeping completed ones unchanged")
 
@@ -1557,43 +1587,44 @@ Your goal plan tasks will appear as scheduled events with all details!
             )
 
             if st.button("Reschedule Incomplete Topics", type="primary"):
-                from utils.date_scheduler import parse_unavailable_dates, reschedule_incomplete_topics
-                import json
+                from utils.date_intervals import DateIntervalIndex
+                from utils.date_scheduler import parse_unavailable_intervals, first_changed_date, reschedule_diff
 
                 # Parse new unavailable dates
-                unavailable_dates_list = []
-                if new_unavailable_dates and new_unavailable_dates.strip():
-                    unavailable_dates_list = parse_unavailable_dates(new_unavailable_dates)
+                unavailable_index = DateIntervalIndex(parse_unavailable_intervals(new_unavailable_dates))
+
+                # Work out where the edit starts to matter, then only recompute from there
+                try:
+                    old_start = datetime.strptime(start_date, '%Y-%m-%d').date()
+                except (TypeError, ValueError):
+                    old_start = None
+                old_index = DateIntervalIndex.from_json(path_info.get('unavailable_dates'))
 
-                # Reschedule incomplete topics
-                rescheduled_topics = reschedule_incomplete_topics(
+                diff = reschedule_diff(
                     curriculum,
                     new_start_date,
                     new_hours_per_day,
-                    unavailable_dates_list,
+                    unavailable_index,
                     weekly_pattern=None,
                     skip_weekends=False,
-                    skip_weekdays=None
+                    skip_weekdays=None,
+                    changed_from=first_changed_date(old_start, new_start_date, current_hours,
+                                                    new_hours_per_day, old_index, unavailable_index)
                 )
 
-                # Update database
-                for topic in rescheduled_topics:
-                    if not topic.get('is_completed', False):
-                        generator.db.update_topic_due_date(topic['id'], topic['due_date'])
-
-                # Update path schedule in database
-                unavailable_json = None
-                if unavailable_dates_list:
-                    unavailable_json = json.dumps([d.strftime('%Y-%m-%d') for d in unavailable_dates_list])
-
-                generator.db.update_path_schedule(
+                # Update path schedule and the moved due dates in one transaction
+                generator.db.bulk_update_due_dates(
                     path_id,
+                    [(topic_id, new_due) for topic_id, _old_due, new_due in diff],
                     start_date=new_start_date.strftime('%Y-%m-%d'),
                     hours_per_day=new_hours_per_day,
-                    unavailable_dates=unavailable_json
+                    unavailable_dates=unavailable_index.to_json()
                 )
 
-                st.success("✅ Plan rescheduled successfully!")
+                st.session_state.rescheduled_topics = {
+                    'path_id': path_id,
+                    'moved': {topic_id: old_due for topic_id, old_due, _new_due in diff}
+                }
                 st.rerun()
 
     st.markdown("---")
@@ -1908,17 +1939,9 @@ Format your response in 3 clear sections with those headers."""
                             label_visibility="collapsed"
                         )
 
-                        # Auto-save on change
+                        # Auto-save on change (buffered and written in batches)
                         if resource_links != current_links:
-                            conn = generator.db.get_connection()
-                            cursor = conn.cursor()
-                            cursor.execute("""
-                                UPDATE topics
-                                SET resource_links = ?
-                                WHERE id = ?
-                            """, (resource_links, topic_id))
-                            conn.commit()
-                            conn.close()
+                            generator.db.update_resource_links(topic_id, resource_links)
 
                         # Display links as clickable
                         if resource_links and resource_links.strip():
@@ -2039,53 +2062,67 @@ Format your response in 3 clear sections with those headers."""
                         'content': user_msg
                     })
 
-                    # Get AI response
-                    with st.spinner(f"AI Tutor ({clean_model}) is thinking..."):
-                        try:
-                            if uploaded_file and uploaded_file.type.startswith('image/'):
-                                # Image analysis
+                    # Get AI response (text answers stream in as they are generated).
+                    # A hedge or fallback may answer instead of the chosen model.
+                    answered_by = {}
+                    try:
+                        if uploaded_file and uploaded_file.type.startswith('image/'):
+                            # Image analysis
+                            with st.spinner(f"AI Tutor ({clean_model}) is thinking..."):
                                 image_data = uploaded_file.read()
                                 prompt = user_question if user_question.strip() else "Analyze this image and explain what you see. If it contains any problems or questions, solve them."
                                 response = generator.analyze_uploaded_image(image_data, prompt, clean_model)
-                            elif uploaded_file:
-                                # Text file handling (PDF, TXT, DOCX)
-                                file_content = ""
-                                if uploaded_file.type == "application/pdf":
-                                    try:
-                                        import PyPDF2
-                                        import io
-                                        pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.read()))
-                                        for page in pdf_reader.pages:
-                                            file_content += page.extract_text()
-                                    except:
-                                        file_content = "(Could not extract PDF text)"
-                                elif uploaded_file.type == "text/plain":
-                                    file_content = uploaded_file.read().decode('utf-8')
-                                elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
-                                    try:
-                                        import docx
-                                        import io
-                                        doc = docx.Document(io.BytesIO(uploaded_file.read()))
-                                        file_content = "\n".join([para.text for para in doc.paragraphs])
-                                    except:
-                                        file_content = "(Could not extract document text)"
-
-                                full_question = f"Based on this document:\n\n{file_content[:2000]}...\n\n{user_question}"
-                                response = generator.get_assistance(full_question, current_context, clean_model)
-                            else:
-                                # Regular text question
-                                response = generator.get_assistance(user_question, current_context, clean_model)
-
-                            # Add AI response to history with model info
-                            st.session_state[f'chat_history_{path_id}'].append({
-                                'role': 'assistant',
-                                'content': response,
-                                'model': clean_model
-                            })
+                        elif uploaded_file:
+                            # Text file handling (PDF, TXT, DOCX)
+                            file_content = ""
+                            if uploaded_file.type == "application/pdf":
+                                try:
+                                    import PyPDF2
+                                    import io
+                                    pdf_reader = PyPDF2.PdfReader(io.BytesIO(uploaded_file.read()))
+                                    for page in pdf_reader.pages:
+                                        file_content += page.extract_text()
+                                except:
+                                    file_content = "(Could not extract PDF text)"
+                            elif uploaded_file.type == "text/plain":
+                                file_content = uploaded_file.read().decode('utf-8')
+                            elif uploaded_file.type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+                                try:
+                                    import docx
+                                    import io
+                                    doc = docx.Document(io.BytesIO(uploaded_file.read()))
+                                    file_content = "\n".join([para.text for para in doc.paragraphs])
+                                except:
+                                    file_content = "(Could not extract document text)"
+
+                            full_question = f"Based on this document:\n\n{file_content[:2000]}...\n\n{user_question}"
+                            tutor_label = st.empty()
+                            tutor_label.markdown(f"**AI Tutor ({clean_model}):**")
+                            response = st.write_stream(
+                                generator.stream_assistance(full_question, current_context, clean_model,
+                                                            answered_by=answered_by)
+                            )
+                            tutor_label.markdown(f"**AI Tutor ({answered_by.get('model', clean_model)}):**")
+                        else:
+                            # Regular text question
+                            tutor_label = st.empty()
+                            tutor_label.markdown(f"**AI Tutor ({clean_model}):**")
+                            response = st.write_stream(
+                                generator.stream_assistance(user_question, current_context, clean_model,
+                                                            answered_by=answered_by)
+                            )
+                            tutor_label.markdown(f"**AI Tutor ({answered_by.get('model', clean_model)}):**")
 
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error: {str(e)}\n\nMake sure the API key for this provider is configured in your .env file.")
+                        # Add AI response to history with model info
+                        st.session_state[f'chat_history_{path_id}'].append({
+                            'role': 'assistant',
+                            'content': response,
+                            'model': answered_by.get('model', clean_model)
+                        })
+
+                        st.rerun()
+                    except Exception as e:
+                        st.error(f"Error: {str(e)}\n\nMake sure the API key for this provider is configured in your .env file.")
                 else:
                     st.warning("Please enter a question or upload a file")
 
@@ -2368,44 +2405,46 @@ def render_general_ai_chat():
                     'content': user_message
                 })
 
-                # Generate AI response
-                with st.spinner(f"🤖 {selected_model} is thinking..."):
-                    try:
-                        provider = available_providers[selected_model]
+                # Generate AI response, streaming it in as it is produced
+                try:
+                    provider = available_providers[selected_model]
 
-                        # Build conversation context
-                        conversation = "\n".join([
-                            f"{'User' if msg['role'] == 'user' else 'AI'}: {msg['content']}"
-                            for msg in st.session_state.general_chat_history[-10:]  # Last 10 messages for context
-                        ])
+                    # Build conversation context
+                    conversation = "\n".join([
+                        f"{'User' if msg['role'] == 'user' else 'AI'}: {msg['content']}"
+                        for msg in st.session_state.general_chat_history[-10:]  # Last 10 messages for context
+                    ])
 
-                        system_prompt = """You are a helpful AI career and learning advisor.
+                    system_prompt = """You are a helpful AI career and learning advisor.
 Help users make informed decisions about their goals, learning paths, and career choices.
 Be conversational, encouraging, and provide actionable advice.
 Keep responses concise (3-5 sentences) but insightful."""
 
-                        response = provider.generate_text(
+                    st.markdown(f"**AI ({selected_model}):**")
+                    response = st.write_stream(
+                        chunk.text for chunk in provider.stream_text(
                             prompt=user_message,
                             system_prompt=system_prompt,
                             max_tokens=1000
                         )
+                    )
 
-                        # Add AI response to history
-                        st.session_state.general_chat_history.append({
-                            'role': 'assistant',
-                            'content': response,
-                            'model': selected_model
-                        })
+                    # Add AI response to history
+                    st.session_state.general_chat_history.append({
+                        'role': 'assistant',
+                        'content': response,
+                        'model': selected_model
+                    })
 
-                        # Auto-read response if enabled
-                        if st.session_state.get('general_chat_auto_read_responses', False):
-                            from utils.voice_handler import text_to_speech
-                            text_to_speech(response)
+                    # Auto-read response if enabled
+                    if st.session_state.get('general_chat_auto_read_responses', False):
+                        from utils.voice_handler import text_to_speech
+                        text_to_speech(response)
 
-                        st.rerun()
+                    st.rerun()
 
-                    except Exception as e:
-                        st.error(f"Error generating response: {str(e)}")
+                except Exception as e:
+                    st.error(f"Error generating response: {str(e)}")
             else:
                 st.warning("Please enter a message first!")
 
@@ -2430,8 +2469,8 @@ def main():
         return
 
     try:
-        # Initialize generator
-        generator = LearningPathGenerator()
+        # Get the process-wide generator (built once, reused across reruns)
+        generator = get_shared_generator()
 
         # Sidebar
         with st.sidebar:
@@ -2454,6 +2493,11 @@ def main():
             if st.button("🚪 Logout", use_container_width=True, type="secondary"):
                 logout(cookies)
 
+        # Flush buffered edits when the user navigates to another goal or page
+        if st.session_state.get('viewed_path_id') != st.session_state.current_path_id:
+            generator.db.flush_resource_links()
+            st.session_state.viewed_path_id = st.session_state.current_path_id
+
         # Main content
         if st.session_state.current_path_id:
             # Show progress tracker
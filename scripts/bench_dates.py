@@ -0,0 +1,163 @@
+"""
+Date scheduling benchmark for LearnPath AI
+Times calculate_calendar_dates against the original day-by-day scheduler,
+and the compiled date grammar against the original strptime-based parser
+
+The original implementations are the frozen reference copies kept in
+tests/test_date_scheduler.py, so both sides are measured in the same
+interpreter on identical inputs, and their results are checked before any
+timing is reported.
+
+Run from the repository root:
+    python scripts/bench_dates.py [--runs 5] [--horizons 90,365,1825] [--expressions 2000]
+
+Each horizon is a plan of roughly that many calendar days: topics of mixed
+size, weekends off, and a few blocked ranges (holidays, one long break).
+The parser is timed on random unavailable-date expressions mixing every
+supported format with invalid parts, both without memoization (first
+parse of an expression) and memoized (the same expression on a rerun).
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from test_date_scheduler import (  # noqa: E402
+    _reference_due_dates,
+    _reference_parse_unavailable_dates,
+    random_expression
+)
+from utils.date_scheduler import (  # noqa: E402
+    _parse_intervals,
+    calculate_calendar_dates,
+    parse_unavailable_dates,
+    parse_unavailable_intervals
+)
+
+START = date(2025, 1, 6)
+
+
+def make_schedule(horizon_days: int, seed: int = 0) -> Dict:
+    """A plan that spans about horizon_days calendar days"""
+    rng = random.Random(seed)
+    blocked = []
+    for _ in range(max(1, horizon_days // 60)):
+        first = START + timedelta(days=rng.randint(0, horizon_days))
+        blocked.extend(first + timedelta(days=i) for i in range(rng.randint(1, 5)))
+    long_break = START + timedelta(days=horizon_days // 2)
+    blocked.extend(long_break + timedelta(days=i) for i in range(min(30, horizon_days // 10)))
+
+    # Weekends off; topics average a little over one working day each
+    hours = [rng.choice([1, 2, 2, 3, 4]) for _ in range(max(1, horizon_days * 5 // 7 // 2))]
+    return {
+        'start_date': START,
+        'estimated_hours': hours,
+        'hours_per_day': 2.0,
+        'unavailable_dates': sorted(set(blocked)),
+        'weekly_pattern': None,
+        'skip_weekends': True,
+        'skip_weekdays': None,
+    }
+
+
+def best_and_median(call: Callable, runs: int) -> List[float]:
+    times = []
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - started)
+    return [min(times), statistics.median(times)]
+
+
+def bench_calendar(horizon_days: int, runs: int):
+    schedule = make_schedule(horizon_days)
+    args = (schedule['hours_per_day'], schedule['unavailable_dates'], schedule['weekly_pattern'],
+            schedule['skip_weekends'], schedule['skip_weekdays'])
+    topics = [{'day': i + 1, 'estimated_hours': h} for i, h in enumerate(schedule['estimated_hours'])]
+
+    def reference():
+        return _reference_due_dates(schedule['start_date'], schedule['estimated_hours'], *args)
+
+    def current():
+        return calculate_calendar_dates(schedule['start_date'], topics, *args)
+
+    expected = reference()
+    if [t['due_date'] for t in current()] != expected:
+        raise SystemExit(f"calendar results differ from the reference at horizon {horizon_days}")
+
+    old_best, old_median = best_and_median(reference, runs)
+    new_best, new_median = best_and_median(current, runs)
+    span = (date.fromisoformat(expected[-1]) - START).days + 1
+    print(f"  {horizon_days:>6} days  {len(topics):>5} topics  {len(schedule['unavailable_dates']):>4} blocked  "
+          f"(last due after {span} days)")
+    print(f"          reference  best {old_best * 1000:9.2f} ms   median {old_median * 1000:9.2f} ms")
+    print(f"          calendar   best {new_best * 1000:9.2f} ms   median {new_median * 1000:9.2f} ms   "
+          f"{old_best / new_best:6.1f}x faster")
+
+
+def bench_parser(count: int, runs: int):
+    rng = random.Random(0)
+    expressions = [random_expression(rng) for _ in range(max(1, count))]
+    year = date.today().year
+
+    for text in expressions:
+        if not set(_reference_parse_unavailable_dates(text)) <= set(parse_unavailable_dates(text)):
+            raise SystemExit(f"parser misses dates the reference found in {text!r}")
+
+    def reference():
+        for text in expressions:
+            _reference_parse_unavailable_dates(text)
+
+    def grammar():
+        for text in expressions:
+            _parse_intervals.__wrapped__(text, year)
+
+    def memoized():
+        for text in expressions[:_parse_intervals.cache_info().maxsize]:
+            parse_unavailable_intervals(text)
+
+    old_best, old_median = best_and_median(reference, runs)
+    new_best, new_median = best_and_median(grammar, runs)
+    memoized()  # Warm the cache
+    cached = min(count, _parse_intervals.cache_info().maxsize)
+    cached_best, _cached_median = best_and_median(memoized, runs)
+
+    parts = sum(len(text.split(",")) for text in expressions)
+    print(f"  {len(expressions)} expressions, {parts} comma-separated parts")
+    print(f"          reference  best {old_best * 1000:9.2f} ms   median {old_median * 1000:9.2f} ms   "
+          f"{old_best / len(expressions) * 1e6:7.2f} us/expression")
+    print(f"          grammar    best {new_best * 1000:9.2f} ms   median {new_median * 1000:9.2f} ms   "
+          f"{new_best / len(expressions) * 1e6:7.2f} us/expression   {old_best / new_best:6.1f}x faster")
+    print(f"          memoized   best {cached_best * 1000:9.2f} ms   on a rerun of {cached} expressions   "
+          f"{cached_best / cached * 1e6:7.2f} us/expression")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the date scheduler and parser against the original implementations")
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per measurement (default 5)")
+    parser.add_argument("--horizons", default="90,365,1825,3650",
+                        help="Comma-separated plan lengths in days (default 90,365,1825,3650)")
+    parser.add_argument("--expressions", type=int, default=2000,
+                        help="Random date expressions to parse (default 2000)")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]} on {sys.platform}")
+    print("\ncalculate_calendar_dates vs day-by-day reference")
+    for horizon in (int(h) for h in args.horizons.split(",") if h.strip()):
+        bench_calendar(horizon, args.runs)
+
+    print("\nunavailable-date grammar vs strptime reference")
+    bench_parser(args.expressions, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Response parsing benchmark for LearnPath AI
+Times extract_json against the fenced-JSON slicing it replaced
+
+No real model responses are stored in the repository, so the responses are
+built like the ones the plan prompts produce: a plan of 30 to 365 days
+(about 8 to 100 KB of JSON) with the usual wrappings. The plans come from
+tests/test_response_parser.py and are the same on every run.
+
+Run from the repository root:
+    python scripts/bench_response_parser.py [--runs 20] [--days 30,90,365]
+
+Shapes:
+    clean       the whole response is the JSON object (fast path)
+    fenced      prose, a ```json fence, the object, more prose
+    commas      fenced, with a trailing comma after every entry
+    truncated   fenced, cut off at 90% (e.g. at max_tokens)
+
+The original slicing cannot handle the last two; it is reported as failing.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "tests"))
+
+from test_response_parser import make_plan  # noqa: E402
+from utils.response_parser import extract_json  # noqa: E402
+
+
+def original_extract(response_text: str):
+    """The fenced-JSON slicing that ClaudeAI.generate_learning_path used"""
+    if "```json" in response_text:
+        json_start = response_text.find("```json") + 7
+        json_end = response_text.rfind("```")
+        json_text = response_text[json_start:json_end].strip()
+    elif response_text.startswith("{") and response_text.endswith("}"):
+        json_text = response_text
+    else:
+        json_start = response_text.find("{")
+        json_end = response_text.rfind("}") + 1
+        json_text = response_text[json_start:json_end]
+    return json.loads(json_text)
+
+
+def responses(days: int) -> Dict[str, str]:
+    body = json.dumps(make_plan(random.Random(days), days), indent=2)
+    fenced = "Here is your plan:\n\n```json\n{}\n```\n\nLet me know if you need changes."
+    return {
+        "clean": body,
+        "fenced": fenced.format(body),
+        "commas": fenced.format(body.replace("\n    }", ",\n    }")),
+        "truncated": "Here is your plan:\n\n```json\n" + body[:int(len(body) * 0.9)],
+    }
+
+
+def best_and_median(call: Callable, text: str, runs: int) -> Optional[list]:
+    """Best and median seconds, or None if the call fails on text"""
+    try:
+        call(text)
+    except ValueError:
+        return None
+    times = []
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        call(text)
+        times.append(time.perf_counter() - started)
+    return [min(times), statistics.median(times)]
+
+
+def describe(timing: Optional[list]) -> str:
+    if timing is None:
+        return "           fails"
+    return f"best {timing[0] * 1000:7.3f} ms  median {timing[1] * 1000:7.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare extract_json with the original fenced-JSON slicing")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per measurement (default 20)")
+    parser.add_argument("--days", default="30,90,365", help="Comma-separated plan lengths (default 30,90,365)")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]} on {sys.platform}")
+    for days in (int(d) for d in args.days.split(",") if d.strip()):
+        shapes = responses(days)
+        print(f"\n{days}-day plan, {len(shapes['clean']) / 1024:.0f} KB of JSON")
+        for shape, text in shapes.items():
+            original = best_and_median(original_extract, text, args.runs)
+            current = best_and_median(extract_json, text, args.runs)
+            ratio = f"  {original[0] / current[0]:5.2f}x" if original and current else ""
+            print(f"  {shape:<10} original  {describe(original)}")
+            print(f"  {'':<10} extract   {describe(current)}{ratio}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Startup benchmark for LearnPath AI
+Measures cold import time and memory of the app's startup path
+
+Each scenario runs in a fresh interpreter with `python -X importtime`, so
+nothing is already imported or cached. Reports wall time, peak RSS, which
+AI SDKs got loaded, and the slowest imports.
+
+Run from the repository root:
+    python scripts/bench_startup.py [--runs 5] [--top 10] [--app]
+
+Scenarios:
+    lazy    what the app does at startup: import the generator, build an
+            AIProviderManager and list the configured providers
+    eager   the same plus importing every installed provider SDK, which is
+            what startup cost before providers were discovered lazily
+    app     `import app` (only with --app; needs streamlit installed)
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Provider SDKs by import name, in AIProviderManager.PROVIDERS order
+SDK_MODULES = ("anthropic", "openai", "google.generativeai", "mistralai", "dashscope")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - started
+try:
+    import resource
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss_kb //= 1024  # macOS reports bytes
+except ImportError:  # Windows
+    rss_kb = None
+sdks = [m for m in {sdks!r} if m in sys.modules]
+print("BENCH " + json.dumps({{"seconds": elapsed, "rss_kb": rss_kb, "sdks": sdks}}))
+"""
+
+_LAZY = """
+import utils.path_generator
+from utils.ai_providers import AIProviderManager, get_available_providers
+AIProviderManager()
+get_available_providers()
+"""
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def installed_sdks() -> List[str]:
+    """SDK modules that can be imported here"""
+    found = []
+    for name in SDK_MODULES:
+        try:
+            if importlib.util.find_spec(name) is not None:
+                found.append(name)
+        except ModuleNotFoundError:  # Parent package (google) missing
+            pass
+    return found
+
+
+def scenarios(include_app: bool) -> Dict[str, str]:
+    eager = _LAZY + "".join(f"import {name}\n" for name in installed_sdks())
+    result = {"lazy": _LAZY, "eager": eager}
+    if include_app:
+        result["app"] = "import app\n"
+    return result
+
+
+def run_once(code: str) -> Dict:
+    """Run one probe in a fresh interpreter; returns its measurements and import times"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(code=code, sdks=SDK_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    line = next((l for l in proc.stdout.splitlines() if l.startswith("BENCH ")), None)
+    if proc.returncode != 0 or line is None:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "probe failed")
+
+    result = json.loads(line[len("BENCH "):])
+    result["imports"] = {}
+    for match in _IMPORTTIME_LINE.finditer(proc.stderr):
+        cumulative_us, indent, module = int(match.group(2)), len(match.group(3)), match.group(4)
+        if indent <= 1:  # Top-level imports only; nested ones are in their parents' totals
+            result["imports"][module] = cumulative_us
+    return result
+
+
+def summarize(name: str, runs: List[Dict], top: int):
+    seconds = [r["seconds"] for r in runs]
+    rss = [r["rss_kb"] for r in runs if r["rss_kb"] is not None]
+    print(f"\n{name}")
+    print(f"  wall time   median {statistics.median(seconds) * 1000:8.1f} ms   "
+          f"min {min(seconds) * 1000:8.1f} ms   ({len(runs)} runs)")
+    if rss:
+        print(f"  peak RSS    median {statistics.median(rss) / 1024:8.1f} MB")
+    print(f"  SDKs loaded {', '.join(runs[0]['sdks']) or 'none'}")
+
+    slowest = sorted(runs[0]["imports"].items(), key=lambda item: item[1], reverse=True)[:top]
+    if slowest:
+        print("  slowest imports (first run, cumulative):")
+        for module, cumulative_us in slowest:
+            print(f"    {cumulative_us / 1000:8.1f} ms  {module}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure LearnPath AI cold-start import time and memory")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario (default 5)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list (default 10)")
+    parser.add_argument("--app", action="store_true", help="Also time `import app` (needs streamlit)")
+    args = parser.parse_args()
+
+    print(f"Python {sys.version.split()[0]} on {sys.platform}")
+    print(f"Installed provider SDKs: {', '.join(installed_sdks()) or 'none'}")
+
+    for name, code in scenarios(args.app).items():
+        try:
+            runs = [run_once(code) for _ in range(max(1, args.runs))]
+        except RuntimeError as e:
+            print(f"\n{name}\n  failed: {e}")
+            continue
+        summarize(name, runs, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Tests for provider streaming and multi-model fan-out (utils/ai_providers.py)"""
+
+import asyncio
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from utils.ai_providers import AIProviderManager, GeminiProvider
+
+
+class Chunk:
+    def __init__(self, text=None, finish_reason=None):
+        self._text = text
+        self.candidates = [types.SimpleNamespace(finish_reason=types.SimpleNamespace(name=finish_reason))]
+        self.prompt_feedback = types.SimpleNamespace(block_reason=None)
+
+    @property
+    def text(self):
+        if self._text is None:
+            raise ValueError("Invalid operation: the response has no text")
+        return self._text
+
+
+@pytest.fixture
+def fake_genai(monkeypatch):
+    """Install a stand-in google.generativeai whose model streams scripted chunks"""
+    genai = types.ModuleType("google.generativeai")
+    genai.chunks = []
+    genai.configure = lambda api_key: None
+
+    class GenerativeModel:
+        def __init__(self, model_id):
+            pass
+
+        def generate_content(self, prompt, stream=False):
+            return iter(genai.chunks)
+
+    genai.GenerativeModel = GenerativeModel
+    google = types.ModuleType("google")
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+    return genai
+
+
+def test_gemini_stream_skips_blocked_chunks(fake_genai):
+    fake_genai.chunks = [Chunk("Hello "), Chunk(None, "SAFETY"), Chunk("world")]
+    provider = GeminiProvider(api_key="gemini-test-skip")
+
+    chunks = list(provider.stream_text("hi"))
+
+    assert "".join(c.text for c in chunks) == "Hello world"
+    assert chunks[-1].is_final and chunks[-1].finish_reason == "SAFETY"
+
+
+def test_gemini_stream_reports_fully_blocked_response(fake_genai):
+    fake_genai.chunks = [Chunk(None, "SAFETY")]
+    provider = GeminiProvider(api_key="gemini-test-blocked")
+
+    with pytest.raises(ValueError, match="blocked \\(SAFETY\\)"):
+        list(provider.stream_text("hi"))
+
+
+# ============================================================================
+# FAN-OUT
+# ============================================================================
+
+class StubProvider:
+    """Answers after a scripted delay; tracks how many calls overlap"""
+
+    def __init__(self, name, delay, fail=False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.loops = []
+
+    async def agenerate_text(self, prompt, system_prompt="", max_tokens=2000):
+        self.loops.append(asyncio.get_running_loop())
+        stats = self.stats
+        stats['in_flight'] += 1
+        stats['peak'] = max(stats['peak'], stats['in_flight'])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            stats['in_flight'] -= 1
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return f"{self.name}: {prompt}"
+
+
+def stub_manager(monkeypatch, **providers):
+    """AIProviderManager whose configured providers are StubProviders"""
+    stats = {'in_flight': 0, 'peak': 0}
+    for provider in providers.values():
+        provider.stats = stats
+    manager = AIProviderManager.__new__(AIProviderManager)
+    manager.providers = {name: {"configured": True, "models": [f"{name} Model"]} for name in providers}
+    monkeypatch.setattr(manager, "get_provider", lambda provider_name, model_name: providers.get(provider_name))
+    return manager, stats
+
+
+async def collect(manager, models, **kwargs):
+    return [result async for result in manager.fan_out("hi", models, **kwargs)]
+
+
+def test_fan_out_runs_concurrently_and_yields_in_completion_order(monkeypatch):
+    manager, stats = stub_manager(monkeypatch, Slow=StubProvider("Slow", 0.3),
+                                  Fast=StubProvider("Fast", 0.05), Mid=StubProvider("Mid", 0.15))
+
+    started = time.perf_counter()
+    results = asyncio.run(collect(manager, ["Slow / Slow Model", ("Fast", "Fast Model"), "Mid / Mid Model"]))
+    elapsed = time.perf_counter() - started
+
+    assert [r.provider for r in results] == ["Fast", "Mid", "Slow"]
+    assert [r.text for r in results] == ["Fast: hi", "Mid: hi", "Slow: hi"]
+    assert all(r.ok for r in results)
+    assert [r.model for r in results] == ["Fast Model", "Mid Model", "Slow Model"]
+    assert results[0].latency < results[1].latency < results[2].latency
+    # Slowest model, not the sum of all three
+    assert elapsed < 0.45
+    assert stats['peak'] == 3
+
+
+def test_fan_out_respects_concurrency_limit(monkeypatch):
+    providers = {f"P{i}": StubProvider(f"P{i}", 0.05) for i in range(5)}
+    manager, stats = stub_manager(monkeypatch, **providers)
+
+    results = asyncio.run(collect(manager, [(name, "m") for name in providers], max_concurrency=2))
+
+    assert len(results) == 5 and all(r.ok for r in results)
+    assert stats['peak'] == 2
+
+
+def test_failing_model_does_not_sink_the_others(monkeypatch):
+    manager, _stats = stub_manager(monkeypatch, Good=StubProvider("Good", 0.05),
+                                   Bad=StubProvider("Bad", 0.0, fail=True))
+
+    results = {r.provider: r for r in asyncio.run(collect(manager, [("Good", "m"), ("Bad", "m"), ("Missing", "m")]))}
+
+    assert results["Good"].ok and results["Good"].text == "Good: hi"
+    assert not results["Bad"].ok and results["Bad"].error == "Bad failed"
+    assert not results["Missing"].ok and "not configured" in results["Missing"].error
+
+
+def test_per_provider_timeout(monkeypatch):
+    manager, _stats = stub_manager(monkeypatch, Slow=StubProvider("Slow", 2.0), Fast=StubProvider("Fast", 0.0))
+
+    started = time.perf_counter()
+    results = {r.provider: r for r in asyncio.run(collect(manager, [("Slow", "m"), ("Fast", "m")],
+                                                          timeouts={"Slow": 0.1}))}
+
+    assert time.perf_counter() - started < 1.0
+    assert results["Slow"].error == "Timed out after 0.1s"
+    assert results["Slow"].text is None
+    assert results["Fast"].ok
+
+
+def test_fan_out_sync_from_plain_code(monkeypatch):
+    manager, _stats = stub_manager(monkeypatch, A=StubProvider("A", 0.1), B=StubProvider("B", 0.0))
+
+    results = list(manager.fan_out_sync("hi", [("A", "m"), ("B", "m")]))
+
+    assert [r.provider for r in results] == ["B", "A"]
+
+
+def test_fan_out_sync_inside_running_event_loop(monkeypatch):
+    provider = StubProvider("A", 0.05)
+    manager, _stats = stub_manager(monkeypatch, A=provider, B=StubProvider("B", 0.0, fail=True))
+
+    async def caller():
+        # A sync caller (e.g. a library callback) running on an event loop
+        return asyncio.get_running_loop(), list(manager.fan_out_sync("hi", [("A", "m"), ("B", "m")]))
+
+    caller_loop, results = asyncio.run(caller())
+
+    assert [(r.provider, r.ok) for r in results] == [("B", False), ("A", True)]
+    # Ran on the shared background loop, not the caller's (which is blocked)
+    assert provider.loops[0] is not caller_loop
+    assert any(t.name == "ai-provider-loop" for t in threading.enumerate())
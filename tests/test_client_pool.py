@@ -0,0 +1,81 @@
+"""Tests for the shared SDK client pool (utils/client_pool.py)"""
+
+import asyncio
+import gc
+import weakref
+
+from utils import ai_providers
+from utils.client_pool import ClientPool, get_client_pool_stats
+
+
+class FakeAsyncClient:
+    def __init__(self):
+        self.closed = False
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_evicted_clients_go_to_their_callback():
+    pool = ClientPool(max_size=2)
+    evicted = []
+    pool.get("a", lambda: "client-a", on_evict=evicted.append)
+    pool.get("b", lambda: "client-b")
+    pool.get("c", lambda: "client-c")
+
+    assert evicted == ["client-a"]
+    assert pool.get_stats()['evictions'] == 1
+
+
+def test_shutdown_prefers_the_eviction_callback():
+    pool = ClientPool()
+    evicted = []
+    pool.get("a", lambda: "client-a", on_evict=evicted.append)
+    pool.shutdown()
+
+    assert evicted == ["client-a"]
+    assert pool.get_stats()['size'] == 0
+
+
+def test_discard_drops_without_callback():
+    pool = ClientPool()
+    evicted = []
+    pool.get("a", lambda: "client-a", on_evict=evicted.append)
+
+    assert pool.discard("a")
+    assert not pool.discard("a")
+    assert evicted == []
+
+
+def test_evicted_async_client_is_closed_on_its_loop():
+    client = FakeAsyncClient()
+
+    async def evict():
+        ai_providers._close_async_client(client, weakref.ref(asyncio.get_running_loop()))
+        for _ in range(3):
+            await asyncio.sleep(0)
+
+    asyncio.run(evict())
+    assert client.closed
+
+
+def test_finished_loops_do_not_keep_their_clients():
+    built = []
+
+    def factory():
+        built.append(FakeAsyncClient())
+        return built[-1]
+
+    async def get_client():
+        return ai_providers._get_async_client(("fake-async", "key"), factory)
+
+    for _ in range(3):
+        asyncio.run(get_client())
+        gc.collect()
+
+    # Every asyncio.run gets a new loop, so each one builds its own client
+    assert len(built) == 3
+    live_keys = [keys for _ref, keys in ai_providers._async_client_loops.values()
+                 if any(key[0] == "fake-async" for key in keys)]
+    assert live_keys == []
+    assert get_client_pool_stats()['discards'] >= 3
@@ -0,0 +1,154 @@
+"""Tests for the SQLite connection pool (utils/connection_pool.py)"""
+
+import gc
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from utils.connection_pool import ConnectionPool, PooledConnection
+
+
+@pytest.fixture
+def pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / "pool.db"), size=2, timeout=0.2)
+    conn = pool.acquire()
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.commit()
+    conn.close()
+    yield pool
+    pool.close()
+
+
+def test_pragmas_are_applied(pool):
+    conn = pool.acquire()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -8000
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    finally:
+        conn.close()
+
+
+def test_released_connections_are_reused_last_in_first_out(pool):
+    first, second = pool.acquire(), pool.acquire()
+    first_raw, second_raw = first.raw, second.raw
+    first.close()
+    second.close()
+
+    again = pool.acquire()
+    assert again.raw is second_raw
+    other = pool.acquire()
+    assert other.raw is first_raw
+    again.close()
+    other.close()
+
+    stats = pool.get_stats()
+    assert stats['created'] == 2
+    assert stats['open'] == 2
+
+
+def test_exhausted_pool_waits_for_a_release(pool):
+    held = [pool.acquire(), pool.acquire()]
+    released = threading.Timer(0.05, held[0].close)
+    released.start()
+
+    started = time.perf_counter()
+    conn = pool.acquire()
+    waited = time.perf_counter() - started
+
+    assert 0.03 < waited < 0.2
+    stats = pool.get_stats()
+    assert stats['waits'] == 1
+    assert stats['wait_seconds'] > 0
+    conn.close()
+    held[1].close()
+    released.join()
+
+
+def test_exhausted_pool_times_out(pool):
+    held = [pool.acquire(), pool.acquire()]
+
+    with pytest.raises(sqlite3.OperationalError, match="Timed out"):
+        pool.acquire()
+    for conn in held:
+        conn.close()
+    assert pool.get_stats()['in_use'] == 0
+
+
+def test_release_rolls_back_open_transaction(pool):
+    conn = pool.acquire()
+    raw = conn.raw
+    conn.execute("INSERT INTO items (name) VALUES ('uncommitted')")
+    assert raw.in_transaction
+    conn.close()
+
+    assert not raw.in_transaction
+    conn = pool.acquire()
+    assert conn.raw is raw
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+    conn.close()
+
+
+def test_dropped_proxy_returns_connection_to_pool(pool):
+    conn = pool.acquire()
+    raw = conn.raw
+    conn.execute("INSERT INTO items (name) VALUES ('lost')")
+    assert pool.get_stats()['in_use'] == 1
+
+    del conn
+    gc.collect()
+
+    stats = pool.get_stats()
+    assert (stats['in_use'], stats['idle']) == (0, 1)
+    again = pool.acquire()
+    assert again.raw is raw
+    assert again.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+    again.close()
+
+
+def test_proxy_forwards_attributes_and_closes_once(pool):
+    conn = pool.acquire()
+    assert isinstance(conn, PooledConnection)
+    conn.row_factory = sqlite3.Row
+    assert conn.raw.row_factory is sqlite3.Row
+    assert conn.execute("SELECT 1 AS one").fetchone()["one"] == 1
+    conn.raw.row_factory = None
+
+    conn.close()
+    conn.close()
+    assert pool.get_stats()['idle'] == 1
+
+
+def test_stats_count_acquires_reuse_and_peak(pool):
+    # The fixture already acquired (and created) one connection
+    a = pool.acquire()
+    b = pool.acquire()
+    a.close()
+    c = pool.acquire()
+    b.close()
+    c.close()
+
+    stats = pool.get_stats()
+    assert stats['acquired'] == 4
+    assert stats['created'] == 2
+    assert stats['reused'] == 2
+    assert stats['peak_in_use'] == 2
+    assert (stats['size'], stats['open'], stats['in_use'], stats['idle']) == (2, 2, 0, 2)
+    assert stats['waits'] == 0
+
+
+def test_closed_pool_refuses_and_closes_busy_connections_on_release(pool):
+    conn = pool.acquire()
+    pool.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        pool.acquire()
+    raw = conn.raw
+    conn.close()
+
+    assert pool.get_stats()['open'] == 0
+    with pytest.raises(sqlite3.ProgrammingError):
+        raw.execute("SELECT 1")
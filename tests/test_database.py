@@ -0,0 +1,289 @@
+"""Tests for Database writes and lookups (utils/database.py)"""
+
+import gc
+import sqlite3
+import time
+import weakref
+
+import pytest
+
+from utils.database import Database
+
+
+def make_db(tmp_path, **kwargs):
+    kwargs.setdefault("pool_size", 1)
+    return Database(str(tmp_path / "learnpath.db"), **kwargs)
+
+
+def add_path(db, days=3):
+    path_id = db.save_learning_path("Learn SQL", days, start_date="2025-01-06")
+    topic_ids = db.save_topics(path_id, [
+        {"day": day, "topic": f"Topic {day}", "subtopics": [], "estimated_hours": 2}
+        for day in range(1, days + 1)
+    ])
+    return path_id, topic_ids
+
+
+def stored_links(db, path_id):
+    """resource_links as stored, without the write-behind overlay"""
+    conn = db.get_connection()
+    try:
+        rows = conn.execute("SELECT id, resource_links FROM topics WHERE path_id = ? ORDER BY id",
+                            (path_id,)).fetchall()
+    finally:
+        conn.close()
+    return dict(rows)
+
+
+def traced(db, call):
+    """Statements executed by call() on the pool's single connection"""
+    statements = []
+    conn = db.get_connection()
+    conn.set_trace_callback(statements.append)
+    conn.close()
+    try:
+        call()
+    finally:
+        conn = db.get_connection()
+        conn.set_trace_callback(None)
+        conn.close()
+    return [s.strip().split()[0].upper() for s in statements]
+
+
+# ============================================================================
+# RESOURCE LINKS (WRITE-BEHIND)
+# ============================================================================
+
+def test_resource_link_edits_are_coalesced_per_topic(tmp_path):
+    db = make_db(tmp_path, resource_links_flush_interval=60)
+    path_id, (first, second, _third) = add_path(db)
+
+    for links in ("a", "ab", "abc"):
+        db.update_resource_links(first, links)
+    db.update_resource_links(second, "x")
+
+    stats = db.get_resource_links_stats()
+    assert (stats['queued'], stats['coalesced'], stats['pending'], stats['flushes']) == (4, 2, 2, 0)
+    assert stored_links(db, path_id)[first] in ("", None)
+    # Reads already see the queued values
+    assert {t['id']: t['resource_links'] for t in db.get_topics(path_id)}[first] == "abc"
+    assert db.get_path_bundle(path_id)['curriculum'][1]['resource_links'] == "x"
+
+    assert db.flush_resource_links() == 2
+    assert stored_links(db, path_id)[first] == "abc"
+    assert stored_links(db, path_id)[second] == "x"
+    stats = db.get_resource_links_stats()
+    assert (stats['flushes'], stats['rows_written'], stats['pending']) == (1, 2, 0)
+    db.close()
+
+
+def test_timer_flushes_queued_edits(tmp_path):
+    db = make_db(tmp_path, resource_links_flush_interval=0.05)
+    path_id, topic_ids = add_path(db)
+
+    db.update_resource_links(topic_ids[0], "https://example.com")
+    db.update_resource_links(topic_ids[1], "https://example.org")
+
+    deadline = time.monotonic() + 5
+    while db.get_resource_links_stats()['pending'] and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    stats = db.get_resource_links_stats()
+    assert (stats['pending'], stats['flushes'], stats['rows_written']) == (0, 1, 2)
+    assert stored_links(db, path_id)[topic_ids[1]] == "https://example.org"
+    db.close()
+
+
+def test_flush_writes_every_edit_in_one_transaction(tmp_path):
+    db = make_db(tmp_path, resource_links_flush_interval=60)
+    path_id, topic_ids = add_path(db, days=5)
+    for topic_id in topic_ids:
+        db.update_resource_links(topic_id, f"link {topic_id}")
+
+    statements = traced(db, db.flush_resource_links)
+
+    assert statements.count("UPDATE") == 5
+    assert statements.count("BEGIN") == 1
+    assert statements.count("COMMIT") == 1
+    assert stored_links(db, path_id) == {topic_id: f"link {topic_id}" for topic_id in topic_ids}
+    db.close()
+
+
+def test_close_flushes_queued_edits(tmp_path):
+    db = make_db(tmp_path, resource_links_flush_interval=60)
+    path_id, topic_ids = add_path(db)
+    db.update_resource_links(topic_ids[2], "kept")
+    db.close()
+
+    reopened = make_db(tmp_path)
+    assert stored_links(reopened, path_id)[topic_ids[2]] == "kept"
+    reopened.close()
+
+
+def test_exit_hook_flushes_queued_edits(tmp_path):
+    db = make_db(tmp_path, resource_links_flush_interval=60)
+    path_id, topic_ids = add_path(db)
+    db.update_resource_links(topic_ids[0], "written at exit")
+
+    db._exit_hook()  # What atexit runs when the process ends
+
+    assert stored_links(db, path_id)[topic_ids[0]] == "written at exit"
+    db.close()
+
+
+def test_exit_hook_does_not_keep_database_alive(tmp_path):
+    db = make_db(tmp_path)
+    hook = db._exit_hook
+    ref = weakref.ref(db)
+    db.pool.close()
+
+    del db
+    gc.collect()
+
+    assert ref() is None
+    hook()  # Nothing to flush: must not raise
+
+
+# ============================================================================
+# BULK SAVES
+# ============================================================================
+
+def count_rows(db):
+    conn = db.get_connection()
+    try:
+        return (conn.execute("SELECT COUNT(*) FROM learning_paths").fetchone()[0],
+                conn.execute("SELECT COUNT(*) FROM topics").fetchone()[0])
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("bad_position", [0, 3, 9])
+def test_failed_topic_insert_leaves_nothing_behind(tmp_path, bad_position):
+    db = make_db(tmp_path)
+    add_path(db)
+    before = count_rows(db)
+
+    topics = [{"day": day, "topic": f"Topic {day}", "estimated_hours": 1} for day in range(1, 11)]
+    topics[bad_position]["topic"] = None  # topic_name is NOT NULL
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db.save_path_with_topics("Half saved", 10, topics, start_date="2025-01-06")
+
+    assert count_rows(db) == before
+    assert [p['goal'] for p in db.get_learning_paths(active_only=False)] == ["Learn SQL"]
+    # The connection went back to the pool usable, with nothing left open
+    _path_id, topic_ids = db.save_path_with_topics("Saved", 2, [{"day": 1, "topic": "a"}, {"day": 2, "topic": "b"}])
+    assert len(topic_ids) == 2
+    db.close()
+
+
+def test_failed_save_topics_inserts_none(tmp_path):
+    db = make_db(tmp_path)
+    path_id, _topic_ids = add_path(db)
+    before = count_rows(db)
+
+    with pytest.raises(sqlite3.IntegrityError):
+        db.save_topics(path_id, [{"day": 4, "topic": "ok"}, {"day": 5, "topic": None}])
+
+    assert count_rows(db) == before
+    db.close()
+
+
+def test_returned_topic_ids_match_inserted_rows(tmp_path):
+    db = make_db(tmp_path)
+    first_path, first_ids = add_path(db, days=5)
+
+    # Leave gaps in the id sequence before the bulk insert
+    conn = db.get_connection()
+    conn.execute("DELETE FROM topics WHERE id IN (?, ?)", (first_ids[1], first_ids[-1]))
+    conn.commit()
+    conn.close()
+
+    topics = [{"day": day, "topic": f"Day {day}", "estimated_hours": 1} for day in range(1, 41)]
+    path_id, topic_ids = db.save_path_with_topics("Long plan", 40, topics, start_date="2025-01-06")
+
+    saved = db.get_topics(path_id)
+    assert topic_ids == [t['id'] for t in saved]
+    assert [t['topic'] for t in saved] == [f"Day {day}" for day in range(1, 41)]
+    assert min(topic_ids) > max(first_ids)
+
+    more_ids = db.save_topics(path_id, [{"day": 41, "topic": "Day 41"}, {"day": 42, "topic": "Day 42"}])
+    assert more_ids == [t['id'] for t in db.get_topics(path_id)][-2:]
+    assert [t['topic'] for t in db.get_topics(first_path)] == ["Topic 1", "Topic 3", "Topic 4"]
+    db.close()
+
+
+# ============================================================================
+# PATH BUNDLE
+# ============================================================================
+
+def test_bundle_matches_separate_lookups(tmp_path):
+    db = make_db(tmp_path)
+    path_id, topic_ids = add_path(db, days=4)
+    db.update_topic_completion(topic_ids[1], True, time_spent=45)
+    db.update_topic_completion(topic_ids[3], True, time_spent=30)
+    add_path(db)  # Another path's topics must not leak in
+
+    bundle = db.get_path_bundle(path_id)
+
+    assert bundle['path_info'] == db.get_path_details(path_id)
+    assert bundle['curriculum'] == db.get_topics(path_id)
+    assert bundle['stats'] == db.get_progress_stats(path_id)
+    assert (bundle['stats']['completed_topics'], bundle['stats']['total_time_spent_minutes']) == (2, 75)
+    db.close()
+
+
+def test_bundle_orders_topics_by_day(tmp_path):
+    db = make_db(tmp_path)
+    path_id = db.save_learning_path("Out of order", 4)
+    db.save_topics(path_id, [{"day": day, "topic": f"Day {day}"} for day in (3, 1, 4, 2)])
+
+    assert [t['day'] for t in db.get_path_bundle(path_id)['curriculum']] == [1, 2, 3, 4]
+    db.close()
+
+
+def test_bundle_of_path_without_topics(tmp_path):
+    db = make_db(tmp_path)
+    path_id = db.save_learning_path("Empty", 7, start_date="2025-01-06")
+
+    bundle = db.get_path_bundle(path_id)
+
+    assert bundle['path_info']['goal'] == "Empty"
+    assert bundle['path_info']['start_date'] == "2025-01-06"
+    assert bundle['curriculum'] == []
+    assert bundle['stats'] == {
+        'total_topics': 0,
+        'completed_topics': 0,
+        'progress_percentage': 0,
+        'total_time_spent_minutes': 0,
+        'total_time_spent_hours': 0.0
+    }
+    assert db.generate_ics_calendar(path_id) is None
+    db.close()
+
+
+def test_bundle_of_missing_path(tmp_path):
+    db = make_db(tmp_path)
+    add_path(db)
+
+    assert db.get_path_bundle(9999) is None
+    assert db.generate_ics_calendar(9999) is None
+    assert db.get_calendar_filename(9999).startswith("goalpath_plan_")
+    db.close()
+
+
+def test_calendar_lists_topics_in_day_order(tmp_path):
+    pytest.importorskip("icalendar")
+    pytest.importorskip("pytz")
+    db = make_db(tmp_path)
+    path_id = db.save_learning_path("Calendar", 3)
+    db.save_topics(path_id, [
+        {"day": day, "topic": f"Day {day}", "due_date": f"2025-01-0{day + 5}", "estimated_hours": 1.5}
+        for day in (2, 3, 1)
+    ])
+
+    ics = db.generate_ics_calendar(path_id)
+
+    summaries = [line.split(":", 1)[1].strip() for line in ics.splitlines() if line.startswith("SUMMARY:")]
+    assert summaries == ["Day 1", "Day 2", "Day 3"]
+    db.close()
@@ -0,0 +1,417 @@
+"""
+Tests for calendar scheduling (utils/date_scheduler.py, utils/schedule_engine.py)
+
+The reference functions below are frozen copies of the original day-by-day
+scheduler and the original strptime-based date parser. On fixed-seed random
+inputs the faster scheduler must give exactly the same results, and the
+compiled parser must find every date the original found. The incremental
+reschedule (reschedule_diff) is checked against the full reschedule the same
+way.
+"""
+
+import random
+import re
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from utils.date_intervals import DateIntervalIndex
+from utils.date_scheduler import (
+    calculate_calendar_dates,
+    first_changed_date,
+    parse_single_date,
+    parse_unavailable_dates,
+    parse_unavailable_intervals,
+    reschedule_diff,
+    reschedule_incomplete_topics
+)
+from utils.schedule_engine import numpy_available, schedule_due_dates
+
+
+# ============================================================================
+# REFERENCE IMPLEMENTATIONS (before AvailabilityCalendar and the date grammar)
+# ============================================================================
+
+def _reference_is_available(check_date, unavailable_dates, weekly_pattern,
+                            skip_weekends=False, skip_weekdays=None):
+    if check_date in unavailable_dates:
+        return False
+    weekday = check_date.weekday()
+    if skip_weekends and weekday >= 5:
+        return False
+    if skip_weekdays and weekday in skip_weekdays:
+        return False
+    if weekly_pattern and weekday in weekly_pattern:
+        return weekly_pattern[weekday]
+    return True
+
+
+def _reference_due_dates(start_date, estimated_hours, hours_per_day=2.0, unavailable_dates=None,
+                         weekly_pattern=None, skip_weekends=False, skip_weekdays=None):
+    unavailable_dates = unavailable_dates or []
+    current_date = start_date
+    due_dates = []
+    for hours in estimated_hours:
+        days_needed = max(1, round(hours / hours_per_day))
+        days_counted = 0
+        check_date = current_date
+        while days_counted < days_needed:
+            if _reference_is_available(check_date, unavailable_dates, weekly_pattern,
+                                       skip_weekends, skip_weekdays):
+                days_counted += 1
+                if days_counted == days_needed:
+                    due_date = check_date
+                    break
+            check_date += timedelta(days=1)
+        due_dates.append(due_date.strftime('%Y-%m-%d'))
+
+        current_date = due_date + timedelta(days=1)
+        while not _reference_is_available(current_date, unavailable_dates, weekly_pattern,
+                                          skip_weekends, skip_weekdays):
+            current_date += timedelta(days=1)
+    return due_dates
+
+
+def _reference_parse_single_date(date_str, reference_date=None):
+    if not date_str:
+        return None
+    date_str = date_str.strip()
+    current_year = datetime.now().year
+    formats = ["%Y-%m-%d", "%m/%d/%Y", "%m/%d/%y", "%b %d", "%B %d", "%b %d, %Y", "%B %d, %Y"]
+    for fmt in formats:
+        try:
+            parsed = datetime.strptime(date_str, fmt)
+            if "%Y" not in fmt and "%y" not in fmt:
+                return parsed.replace(year=current_year).date()
+            return parsed.date()
+        except ValueError:
+            continue
+    if date_str.isdigit() and reference_date:
+        try:
+            return reference_date.replace(day=int(date_str))
+        except ValueError:
+            pass
+    return None
+
+
+def _reference_parse_unavailable_dates(unavailable_str):
+    if not unavailable_str or not unavailable_str.strip():
+        return []
+
+    def expand(start_date, end_date):
+        current = start_date
+        while current <= end_date:
+            unavailable_dates.append(current)
+            current += timedelta(days=1)
+
+    unavailable_dates = []
+    for part in (p.strip() for p in unavailable_str.split(',')):
+        if not part:
+            continue
+        if '-' in part and 'to' not in part.lower():
+            range_parts = part.split('-')
+            if len(range_parts) == 2:
+                start_date = _reference_parse_single_date(range_parts[0].strip())
+                end_date = _reference_parse_single_date(range_parts[1].strip(), reference_date=start_date)
+                if start_date and end_date:
+                    expand(start_date, end_date)
+        elif 'to' in part.lower():
+            range_parts = re.split(r'\s+to\s+', part, flags=re.IGNORECASE)
+            if len(range_parts) == 2:
+                start_date = _reference_parse_single_date(range_parts[0].strip())
+                end_date = _reference_parse_single_date(range_parts[1].strip())
+                if start_date and end_date:
+                    expand(start_date, end_date)
+        else:
+            single_date = _reference_parse_single_date(part)
+            if single_date:
+                unavailable_dates.append(single_date)
+    return list(set(unavailable_dates))
+
+
+# ============================================================================
+# RANDOM SCHEDULES
+# ============================================================================
+
+def random_schedule(rng):
+    """Arguments for one schedule; at least one weekday is always available"""
+    start = date(2025, 1, 1) + timedelta(days=rng.randint(0, 700))
+    skip_weekends = rng.random() < 0.3
+    skip_weekdays = rng.sample(range(5), rng.randint(0, 2)) if rng.random() < 0.3 else None
+    weekly_pattern = None
+    if rng.random() < 0.4:
+        weekly_pattern = {d: rng.random() < 0.7 for d in rng.sample(range(7), rng.randint(1, 7))}
+        weekly_pattern[rng.choice([0, 1, 2])] = True
+
+    blocked = set()
+    for _ in range(rng.randint(0, 6)):
+        first = start + timedelta(days=rng.randint(-10, 120))
+        blocked.update(first + timedelta(days=i) for i in range(rng.randint(1, 15)))
+
+    if skip_weekends or skip_weekdays:
+        # Keep a weekday the rules can't all block
+        keep = next(d for d in range(5) if not skip_weekdays or d not in skip_weekdays)
+        if weekly_pattern is not None:
+            weekly_pattern[keep] = True
+
+    return {
+        'start_date': start,
+        'estimated_hours': [rng.choice([0.5, 1, 1.5, 2, 3, 4, 5, 8, 12]) for _ in range(rng.randint(1, 40))],
+        'hours_per_day': rng.choice([1, 1.5, 2, 3, 4]),
+        'unavailable_dates': sorted(blocked),
+        'weekly_pattern': weekly_pattern,
+        'skip_weekends': skip_weekends,
+        'skip_weekdays': skip_weekdays,
+    }
+
+
+def scheduler_args(schedule):
+    return (schedule['hours_per_day'], schedule['unavailable_dates'], schedule['weekly_pattern'],
+            schedule['skip_weekends'], schedule['skip_weekdays'])
+
+
+SEEDS = range(60)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_calendar_dates_match_reference(seed):
+    schedule = random_schedule(random.Random(seed))
+    expected = _reference_due_dates(schedule['start_date'], schedule['estimated_hours'], *scheduler_args(schedule))
+
+    topics = [{'day': i + 1, 'estimated_hours': h} for i, h in enumerate(schedule['estimated_hours'])]
+    result = calculate_calendar_dates(schedule['start_date'], topics, *scheduler_args(schedule))
+
+    assert [t['due_date'] for t in result] == expected
+    assert all('due_date' not in t for t in topics)  # Dicts are copied
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_calendar_dates_with_interval_index_match_reference(seed):
+    schedule = random_schedule(random.Random(seed))
+    expected = _reference_due_dates(schedule['start_date'], schedule['estimated_hours'], *scheduler_args(schedule))
+
+    index = DateIntervalIndex.from_dates(schedule['unavailable_dates'])
+    topics = [{'day': i + 1, 'estimated_hours': h} for i, h in enumerate(schedule['estimated_hours'])]
+    hours_per_day, _dates, weekly_pattern, skip_weekends, skip_weekdays = scheduler_args(schedule)
+    result = calculate_calendar_dates(schedule['start_date'], topics, hours_per_day, index,
+                                      weekly_pattern, skip_weekends, skip_weekdays)
+
+    assert [t['due_date'] for t in result] == expected
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_reschedule_keeps_completed_topics(seed):
+    rng = random.Random(seed)
+    schedule = random_schedule(rng)
+    topics = [{'day': i + 1, 'estimated_hours': h, 'is_completed': rng.random() < 0.3, 'due_date': 'old'}
+              for i, h in enumerate(schedule['estimated_hours'])]
+    incomplete_hours = [t['estimated_hours'] for t in topics if not t['is_completed']]
+    expected = iter(_reference_due_dates(schedule['start_date'], incomplete_hours, *scheduler_args(schedule)))
+
+    result = reschedule_incomplete_topics(topics, schedule['start_date'], *scheduler_args(schedule))
+
+    assert [t['day'] for t in result] == [t['day'] for t in topics]
+    for topic in result:
+        assert topic['due_date'] == ('old' if topic['is_completed'] else next(expected))
+
+
+@pytest.mark.parametrize("use_numpy", [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(not numpy_available(), reason="numpy not installed")),
+])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_schedule_engine_matches_reference(seed, use_numpy):
+    schedule = random_schedule(random.Random(seed))
+    expected = _reference_due_dates(schedule['start_date'], schedule['estimated_hours'], *scheduler_args(schedule))
+
+    result = schedule_due_dates(schedule['start_date'], schedule['estimated_hours'],
+                                *scheduler_args(schedule), use_numpy=use_numpy)
+
+    assert result == expected
+
+
+def edited_schedule(rng, schedule):
+    """The same schedule after one edit from the reschedule form (or none)"""
+    edited = dict(schedule, unavailable_dates=list(schedule['unavailable_dates']))
+    edit = rng.choice(["start", "hours", "block", "unblock", "none"])
+    if edit == "start":
+        edited['start_date'] = schedule['start_date'] + timedelta(days=rng.randint(-20, 40))
+    elif edit == "hours":
+        edited['hours_per_day'] = rng.choice([h for h in (1, 1.5, 2, 3, 4) if h != schedule['hours_per_day']])
+    elif edit == "block":
+        first = schedule['start_date'] + timedelta(days=rng.randint(0, 150))
+        edited['unavailable_dates'] += [first + timedelta(days=i) for i in range(rng.randint(1, 10))]
+    elif edit == "unblock" and edited['unavailable_dates']:
+        first = rng.randrange(len(edited['unavailable_dates']))
+        del edited['unavailable_dates'][first:first + rng.randint(1, 5)]
+    return edited
+
+
+@pytest.mark.parametrize("use_index", [False, True])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_reschedule_diff_matches_full_reschedule(seed, use_index):
+    rng = random.Random(seed)
+    old = random_schedule(rng)
+    topics = calculate_calendar_dates(
+        old['start_date'],
+        [{'id': i + 100, 'day': i + 1, 'estimated_hours': h, 'is_completed': rng.random() < 0.2}
+         for i, h in enumerate(old['estimated_hours'])],
+        *scheduler_args(old))
+    new = edited_schedule(rng, old)
+
+    old_unavailable, new_unavailable = old['unavailable_dates'], new['unavailable_dates']
+    if use_index:
+        old_unavailable = DateIntervalIndex.from_dates(old_unavailable)
+        new_unavailable = DateIntervalIndex.from_dates(new_unavailable)
+    changed_from = first_changed_date(old['start_date'], new['start_date'], old['hours_per_day'],
+                                      new['hours_per_day'], old_unavailable, new_unavailable)
+
+    full = reschedule_incomplete_topics(topics, new['start_date'], *scheduler_args(new))
+    old_due = {t['id']: t['due_date'] for t in topics}
+    expected = [(t['id'], old_due[t['id']], t['due_date']) for t in full if t['due_date'] != old_due[t['id']]]
+
+    hours_per_day, _dates, weekly_pattern, skip_weekends, skip_weekdays = scheduler_args(new)
+    diff = reschedule_diff(topics, new['start_date'], hours_per_day, new_unavailable,
+                           weekly_pattern, skip_weekends, skip_weekdays, changed_from=changed_from)
+
+    assert sorted(diff) == sorted(expected)
+
+
+START = date(2025, 3, 3)
+BLOCKED = [date(2025, 3, 10) + timedelta(days=i) for i in range(5)]
+
+
+@pytest.mark.parametrize("old, new, expected", [
+    # Unchanged input
+    ((START, 2.0, BLOCKED), (START, 2.0, BLOCKED), date.max),
+    # Start date moved either way: the earlier start
+    ((START, 2.0, BLOCKED), (date(2025, 3, 7), 2.0, BLOCKED), START),
+    ((START, 2.0, BLOCKED), (date(2025, 2, 24), 2.0, BLOCKED), date(2025, 2, 24)),
+    # Hours per day changed: everything
+    ((START, 2.0, BLOCKED), (START, 3.0, BLOCKED), date.min),
+    # No previous schedule: everything
+    ((None, 2.0, BLOCKED), (START, 2.0, BLOCKED), date.min),
+    # Added unavailable interval: its first day
+    ((START, 2.0, BLOCKED), (START, 2.0, BLOCKED + [date(2025, 4, 1), date(2025, 4, 2)]), date(2025, 4, 1)),
+    ((START, 2.0, []), (START, 2.0, BLOCKED), date(2025, 3, 10)),
+    # Interval extended or shortened: the first day only one of them blocks
+    ((START, 2.0, BLOCKED), (START, 2.0, BLOCKED + [date(2025, 3, 15)]), date(2025, 3, 15)),
+    ((START, 2.0, BLOCKED), (START, 2.0, BLOCKED[:3]), date(2025, 3, 13)),
+    ((START, 2.0, BLOCKED), (START, 2.0, BLOCKED[1:]), date(2025, 3, 10)),
+    # Start and interval both changed: the earlier of the two
+    ((START, 2.0, BLOCKED), (date(2025, 3, 20), 2.0, BLOCKED + [date(2025, 3, 5)]), START),
+])
+def test_first_changed_date(old, new, expected):
+    (old_start, old_hours, old_dates), (new_start, new_hours, new_dates) = old, new
+    assert first_changed_date(old_start, new_start, old_hours, new_hours, old_dates, new_dates) == expected
+    assert first_changed_date(old_start, new_start, old_hours, new_hours,
+                              DateIntervalIndex.from_dates(old_dates),
+                              DateIntervalIndex.from_dates(new_dates)) == expected
+
+
+def test_first_changed_date_compares_long_ranges_without_expanding():
+    old = DateIntervalIndex([(date(1, 1, 1), date(9999, 12, 1))])
+    new = DateIntervalIndex([(date(1, 1, 1), date(9999, 12, 1)), (date(9999, 12, 10), date(9999, 12, 20))])
+    assert first_changed_date(START, START, 2.0, 2.0, old, new) == date(9999, 12, 10)
+    assert first_changed_date(START, START, 2.0, 2.0, old, old) == date.max
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_first_changed_date_matches_day_by_day_comparison(seed):
+    rng = random.Random(seed)
+
+    def random_days():
+        days = set()
+        for _ in range(rng.randint(0, 4)):
+            first = START + timedelta(days=rng.randint(0, 60))
+            days.update(first + timedelta(days=i) for i in range(rng.randint(1, 12)))
+        return days
+
+    old_days = random_days()
+    new_days = set(old_days) if rng.random() < 0.3 else random_days()
+    toggled = old_days ^ new_days
+
+    result = first_changed_date(START, START, 2.0, 2.0,
+                                DateIntervalIndex.from_dates(old_days), DateIntervalIndex.from_dates(new_days))
+
+    assert result == (min(toggled) if toggled else date.max)
+
+
+def test_every_weekday_blocked_raises():
+    with pytest.raises(ValueError):
+        calculate_calendar_dates(date(2025, 1, 6), [{'estimated_hours': 2}], 2.0,
+                                 weekly_pattern={d: False for d in range(7)})
+
+
+# ============================================================================
+# DATE EXPRESSIONS
+# ============================================================================
+
+_MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+_FULL_MONTH_NAMES = ["January", "February", "March", "April", "May", "June", "July",
+                     "August", "September", "October", "November", "December"]
+
+
+def random_date_text(rng, day):
+    return rng.choice([
+        lambda: day.isoformat(),
+        lambda: f"{day.month}/{day.day}/{day.year}",
+        lambda: f"{day.month:02d}/{day.day:02d}/{day.year % 100:02d}",
+        lambda: f"{_MONTH_NAMES[day.month - 1]} {day.day}",
+        lambda: f"{_FULL_MONTH_NAMES[day.month - 1]} {day.day}",
+        lambda: f"{_MONTH_NAMES[day.month - 1].lower()} {day.day}",
+        lambda: f"Sept {day.day}",
+    ])()
+
+
+def random_expression(rng):
+    """A comma-separated expression mixing dates, ranges and junk"""
+    year = date.today().year
+    parts = []
+    for _ in range(rng.randint(1, 6)):
+        start = date(rng.choice([year, 2025, 2026]), 1, 1) + timedelta(days=rng.randint(0, 364))
+        end = start + timedelta(days=rng.randint(-2, 20))
+        kind = rng.random()
+        if kind < 0.35:
+            parts.append(random_date_text(rng, start))
+        elif kind < 0.55:
+            parts.append(f"{random_date_text(rng, start)}-{end.day}")
+        elif kind < 0.8:
+            parts.append(f"{random_date_text(rng, start)} {rng.choice(['to', 'TO', '-'])} {random_date_text(rng, end)}")
+        else:
+            parts.append(rng.choice(["Feb 30", "Foo 3", "13/40/2025", "soon", "", "2025-02-29", "Nov 20 - Oct 1"]))
+    return rng.choice([", ", ",", " , "]).join(parts)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_date_parser_finds_every_date_the_reference_found(seed):
+    text = random_expression(random.Random(seed))
+
+    found = parse_unavailable_dates(text)
+    expected = set(_reference_parse_unavailable_dates(text))
+
+    assert expected <= set(found), text
+    assert found == sorted(set(found))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Nov 20-22", [(date(date.today().year, 11, 20), date(date.today().year, 11, 22))]),
+    ("2025-11-20 to 2025-11-25, 2025-11-24", [(date(2025, 11, 20), date(2025, 11, 25))]),
+    ("October 5", [(date(date.today().year, 10, 5), date(date.today().year, 10, 5))]),
+    ("Dec 28 - Jan 3", [(date(date.today().year, 12, 28), date(date.today().year + 1, 1, 3))]),
+    ("11/20/25, Feb 30, nonsense", [(date(2025, 11, 20), date(2025, 11, 20))]),
+    ("", []),
+])
+def test_date_expressions(text, expected):
+    assert parse_unavailable_intervals(text) == expected
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_single_date_matches_reference(seed):
+    rng = random.Random(seed)
+    day = date(2025, 1, 1) + timedelta(days=rng.randint(0, 700))
+    text = random_date_text(rng, day)
+
+    expected = _reference_parse_single_date(text)
+    if expected is not None:
+        assert parse_single_date(text) == expected, text
@@ -0,0 +1,175 @@
+"""Tests for precomputed focus-area suggestions (utils/focus_suggestions.py)"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from utils import focus_suggestions
+from utils.focus_suggestions import (
+    ARTIFACT_VERSION,
+    FocusSuggestionStore,
+    get_focus_suggestions,
+    precompute_focus_suggestions,
+    template_fingerprint
+)
+from utils.templates import get_all_templates
+
+
+TEMPLATES = get_all_templates()[:3]
+LEVELS = ["Beginner", "Expert"]
+
+
+class Interrupted(BaseException):
+    """Stands in for the batch job being killed"""
+
+
+class FakeAI:
+    """Stands in for ClaudeAI; raises Interrupted once `fail_after` calls were made"""
+
+    model = "fake-model"
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.requested = []
+        self.live = []
+        self._lock = threading.Lock()
+
+    def request_focus_area_suggestions(self, template, proficiency):
+        with self._lock:
+            if self.fail_after is not None and len(self.requested) >= self.fail_after:
+                raise Interrupted()
+            self.requested.append((template['name'], proficiency))
+        return [f"{template['name']} focus", f"{proficiency} focus"]
+
+    def get_ai_suggestions_for_focus_areas(self, template, proficiency):
+        self.live.append((template['name'], proficiency))
+        return ["live suggestion"]
+
+
+def write_artifact(path, template, proficiency, suggestions, version=ARTIFACT_VERSION,
+                   generated_at=None, fingerprint=None):
+    entry = {
+        "fingerprint": fingerprint or template_fingerprint(template, proficiency),
+        "generated_at": time.time() if generated_at is None else generated_at,
+        "suggestions": suggestions
+    }
+    path.write_text(json.dumps({"version": version, "entries": {
+        f"{template['name']}|{proficiency}": entry
+    }}))
+
+
+@pytest.fixture
+def template():
+    return TEMPLATES[0].to_dict()
+
+
+def test_lookup_hit_and_miss(tmp_path, template):
+    path = tmp_path / "focus.json"
+    write_artifact(path, template, "Beginner", ["a", "b"])
+    store = FocusSuggestionStore(str(path))
+
+    assert store.lookup(template, "Beginner") == ["a", "b"]
+    assert store.lookup(template, "Expert") is None
+    assert store.lookup(TEMPLATES[1].to_dict(), "Beginner") is None
+    assert store.get_stats() == {'hits': 1, 'misses': 2, 'stale': 0, 'entries': 1}
+
+
+def test_missing_artifact_is_a_miss(tmp_path, template):
+    store = FocusSuggestionStore(str(tmp_path / "absent.json"))
+    assert store.lookup(template, "Beginner") is None
+    assert store.get_stats()['misses'] == 1
+
+
+def test_entry_older_than_max_age_is_stale(tmp_path, template):
+    path = tmp_path / "focus.json"
+    write_artifact(path, template, "Beginner", ["a"], generated_at=time.time() - 3 * 86400)
+
+    assert FocusSuggestionStore(str(path), max_age_days=2).lookup(template, "Beginner") is None
+    assert FocusSuggestionStore(str(path), max_age_days=4).lookup(template, "Beginner") == ["a"]
+
+
+def test_edited_template_is_stale(tmp_path, template):
+    path = tmp_path / "focus.json"
+    write_artifact(path, template, "Beginner", ["a"])
+    store = FocusSuggestionStore(str(path))
+
+    edited = dict(template, goal_text=template['goal_text'] + " (edited)")
+    assert store.lookup(edited, "Beginner") is None
+    assert store.get_stats()['stale'] == 1
+
+
+def test_fingerprint_mismatch_is_stale(tmp_path, template):
+    path = tmp_path / "focus.json"
+    write_artifact(path, template, "Beginner", ["a"], fingerprint="0" * 16)
+    assert FocusSuggestionStore(str(path)).lookup(template, "Beginner") is None
+
+
+def test_other_artifact_version_is_ignored(tmp_path, template):
+    path = tmp_path / "focus.json"
+    write_artifact(path, template, "Beginner", ["a"], version=ARTIFACT_VERSION + 1)
+    store = FocusSuggestionStore(str(path))
+
+    assert store.lookup(template, "Beginner") is None
+    assert store.get_stats()['entries'] == 0
+
+
+def test_get_focus_suggestions_falls_back_to_live_call(tmp_path, monkeypatch):
+    path = tmp_path / "focus.json"
+    write_artifact(path, TEMPLATES[0].to_dict(), "Beginner", ["precomputed"])
+    monkeypatch.setattr(focus_suggestions, "_store", FocusSuggestionStore(str(path)))
+    ai = FakeAI()
+
+    assert get_focus_suggestions(ai, TEMPLATES[0], "Beginner") == ["precomputed"]
+    assert get_focus_suggestions(ai, TEMPLATES[0], "Expert") == ["live suggestion"]
+    assert ai.live == [(TEMPLATES[0].name, "Expert")]
+
+
+def test_precompute_covers_every_pair(tmp_path):
+    path = tmp_path / "focus.json"
+    ai = FakeAI()
+
+    stats = precompute_focus_suggestions(ai, TEMPLATES, LEVELS, max_workers=2, path=str(path))
+
+    assert stats == {'total': 6, 'generated': 6, 'skipped': 0, 'failed': 0, 'errors': []}
+    store = FocusSuggestionStore(str(path))
+    for template in TEMPLATES:
+        for level in LEVELS:
+            assert store.lookup(template.to_dict(), level) == [f"{template.name} focus", f"{level} focus"]
+    assert json.loads(path.read_text())["model"] == "fake-model"
+
+
+def test_interrupted_precompute_resumes_from_checkpoint(tmp_path):
+    path = tmp_path / "focus.json"
+
+    with pytest.raises(Interrupted):
+        precompute_focus_suggestions(FakeAI(fail_after=4), TEMPLATES, LEVELS, max_workers=1,
+                                     path=str(path), checkpoint_every=2)
+    checkpointed = json.loads(path.read_text())["entries"]
+    assert len(checkpointed) == 4
+
+    ai = FakeAI()
+    stats = precompute_focus_suggestions(ai, TEMPLATES, LEVELS, max_workers=1, path=str(path))
+
+    assert (stats['generated'], stats['skipped']) == (2, 4)
+    assert not set(ai.requested) & {tuple(key.split("|")) for key in checkpointed}
+    assert len(json.loads(path.read_text())["entries"]) == 6
+
+
+def test_precompute_records_failures_and_force_regenerates(tmp_path):
+    path = tmp_path / "focus.json"
+    precompute_focus_suggestions(FakeAI(), TEMPLATES, LEVELS, path=str(path))
+
+    class FlakyAI(FakeAI):
+        def request_focus_area_suggestions(self, template, proficiency):
+            if proficiency == "Expert":
+                raise RuntimeError("rate limited")
+            return super().request_focus_area_suggestions(template, proficiency)
+
+    ai = FlakyAI()
+    stats = precompute_focus_suggestions(ai, TEMPLATES, LEVELS, path=str(path), force=True)
+
+    assert (stats['generated'], stats['failed'], stats['skipped']) == (3, 3, 0)
+    assert all("rate limited" in error for error in stats['errors'])
+    assert len(ai.requested) == 3
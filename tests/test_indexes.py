@@ -0,0 +1,146 @@
+"""
+Query plan regression tests for the secondary indexes (utils/migrations.py)
+
+Each test runs a real Database method against a freshly migrated database,
+captures the SQL it executes, and checks EXPLAIN QUERY PLAN for that SQL.
+"""
+
+import sqlite3
+
+import pytest
+
+from utils.database import Database
+from utils.migrations import INDEXES, SCHEMA_VERSION
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / "learnpath.db"), pool_size=1,
+                        resource_links_flush_interval=0)
+    path_id = database.save_learning_path("Learn SQL", 3, start_date="2025-01-06")
+    database.save_topics(path_id, [
+        {"day": day, "topic": f"Topic {day}", "subtopics": [], "estimated_hours": 2}
+        for day in (1, 2, 3)
+    ])
+    database.path_id = path_id
+    yield database
+    database.close()
+
+
+def captured_sql(db, call):
+    """Statements executed by call(), with their parameters inlined"""
+    statements = []
+    conn = db.get_connection()
+    conn.set_trace_callback(statements.append)
+    conn.close()
+    try:
+        call()
+    finally:
+        conn = db.get_connection()
+        conn.set_trace_callback(None)
+        conn.close()
+    return [s for s in statements if s.lstrip().upper().startswith(("SELECT", "UPDATE"))]
+
+
+def query_plan(db, sql):
+    """EXPLAIN QUERY PLAN details for one statement"""
+    conn = sqlite3.connect(db.db_path)
+    try:
+        return [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+    finally:
+        conn.close()
+
+
+def plans_for(db, call):
+    statements = captured_sql(db, call)
+    assert statements, "no queries were captured"
+    return [query_plan(db, sql) for sql in statements]
+
+
+def assert_no_table_scan(plan, *tables):
+    for detail in plan:
+        for table in tables:
+            assert not (detail.startswith(f"SCAN {table}") and "USING" not in detail), plan
+
+
+def test_migrated_database_has_every_index(db):
+    conn = sqlite3.connect(db.db_path)
+    try:
+        names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+    finally:
+        conn.close()
+    assert set(INDEXES) <= names
+    assert version == SCHEMA_VERSION
+
+
+@pytest.mark.parametrize("status", ["active", "on_hold", "archived"])
+def test_sidebar_filtered_by_status_uses_indexes(db, status):
+    for plan in plans_for(db, lambda: db.get_paths_with_stats(status)):
+        assert any("USING INDEX idx_learning_paths_status_updated" in d
+                   or "USING COVERING INDEX idx_learning_paths_status_updated" in d for d in plan), plan
+        assert any("idx_topics_path_day" in d for d in plan), plan
+        assert_no_table_scan(plan, "learning_paths", "p", "topics", "t")
+
+
+def test_sidebar_all_paths_joins_topics_by_index(db):
+    # Every non-deleted path is listed, so the paths table itself is read in
+    # full; each path's topics must still come from the index
+    for plan in plans_for(db, lambda: db.get_paths_with_stats()):
+        assert any("SEARCH t USING INDEX idx_topics_path_day" in d
+                   or "SEARCH t USING COVERING INDEX idx_topics_path_day" in d for d in plan), plan
+        assert_no_table_scan(plan, "topics", "t")
+
+
+def test_sidebar_by_status_uses_index(db):
+    for plan in plans_for(db, lambda: db.get_paths_by_status("active")):
+        assert any("USING INDEX idx_learning_paths_status_updated" in d for d in plan), plan
+
+
+def test_topics_by_path_use_index(db):
+    for call in (lambda: db.get_topics(db.path_id),
+                 lambda: db.get_topic_models(db.path_id),
+                 lambda: db.get_progress_stats(db.path_id)):
+        for plan in plans_for(db, call):
+            assert any("USING INDEX idx_topics_path_day" in d
+                       or "USING COVERING INDEX idx_topics_path_day" in d for d in plan), plan
+            assert_no_table_scan(plan, "topics", "t")
+
+
+def test_due_date_queries_use_indexes(db):
+    topic_ids = [t['id'] for t in db.get_topics(db.path_id)]
+    due_dates = [(topic_id, "2025-02-01") for topic_id in topic_ids]
+
+    for plan in plans_for(db, db.get_active_schedules):
+        assert any("USING INDEX idx_learning_paths_status_updated" in d for d in plan), plan
+        assert any("USING INDEX idx_topics_path_day" in d for d in plan), plan
+        assert_no_table_scan(plan, "learning_paths", "p", "topics", "t")
+
+    # Single-topic writes go straight to the row by its integer primary key
+    for call in (lambda: db.bulk_update_due_dates(db.path_id, due_dates),
+                 lambda: db.set_due_dates(due_dates)):
+        for plan in plans_for(db, call):
+            assert any("USING INTEGER PRIMARY KEY" in d for d in plan), plan
+            assert_no_table_scan(plan, "topics")
+
+
+def test_resource_link_writes_use_primary_key(db):
+    topic_id = db.get_topics(db.path_id)[0]['id']
+    for plan in plans_for(db, lambda: db.update_resource_links(topic_id, "https://example.com")):
+        assert any("SEARCH topics USING INTEGER PRIMARY KEY" in d for d in plan), plan
+
+
+def test_time_sessions_chats_and_reviews_use_indexes(db):
+    topic_id = db.get_topics(db.path_id)[0]['id']
+    db.add_time_session(topic_id, db.path_id, 30)
+    db.save_chat_message(db.path_id, "hello", "user")
+
+    expected = (
+        (lambda: db.get_time_sessions(topic_id), "idx_time_sessions_topic_date"),
+        (lambda: db.get_chat_history(db.path_id), "idx_coaching_chats_path_created"),
+        (lambda: db.get_coaching_reviews(db.path_id), "idx_coaching_reviews_path_created"),
+    )
+    for call, index in expected:
+        for plan in plans_for(db, call):
+            assert any(f"USING INDEX {index}" in d or f"USING COVERING INDEX {index}" in d
+                       for d in plan), plan
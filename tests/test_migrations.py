@@ -0,0 +1,80 @@
+"""Tests for versioned schema migrations (utils/migrations.py)"""
+
+import json
+import sqlite3
+
+import pytest
+
+from utils.migrations import MIGRATIONS, SCHEMA_VERSION, get_schema_version, migrate
+
+
+def migrate_to(conn, version):
+    """Apply migrations up to version, as an older release would have"""
+    cursor = conn.cursor()
+    for number, _description, apply in MIGRATIONS:
+        if number <= version:
+            apply(cursor)
+    conn.execute(f"PRAGMA user_version = {version}")
+    conn.commit()
+
+
+@pytest.fixture
+def v3_conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "old.db"))
+    migrate_to(conn, 3)
+    yield conn
+    conn.close()
+
+
+def insert_path(conn, unavailable_dates, weekly_pattern):
+    cursor = conn.execute(
+        "INSERT INTO learning_paths (goal, timeframe, unavailable_dates, weekly_pattern) VALUES (?, ?, ?, ?)",
+        ("goal", 7, unavailable_dates, weekly_pattern)
+    )
+    conn.commit()
+    return cursor.lastrowid
+
+
+def stored(conn, path_id):
+    return conn.execute("SELECT unavailable_dates, weekly_pattern FROM learning_paths WHERE id = ?",
+                        (path_id,)).fetchone()
+
+
+def test_fresh_database_reaches_latest_version(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / "new.db"))
+    assert migrate(conn) == [number for number, _d, _a in MIGRATIONS]
+    assert get_schema_version(conn) == SCHEMA_VERSION
+    assert migrate(conn) == []
+    conn.close()
+
+
+def test_migration_4_compacts_schedule_columns(v3_conn):
+    days = ["2025-12-21", "2025-12-20", "2025-12-22", "2025-11-27", "2025-12-22"]
+    path_id = insert_path(v3_conn, json.dumps(days), json.dumps({"5": False, "6": False, "0": True}))
+
+    assert migrate(v3_conn) == [4]
+    unavailable_dates, weekly_pattern = stored(v3_conn, path_id)
+    assert json.loads(unavailable_dates) == ["2025-11-27", ["2025-12-20", "2025-12-22"]]
+    assert weekly_pattern == "1111100"
+
+
+@pytest.mark.parametrize("unavailable_dates, weekly_pattern", [
+    ("not json", "{broken"),
+    ('{"a": 1}', '["mon"]'),
+    ('["2025-12-20", "someday"]', '{"monday": false}'),
+    ("[]", "{}"),
+])
+def test_migration_4_leaves_unreadable_values_unchanged(v3_conn, unavailable_dates, weekly_pattern):
+    path_id = insert_path(v3_conn, unavailable_dates, weekly_pattern)
+
+    migrate(v3_conn)
+    assert stored(v3_conn, path_id) == (unavailable_dates, weekly_pattern)
+
+
+def test_migration_4_keeps_compact_values(v3_conn):
+    path_id = insert_path(v3_conn, '["2025-11-27", ["2025-12-20", "2025-12-22"]]', "0111110")
+    null_id = insert_path(v3_conn, None, None)
+
+    migrate(v3_conn)
+    assert stored(v3_conn, path_id) == ('["2025-11-27", ["2025-12-20", "2025-12-22"]]', "0111110")
+    assert stored(v3_conn, null_id) == (None, None)
@@ -0,0 +1,178 @@
+"""Tests for plan creation in LearningPathGenerator (utils/path_generator.py)"""
+
+import pytest
+
+from utils.database import Database
+from utils.path_generator import LearningPathGenerator
+
+
+class FakeAI:
+    """Stands in for ClaudeAI.stream_learning_path with scripted batches"""
+
+    def __init__(self, batches):
+        self.batches = batches
+
+    def stream_learning_path(self, goal, timeframe, goal_type='learning', hours_per_day=2.0):
+        for batch in self.batches:
+            yield "days", batch
+        yield "plan", {"overview": "o", "curriculum": [e for b in self.batches for e in b]}
+
+
+@pytest.fixture
+def generator(tmp_path):
+    generator = LearningPathGenerator.__new__(LearningPathGenerator)
+    generator.db = Database(str(tmp_path / "learnpath.db"))
+    yield generator
+    generator.db.close()
+
+
+def test_stream_keeps_day_numbers_given_as_strings(generator):
+    generator.ai = FakeAI([
+        [{"day": "3", "topic": "Third"}],
+        [{"day": "two", "topic": "Second"}],
+        [{"day": 1.0, "topic": "First"}],
+    ])
+
+    events = list(generator.create_learning_path_stream("Learn SQL", 3))
+    path_id = events[-1]['path_id']
+
+    saved = {t['day']: t['topic'] for t in generator.db.get_topics(path_id)}
+    # "two" can't be read as a number, so it is numbered by arrival order
+    assert saved == {1: "First", 2: "Second", 3: "Third"}
+
+
+class FailingRouter:
+    def generate_text(self, **kwargs):
+        raise RuntimeError("provider down")
+
+    def stream_text(self, **kwargs):
+        raise RuntimeError("provider down")
+        yield
+
+
+class FallbackAI:
+    """ClaudeAI stand-in without set_model, so changing the shared model fails the test"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_learning_assistance(self, question, context="", model_name=None):
+        self.calls.append(model_name)
+        return "fallback answer"
+
+
+def test_assistance_fallback_picks_model_per_call():
+    generator = LearningPathGenerator.__new__(LearningPathGenerator)
+    generator.router = FailingRouter()
+    generator.ai = FallbackAI()
+
+    answered_by, streamed_by = {}, {}
+    assert generator.get_assistance("q", model_selection="OpenAI / GPT-4",
+                                    answered_by=answered_by) == "fallback answer"
+    assert "".join(generator.stream_assistance("q", model_selection="OpenAI / GPT-4",
+                                               answered_by=streamed_by)) == "fallback answer"
+    assert generator.ai.calls == ["Claude Sonnet 4.5", "Claude Sonnet 4.5"]
+    assert answered_by == streamed_by == {'model': "Claude / Claude Sonnet 4.5"}
+
+
+def test_learning_assistance_model_does_not_change_shared_client():
+    from utils.ai_helpers import ClaudeAI
+
+    sent = []
+
+    class Messages:
+        def create(self, **kwargs):
+            sent.append(kwargs["model"])
+            return type("Message", (), {"content": [type("Block", (), {"text": "ok"})()]})()
+
+    class RecordingClaudeAI(ClaudeAI):
+        client = type("Client", (), {"messages": Messages()})()
+
+    ai = RecordingClaudeAI(api_key="sk-ant-test", model_name="Claude Haiku")
+    ai.get_learning_assistance("q", model_name="Claude Sonnet 4.5")
+    ai.get_learning_assistance("q")
+
+    assert sent == [ClaudeAI.MODELS["Claude Sonnet 4.5"], ClaudeAI.MODELS["Claude Haiku"]]
+    assert ai.model == ClaudeAI.MODELS["Claude Haiku"]
+
+
+def test_close_stops_router_threads_and_flushes_database(tmp_path, monkeypatch):
+    from utils import path_generator
+
+    monkeypatch.setattr(path_generator, "Database", lambda: Database(str(tmp_path / "learnpath.db")))
+    generator = LearningPathGenerator(api_key="sk-ant-test")
+    path_id = generator.db.save_learning_path("Learn SQL", 1)
+    topic_id, = generator.db.save_topics(path_id, [{"day": 1, "topic": "Joins"}])
+    generator.db.update_resource_links(topic_id, "queued")
+
+    generator.close()
+
+    assert generator.router._executor._shutdown
+    assert generator.db.pool.get_stats()['open'] == 0
+    reopened = Database(str(tmp_path / "learnpath.db"))
+    assert reopened.get_topics(path_id)[0]['resource_links'] == "queued"
+    reopened.close()
+
+
+class ClosingGenerator:
+    def __init__(self, api_key=None):
+        self.api_key = api_key
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class PooledClient:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def shared_generator(monkeypatch):
+    from utils import ai_providers, path_generator
+
+    monkeypatch.setattr(path_generator, "LearningPathGenerator", ClosingGenerator)
+    monkeypatch.setattr(path_generator, "_shared_generator", None)
+    monkeypatch.setattr(path_generator, "_shared_generator_key", None)
+    monkeypatch.setattr(ai_providers, "_default_manager", None)
+    return path_generator
+
+
+def released(monkeypatch, call):
+    """Run call() with a pooled client and a default manager in place; report what survived"""
+    from utils import ai_providers
+    from utils.client_pool import get_shared_client
+
+    client = get_shared_client(("test", "released"), PooledClient)
+    monkeypatch.setattr(ai_providers, "_default_manager", object())
+    call()
+    return client.closed, ai_providers._default_manager is None
+
+
+def test_changed_api_key_closes_previous_generator(shared_generator):
+    first = shared_generator.get_shared_generator("key-1")
+    assert shared_generator.get_shared_generator("key-1") is first
+    assert not first.closed
+
+    second = shared_generator.get_shared_generator("key-2")
+
+    assert second is not first and second.api_key == "key-2"
+    assert first.closed and not second.closed
+
+
+def test_changed_api_key_drops_clients_and_default_manager(shared_generator, monkeypatch):
+    shared_generator.get_shared_generator("key-1")
+
+    assert released(monkeypatch, lambda: shared_generator.get_shared_generator("key-1")) == (False, False)
+    assert released(monkeypatch, lambda: shared_generator.get_shared_generator("key-2")) == (True, True)
+
+
+def test_reset_closes_generator_clients_and_default_manager(shared_generator, monkeypatch):
+    generator = shared_generator.get_shared_generator("key-1")
+
+    assert released(monkeypatch, shared_generator.reset_shared_generator) == (True, True)
+    assert generator.closed
+    assert shared_generator.get_shared_generator("key-1") is not generator
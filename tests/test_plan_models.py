@@ -0,0 +1,58 @@
+"""Tests for validated plan models (utils/plan_models.py)"""
+
+import pytest
+
+from utils.plan_models import Plan, PlanValidationError, Topic
+
+
+LEARNING_PLAN = {
+    "overview": "Learn SQL",
+    "milestones": ["Basics"],
+    "curriculum": [
+        {
+            "day": 1,
+            "topic": "SELECT",
+            "subtopics": ["columns", "WHERE"],
+            "learning_objectives": ["Write a filtered query", "Sort results"],
+            "estimated_hours": 2,
+            "priority": "high",
+            "resources": [{"type": "article", "name": "SQL intro", "url": "https://example.com"}],
+            "due_date": None,
+            "notes": ""
+        }
+    ]
+}
+
+
+def test_learning_objectives_survive_a_round_trip():
+    plan = Plan.from_ai(LEARNING_PLAN, "learning", 2.0)
+    entry = plan.to_dict()["curriculum"][0]
+
+    assert entry["learning_objectives"] == ["Write a filtered query", "Sort results"]
+    assert entry["subtopics"] == ["columns", "WHERE"]
+    assert Plan.from_ai(plan.to_dict(), "learning", 2.0).to_dict() == plan.to_dict()
+
+
+def test_objectives_are_not_stored_as_subtopics():
+    topic = Topic.from_ai(LEARNING_PLAN["curriculum"][0], "learning")
+    assert topic.subtopics == ["columns", "WHERE"]
+    assert '"Sort results"' not in topic.to_row(1)[3]
+
+
+def test_goal_schema_fields_are_mapped():
+    topic = Topic.from_ai({"day": 2, "focus": "Portfolio", "action_items": ["Ship it"],
+                           "deliverable": "Site"}, "career", 1.5)
+    entry = topic.to_dict("career")
+
+    assert (topic.topic, topic.subtopics, topic.notes, topic.estimated_hours) == ("Portfolio", ["Ship it"], "Site", 1.5)
+    assert entry["focus"] == "Portfolio" and entry["action_items"] == ["Ship it"] and entry["deliverable"] == "Site"
+
+
+def test_invalid_and_duplicate_entries_are_dropped():
+    plan = Plan.from_ai({"curriculum": [{"day": 1, "topic": "a"}, {"day": 1, "topic": "b"},
+                                         {"day": "x", "topic": "c"}, "junk"]})
+    assert [t.topic for t in plan.topics] == ["a"]
+    assert len(plan.errors) == 3
+
+    with pytest.raises(PlanValidationError):
+        Plan.from_ai({"curriculum": [{"topic": "no day"}]})
@@ -0,0 +1,201 @@
+"""Tests for segmented plan generation (utils/plan_segments.py, ClaudeAI._iter_plan_segments)"""
+
+import json
+import re
+import threading
+
+import pytest
+
+from utils.ai_helpers import ClaudeAI
+from utils.plan_segments import (
+    align_segment_days,
+    find_missing_days,
+    normalize_phases,
+    should_segment,
+    split_day_ranges,
+    stitch_segments
+)
+
+
+def spans(phases):
+    return [(p["start_day"], p["end_day"]) for p in phases]
+
+
+# ============================================================================
+# PHASES AND DAY RANGES
+# ============================================================================
+
+def test_normalize_phases_tiles_the_timeframe():
+    phases = normalize_phases([
+        {"title": "B", "start_day": 12, "end_day": 40},    # Past the end: clipped
+        {"title": "A", "start_day": 0, "end_day": 8},      # Before day 1: clipped
+        {"title": "Inside A", "start_day": 3, "end_day": 6},  # Covered by A: dropped
+        {"title": "Broken", "start_day": "x", "end_day": 9},
+        "not a phase",
+    ], 30)
+
+    # The gap (days 9-11) goes to the following phase
+    assert spans(phases) == [(1, 8), (9, 30)]
+    assert [p["title"] for p in phases] == ["A", "B"]
+
+
+def test_normalize_phases_extends_last_phase_and_falls_back():
+    assert spans(normalize_phases([{"start_day": 1, "end_day": 10}], 20)) == [(1, 20)]
+    assert spans(normalize_phases([{"start_day": 1, "end_day": 6}, {"start_day": 4, "end_day": 9}], 9)) == [(1, 6), (7, 9)]
+
+    fallback = normalize_phases([{"start_day": 5, "end_day": 2}], 20)
+    assert [p["title"] for p in fallback] == ["Foundation", "Application", "Integration", "Mastery"]
+    assert spans(fallback) == [(1, 6), (7, 13), (14, 17), (18, 20)]
+    assert spans(normalize_phases(None, 2)) == [(1, 1), (2, 2)]
+
+
+def test_split_day_ranges_bounds_segment_size():
+    phases = [{"title": "A", "start_day": 1, "end_day": 10}, {"title": "B", "start_day": 11, "end_day": 12}]
+    segments = split_day_ranges(phases, days_per_segment=4)
+
+    assert [(p["title"], start, end) for p, start, end in segments] == [
+        ("A", 1, 4), ("A", 5, 8), ("A", 9, 10), ("B", 11, 12)
+    ]
+    # No size given: DAYS_PER_SEGMENT
+    assert split_day_ranges(phases, days_per_segment=0) == split_day_ranges(phases)
+
+
+def test_should_segment():
+    assert should_segment("learning", 60)
+    assert not should_segment("learning", 7)
+    assert not should_segment("freelance", 90)
+
+
+# ============================================================================
+# ALIGNING AND STITCHING
+# ============================================================================
+
+def test_align_keeps_absolute_day_numbers():
+    items = [{"day": 15, "topic": "a"}, {"day": 16, "topic": "b"}, {"day": 30, "topic": "out"}]
+    assert align_segment_days(items, 15, 16) == items[:2]
+
+
+def test_align_shifts_segment_numbered_from_one():
+    items = [{"day": 1, "topic": "a"}, {"day": "2", "topic": "b"}]
+    assert align_segment_days(items, 15, 16) == [{"day": 15, "topic": "a"}, {"day": 16, "topic": "b"}]
+
+
+def test_align_numbers_unnumbered_items_by_position_and_drops_junk():
+    items = [{"topic": "a"}, "junk", {"day": "soon", "topic": "b"}, {"day": 99, "topic": "c"}]
+    assert align_segment_days(items, 5, 8) == [{"day": 5, "topic": "a"}, {"day": 6, "topic": "b"}]
+
+
+def test_stitch_orders_by_day_and_first_segment_wins():
+    first = [{"day": 3, "topic": "first 3"}, {"day": 1, "topic": "1"}]
+    second = [{"day": 3, "topic": "second 3"}, {"day": 2, "topic": "2"}]
+    assert stitch_segments([first, second]) == [
+        {"day": 1, "topic": "1"}, {"day": 2, "topic": "2"}, {"day": 3, "topic": "first 3"}
+    ]
+
+
+def test_find_missing_days():
+    items = [{"day": d} for d in (2, 3, 6, 7)]
+    assert find_missing_days(items, 9) == [(1, 1), (4, 5), (8, 9)]
+    assert find_missing_days([{"day": d} for d in range(1, 5)], 4) == []
+    assert find_missing_days([], 2) == [(1, 2)]
+
+
+# ============================================================================
+# SEGMENTED GENERATION WITH A STUBBED CLIENT
+# ============================================================================
+
+_SEGMENT_PROMPT = re.compile(r"STEP 2 - DAYS (\d+)-(\d+) ONLY")
+
+
+class ScriptedMessages:
+    """
+    Stands in for client.messages
+
+    The outline has phases 1-15 and 16-30. Segment responses come from
+    segment(start_day, end_day, attempt), attempt counting from 0 per range.
+    """
+
+    def __init__(self, segment):
+        self.segment = segment
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def create(self, **kwargs):
+        prompt = kwargs["messages"][0]["content"]
+        match = _SEGMENT_PROMPT.search(prompt)
+        if match is None:
+            body = {"overview": "o", "milestones": ["m"], "sections": [
+                {"title": "One", "start_day": 1, "end_day": 15, "focus": "f"},
+                {"title": "Two", "start_day": 16, "end_day": 30, "focus": "f"},
+            ]}
+        else:
+            start_day, end_day = int(match.group(1)), int(match.group(2))
+            with self._lock:
+                attempt = self.requests.count((start_day, end_day))
+                self.requests.append((start_day, end_day))
+            body = {"curriculum": self.segment(start_day, end_day, attempt)}
+        return type("Message", (), {"content": [type("Block", (), {"text": json.dumps(body)})()]})()
+
+
+def scripted_ai(segment):
+    messages = ScriptedMessages(segment)
+
+    class ScriptedClaudeAI(ClaudeAI):
+        client = type("Client", (), {"messages": messages})()
+
+    return ScriptedClaudeAI(api_key="sk-ant-test"), messages
+
+
+def days(start_day, end_day, first_number=None):
+    first_number = start_day if first_number is None else first_number
+    return [{"day": first_number + i, "topic": f"Day {start_day + i}"} for i in range(end_day - start_day + 1)]
+
+
+def run_segments(ai):
+    return list(ai._iter_plan_segments("system", "user", 30, "curriculum", "milestones", 0.6))
+
+
+def test_segments_numbered_from_one_are_aligned_without_retry():
+    ai, messages = scripted_ai(lambda start, end, attempt: days(start, end, first_number=1))
+
+    events = run_segments(ai)
+
+    kind, plan = events[-1]
+    assert kind == "plan"
+    assert [t["day"] for t in plan["curriculum"]] == list(range(1, 31))
+    assert [t["topic"] for t in plan["curriculum"]] == [f"Day {d}" for d in range(1, 31)]
+    assert (plan["overview"], plan["milestones"]) == ("o", ["m"])
+    assert sorted(messages.requests) == [(1, 14), (15, 15), (16, 29), (30, 30)]
+
+
+def test_duplicate_and_missing_days_are_retried_once():
+    def segment(start, end, attempt):
+        if (start, end) == (16, 29) and attempt == 0:
+            # Repeats day 16 and skips days 20-22
+            return days(16, 19) + [{"day": 16, "topic": "duplicate"}] + days(23, 29)
+        return days(start, end)
+
+    ai, messages = scripted_ai(segment)
+
+    events = run_segments(ai)
+    plan = events[-1][1]
+
+    assert [t["day"] for t in plan["curriculum"]] == list(range(1, 31))
+    assert plan["curriculum"][15]["topic"] == "Day 16"
+    assert messages.requests.count((20, 22)) == 1
+    assert len(messages.requests) == 5
+    assert events[-2] == ("days", days(20, 22))
+
+
+def test_failed_segment_is_retried_once_then_raises():
+    def segment(start, end, attempt):
+        if start <= 5 <= end:
+            return [item for item in days(start, end) if item["day"] != 5]
+        return days(start, end)
+
+    ai, messages = scripted_ai(segment)
+
+    with pytest.raises(ValueError, match=r"missing day\(s\) 5$"):
+        run_segments(ai)
+    assert messages.requests.count((5, 5)) == 1
+    assert len(messages.requests) == 5
@@ -0,0 +1,104 @@
+"""Tests for the AI response cache and its use in ClaudeAI (utils/response_cache.py)"""
+
+import pytest
+
+from utils import ai_helpers
+from utils.ai_helpers import ClaudeAI
+from utils.response_cache import ResponseCache, make_cache_key
+
+
+class Messages:
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        text = f'["answer {self.calls}"]'
+        if '"goal_text"' in kwargs["messages"][0]["content"]:
+            text = f'{{"goal_text": "answer {self.calls}"}}'
+        return type("Message", (), {"content": [type("Block", (), {"text": text})()]})()
+
+
+@pytest.fixture
+def ai(tmp_path, monkeypatch):
+    cache = ResponseCache(db_path=str(tmp_path / "cache.db"))
+    monkeypatch.setattr(ai_helpers, "get_response_cache", lambda: cache)
+
+    messages = Messages()
+
+    class RecordingClaudeAI(ClaudeAI):
+        client = type("Client", (), {"messages": messages})()
+
+    claude = RecordingClaudeAI(api_key="sk-ant-test")
+    claude.messages = messages
+    yield claude
+    cache.close()
+
+
+def test_deterministic_calls_are_cached(ai):
+    first, key = ai._create_cached("prompt", max_tokens=100, temperature=0)
+    ai._store_cached(key, first)
+    second, second_key = ai._create_cached("prompt", max_tokens=100, temperature=0)
+
+    assert second == first
+    assert second_key is None
+    assert ai.messages.calls == 1
+
+
+def test_sampled_calls_bypass_the_cache(ai):
+    first, key = ai._create_cached("prompt", max_tokens=100, temperature=0.8)
+    ai._store_cached(key, first)
+    second, _key = ai._create_cached("prompt", max_tokens=100, temperature=0.8)
+
+    assert key is None
+    assert second != first
+    assert ai.messages.calls == 2
+
+
+def test_sampled_calls_opting_in_keep_a_bounded_set_of_answers(ai, monkeypatch):
+    slots = iter([0, 1, 0, 2, 1, 2, 0])
+    monkeypatch.setattr(ai_helpers.random, "randrange", lambda n: next(slots))
+
+    answers = []
+    for _ in range(7):
+        text, key = ai._create_cached("prompt", max_tokens=100, temperature=0.8, variants=3)
+        ai._store_cached(key, text)
+        answers.append(text)
+
+    # One model call per slot, then every answer comes from the cache
+    assert ai.messages.calls == 3
+    assert answers == ['["answer 1"]', '["answer 2"]', '["answer 1"]', '["answer 3"]',
+                       '["answer 2"]', '["answer 3"]', '["answer 1"]']
+
+
+def test_sampled_variants_are_keyed_by_temperature(ai, monkeypatch):
+    monkeypatch.setattr(ai_helpers.random, "randrange", lambda n: 0)
+
+    for temperature in (0.5, 0.8, 0.5, 0.8):
+        text, key = ai._create_cached("prompt", max_tokens=100, temperature=temperature, variants=2)
+        ai._store_cached(key, text)
+
+    assert ai.messages.calls == 2
+
+
+@pytest.mark.parametrize("method, args, temperature", [
+    ("generate_practice_problems", ("SQL joins",), 0.8),
+    ("find_resources", ("SQL joins",), 0.5),
+    ("request_focus_area_suggestions", ({"name": "SQL", "description": "Databases"}, "Beginner"), 0.6),
+    ("generate_personalized_goal", ("Beginner", "Get a data job", "SQL"), 0.8),
+])
+def test_sampled_helpers_reuse_cached_variants(ai, monkeypatch, method, args, temperature):
+    sent = []
+    create = ai.messages.create
+    monkeypatch.setattr(ai.messages, "create", lambda **kwargs: sent.append(kwargs["temperature"]) or create(**kwargs))
+    monkeypatch.setattr(ai_helpers.random, "randrange", lambda n: n - 1)
+
+    first = getattr(ai, method)(*args)
+    second = getattr(ai, method)(*args)
+
+    assert first == second
+    assert sent == [temperature]
+
+
+def test_cache_key_ignores_trailing_whitespace():
+    assert make_cache_key("m", "", "a  \nb\n", 10, 0) == make_cache_key("m", "", "a\nb", 10, 0.0)
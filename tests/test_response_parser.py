@@ -0,0 +1,154 @@
+"""Tests for AI response JSON extraction and truncation repair (utils/response_parser.py)"""
+
+import json
+import random
+import re
+
+import pytest
+
+from utils.response_parser import ExtractionError, extract_json, extract_plan
+
+
+def make_plan(rng, entries):
+    return {
+        "overview": "Plan with \"quotes\", commas, and [brackets] {braces}",
+        "milestones": [f"Milestone {i}" for i in range(rng.randint(0, 4))],
+        "curriculum": [
+            {
+                "day": day,
+                "topic": f"Topic {day}, part {rng.randint(1, 9)}",
+                "subtopics": [f"Sub {day}.{i}" for i in range(rng.randint(0, 4))],
+                "estimated_hours": rng.choice([1, 1.5, 2, 3]),
+                "priority": rng.choice(["high", "medium", "low"]),
+                "resources": [
+                    {"type": "article", "name": f"Doc {day}.{i}", "url": f"https://example.com/{day}/{i}"}
+                    for i in range(rng.randint(0, 2))
+                ]
+            }
+            for day in range(1, entries + 1)
+        ]
+    }
+
+
+def wrap(rng, body, truncated):
+    """Add the fences and prose models put around JSON"""
+    prefix = rng.choice(["", "Here is your plan:\n", "Sure! [draft] below.\n\n"])
+    fence = rng.random() < 0.5
+    text = prefix + ("```json\n" if fence else "") + body
+    if not truncated:
+        text += ("\n```" if fence else "") + rng.choice(["", "\n\nLet me know {if} you need changes."])
+    return text
+
+
+def assert_prefix_of(value, reference):
+    """Recovered value keeps whole values from the reference, lists cut only at the end"""
+    assert isinstance(value, dict)
+    assert set(value) <= set(reference)
+    for key, item in value.items():
+        if isinstance(item, list):
+            assert item == reference[key][:len(item)], key
+        else:
+            assert item == reference[key], key
+
+
+def test_partial_trailing_entry_is_dropped_not_shortened():
+    text = '{"curriculum": [{"day": 0, "topic": "x"}, {"day": 1, "subtopics": ["a", "b"'
+    assert extract_json(text) == {"curriculum": [{"day": 0, "topic": "x"}]}
+
+
+def test_partial_entry_in_bare_array_is_dropped():
+    text = '[{"day": 1, "topic": "a"}, {"day": 2, "resources": [{"name": "n"}, {"name"'
+    assert extract_json(text) == [{"day": 1, "topic": "a"}]
+
+
+def test_trailing_commas_are_removed():
+    text = '```json\n{"curriculum": [{"day": 1, "subtopics": ["a",],},],}\n```'
+    assert extract_json(text) == {"curriculum": [{"day": 1, "subtopics": ["a"]}]}
+
+
+def test_extract_plan_wraps_bare_array():
+    plan = extract_plan('[{"day": 1, "focus": "x"}]', "career")
+    assert plan == {"schedule": [{"day": 1, "focus": "x"}]}
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_fuzz_wrapped_plans_match_reference(seed):
+    rng = random.Random(seed)
+    reference = make_plan(rng, rng.randint(1, 6))
+    body = json.dumps(reference, indent=rng.choice([None, 2]))
+
+    assert extract_json(wrap(rng, body, truncated=False)) == reference
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_fuzz_truncated_plans_keep_only_complete_values(seed):
+    rng = random.Random(1000 + seed)
+    reference = make_plan(rng, rng.randint(1, 6))
+    body = json.dumps(reference, indent=rng.choice([None, 2]))
+
+    for cut in sorted(rng.sample(range(1, len(body)), min(60, len(body) - 1))):
+        text = wrap(rng, body[:cut], truncated=True)
+        try:
+            value = extract_json(text)
+        except ExtractionError:
+            continue
+        assert_prefix_of(value, reference)
+        for entry in value.get("curriculum", []):
+            assert entry in reference["curriculum"]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_fuzz_truncated_plans_keep_every_complete_entry(seed):
+    rng = random.Random(2000 + seed)
+    reference = make_plan(rng, rng.randint(2, 6))
+    body = json.dumps(reference)
+
+    # Cut just after the comma that follows each complete entry
+    entries = reference["curriculum"]
+    for count in range(1, len(entries)):
+        complete = json.dumps(entries[:count])[:-1] + ", "
+        cut = body.index(complete) + len(complete) + rng.randint(0, 20)
+        value = extract_json(wrap(rng, body[:cut], truncated=True))
+        assert value["curriculum"] == entries[:count]
+
+
+# ============================================================================
+# LARGE RESPONSES (a year-long plan, about 100 KB of JSON)
+# ============================================================================
+
+@pytest.fixture(scope="module")
+def year_plan():
+    reference = make_plan(random.Random(7), 365)
+    return reference, json.dumps(reference, indent=2)
+
+
+def test_large_wrapped_plan_is_extracted_whole(year_plan):
+    reference, body = year_plan
+    assert len(body) > 100_000
+    text = "Here is your year-long plan:\n\n```json\n" + body + "\n```\n\nGood luck {and} have fun!"
+    assert extract_json(text) == reference
+    assert extract_plan(text)["curriculum"] == reference["curriculum"]
+
+
+def test_large_plan_with_trailing_commas_is_repaired(year_plan):
+    reference, body = year_plan
+    text = "```json\n" + body.replace("\n    }", ",\n    }").replace("\n  ]", ",\n  ]") + "\n```"
+    assert text.count(",\n    }") == 365
+    assert extract_json(text) == reference
+
+
+@pytest.mark.parametrize("fraction", [0.1, 0.5, 0.9, 0.999])
+def test_large_truncated_plan_keeps_every_complete_entry(year_plan, fraction):
+    reference, body = year_plan
+    cut = int(len(body) * fraction)
+    text = "Sure, here it is.\n```json\n" + body[:cut]
+
+    plan = extract_plan(text)
+
+    entries = plan["curriculum"]
+    # Every entry that ended before the cut is kept, the partial one is not
+    entry_ends = [m.end() for m in re.finditer(r"\n    \}", body)]
+    assert len(entry_ends) == 365
+    assert len(entries) == sum(1 for end in entry_ends if end <= cut)
+    assert entries == reference["curriculum"][:len(entries)]
+    assert plan["overview"] == reference["overview"]
@@ -0,0 +1,148 @@
+"""Tests for latency-aware routing and hedging (utils/routing.py)"""
+
+import time
+
+import pytest
+
+from utils.ai_providers import TextChunk
+from utils.path_generator import LearningPathGenerator
+from utils.routing import HedgedRouter, HedgePolicy
+
+
+class FakeManager:
+    """Stands in for AIProviderManager with scripted per-provider delays"""
+
+    def __init__(self, delays, failing=()):
+        self.delays = delays
+        self.failing = set(failing)
+        self.providers = {
+            name: {"configured": True, "models": [f"{name} Model"]}
+            for name in delays
+        }
+        self.stream_calls = []
+
+    def generate_text(self, provider_name, model_name, prompt, system_prompt="", max_tokens=2000):
+        time.sleep(self.delays[provider_name])
+        if provider_name in self.failing:
+            raise RuntimeError(f"{provider_name} failed")
+        return f"answer from {provider_name}"
+
+    def stream_text(self, provider_name, model_name, prompt, system_prompt="", max_tokens=2000):
+        self.stream_calls.append(provider_name)
+        time.sleep(self.delays[provider_name])
+        if provider_name in self.failing:
+            raise RuntimeError(f"{provider_name} failed")
+        for word in ("answer ", "from ", provider_name):
+            yield TextChunk(word, provider_name, model_name)
+        yield TextChunk("", provider_name, model_name, is_final=True)
+
+
+def make_router(manager, **policy):
+    settings = dict(enabled=True, hedge_models=[], default_delay=0.05, min_delay=0.05,
+                    min_samples=5, max_error_rate=0.5, timeout=5.0)
+    settings.update(policy)
+    return HedgedRouter(manager, HedgePolicy(**settings))
+
+
+def test_hedging_is_opt_in(monkeypatch):
+    monkeypatch.delenv("AI_HEDGE_ENABLED", raising=False)
+    assert HedgePolicy().enabled is False
+    monkeypatch.setenv("AI_HEDGE_ENABLED", "true")
+    assert HedgePolicy().enabled is True
+
+
+def test_disabled_policy_never_hedges():
+    manager = FakeManager({"Slow": 0.2, "Fast": 0.0})
+    router = make_router(manager, enabled=False)
+
+    answer = router.generate_text("Slow", "Slow Model", "hi")
+    chunks = list(router.stream_text("Slow", "Slow Model", "hi"))
+
+    assert (answer.text, answer.provider) == ("answer from Slow", "Slow")
+    assert {c.provider for c in chunks} == {"Slow"}
+    assert router.get_metrics()['hedges_fired'] == 0
+
+
+def test_generate_text_reports_answering_model():
+    manager = FakeManager({"Slow": 1.0, "Fast": 0.0})
+    router = make_router(manager)
+
+    answer = router.generate_text("Slow", "Slow Model", "hi")
+
+    assert answer.text == "answer from Fast"
+    assert (answer.provider, answer.model) == ("Fast", "Fast Model")
+    assert router.get_metrics()['hedge_wins'] == 1
+
+
+def test_fast_primary_stream_is_not_hedged():
+    manager = FakeManager({"Slow": 0.0, "Fast": 0.0})
+    router = make_router(manager, default_delay=1.0)
+
+    text = "".join(c.text for c in router.stream_text("Slow", "Slow Model", "hi"))
+
+    assert text == "answer from Slow"
+    metrics = router.get_metrics()
+    assert metrics['hedges_fired'] == 0
+    assert metrics['primary_wins'] == 1
+    assert metrics['first_chunk']["Slow / Slow Model"]['successes'] == 1
+
+
+def test_slow_primary_stream_is_hedged():
+    manager = FakeManager({"Slow": 1.0, "Fast": 0.0})
+    router = make_router(manager)
+
+    started = time.perf_counter()
+    text = "".join(c.text for c in router.stream_text("Slow", "Slow Model", "hi"))
+
+    assert text == "answer from Fast"
+    assert time.perf_counter() - started < 0.9
+    metrics = router.get_metrics()
+    assert metrics['hedges_fired'] == 1
+    assert metrics['hedge_wins'] == 1
+    assert metrics['first_chunk']["Fast / Fast Model"]['successes'] == 1
+
+
+def test_failed_primary_stream_hedges_immediately():
+    manager = FakeManager({"Slow": 0.0, "Fast": 0.0}, failing={"Slow"})
+    router = make_router(manager, default_delay=5.0)
+
+    text = "".join(c.text for c in router.stream_text("Slow", "Slow Model", "hi"))
+
+    assert text == "answer from Fast"
+    assert router.get_metrics()['first_chunk']["Slow / Slow Model"]['errors'] == 1
+
+
+def test_stream_raises_primary_error_when_every_attempt_fails():
+    manager = FakeManager({"Slow": 0.0, "Fast": 0.0}, failing={"Slow", "Fast"})
+    router = make_router(manager)
+
+    with pytest.raises(RuntimeError, match="Slow failed"):
+        list(router.stream_text("Slow", "Slow Model", "hi"))
+    assert router.get_metrics()['failures'] == 1
+
+
+def test_chat_stream_hedges_slow_primary():
+    manager = FakeManager({"Slow": 1.0, "Fast": 0.0})
+    generator = LearningPathGenerator.__new__(LearningPathGenerator)
+    generator.ai_manager = manager
+    generator.router = make_router(manager)
+
+    answered_by = {}
+    text = "".join(generator.stream_assistance("What is recursion?", model_selection="Slow / Slow Model",
+                                               answered_by=answered_by))
+
+    assert text == "answer from Fast"
+    assert answered_by == {'model': "Fast / Fast Model"}
+    assert manager.stream_calls[:2] == ["Slow", "Fast"]
+    assert generator.get_routing_metrics()['hedge_wins'] == 1
+
+
+def test_chat_answer_reports_hedge_model():
+    manager = FakeManager({"Slow": 1.0, "Fast": 0.0})
+    generator = LearningPathGenerator.__new__(LearningPathGenerator)
+    generator.router = make_router(manager)
+
+    answered_by = {}
+    assert generator.get_assistance("q", model_selection="Slow / Slow Model",
+                                    answered_by=answered_by) == "answer from Fast"
+    assert answered_by == {'model': "Fast / Fast Model"}
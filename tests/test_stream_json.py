@@ -0,0 +1,62 @@
+"""Tests for incremental plan parsing (utils/stream_json.py)"""
+
+import json
+
+from utils.stream_json import StreamingPlanParser
+
+
+PLAN = {
+    "overview": "Learn SQL",
+    "milestones": ["Basics", "Joins"],
+    "curriculum": [
+        {"day": day, "topic": f"Topic {day}", "subtopics": [f"{day}a", f"{day}b"]}
+        for day in range(1, 6)
+    ]
+}
+
+
+def feed_all(parser, text, size):
+    completed = []
+    for i in range(0, len(text), size):
+        completed.extend(parser.feed(text[i:i + size]))
+    return completed
+
+
+def test_days_are_emitted_as_they_complete():
+    text = "Here you go:\n```json\n" + json.dumps(PLAN, indent=2) + "\n```"
+    for size in (1, 7, len(text)):
+        parser = StreamingPlanParser()
+        assert feed_all(parser, text, size) == PLAN["curriculum"]
+        assert parser.complete
+        assert parser.partial_plan() == PLAN
+
+
+def test_bare_array_is_the_entry_list():
+    parser = StreamingPlanParser(bare_array_key="schedule")
+    days = feed_all(parser, "[draft] " + json.dumps(PLAN["curriculum"]), 5)
+
+    assert days == PLAN["curriculum"]
+    assert parser.complete
+    assert parser.partial_plan() == {"schedule": PLAN["curriculum"]}
+
+
+def test_truncated_bare_array_keeps_complete_entries():
+    text = json.dumps(PLAN["curriculum"])
+    parser = StreamingPlanParser()
+    parser.feed(text[:text.index('{"day": 3') + 12])
+
+    assert not parser.complete
+    assert parser.partial_plan() == {"curriculum": PLAN["curriculum"][:2]}
+
+
+def test_buffer_holds_only_the_value_being_read():
+    plan = {"overview": "x", "curriculum": [{"day": d, "topic": "t" * 50} for d in range(1, 400)]}
+    text = json.dumps(plan)
+    parser = StreamingPlanParser()
+    longest = 0
+    for i in range(0, len(text), 16):
+        parser.feed(text[i:i + 16])
+        longest = max(longest, len(parser._text))
+
+    assert parser.partial_plan() == plan
+    assert longest < 200
@@ -4,8 +4,27 @@ Handles Claude API integration for generating learning paths and providing assis
 """
 
 import os
-from typing import Dict, List
-import anthropic
+import random
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Tuple
+from .client_pool import get_shared_client
+from .plan_segments import (
+    DAY_LIST_KEYS,
+    MAX_SEGMENT_WORKERS,
+    align_segment_days,
+    find_missing_days,
+    normalize_phases,
+    should_segment,
+    split_day_ranges,
+    stitch_segments
+)
+from .response_cache import get_response_cache, make_cache_key
+from .response_parser import PLAN_SCHEMAS, extract_json, extract_list, extract_plan
+from .stream_json import PLAN_ARRAY_KEYS, StreamingPlanParser
+
+
+# Cached answers kept per prompt for sampled calls that opt in to caching
+SAMPLED_CACHE_VARIANTS = 3
 
 
 class ClaudeAI:
@@ -31,13 +50,71 @@ class ClaudeAI:
         if not self.api_key:
             raise ValueError("Anthropic API key not found. Please set ANTHROPIC_API_KEY in .streamlit/secrets.toml or as environment variable.")
 
-        self.client = anthropic.Anthropic(api_key=self.api_key)
         self.set_model(model_name)
 
+    @property
+    def client(self):
+        """
+        The Anthropic client, created on first API call
+
+        Shared with ClaudeProvider through the client pool so both reuse the
+        same keep-alive connections. The anthropic SDK is only imported here,
+        keeping it off the app's cold-start path.
+        """
+        import anthropic
+        return get_shared_client(("anthropic", self.api_key),
+                                 lambda: anthropic.Anthropic(api_key=self.api_key))
+
     def set_model(self, model_name: str):
         """Set the model to use for API calls"""
         self.model = self.MODELS.get(model_name, self.MODELS["Claude Sonnet 4.5"])
 
+    def _create_cached(self, prompt: str, max_tokens: int, temperature: float,
+                       variants: int = 0) -> Tuple[str, Optional[str]]:
+        """
+        Run a single-prompt messages.create call through the response cache
+
+        Deterministic calls (temperature 0) are always cached. A sampled call
+        is meant to vary, so it is only cached when it opts in with variants:
+        up to that many answers are kept per prompt, and each call picks one
+        of those slots at random, asking the model when the slot is empty.
+        Repeat requests then cost nothing once warm but still rotate between
+        several answers. With variants=0 a sampled call always goes to the
+        model.
+
+        Returns:
+            (response_text, cache_key). cache_key is None when the text came
+            from the cache; otherwise pass it to _store_cached once the
+            response has parsed, so malformed output is never cached.
+        """
+        cache = get_response_cache() if temperature <= 0 or variants > 0 else None
+        cache_key = None
+        if cache is not None:
+            cache_key = make_cache_key(self.model, "", prompt, max_tokens, temperature)
+            if temperature > 0:
+                cache_key = f"{cache_key}:{random.randrange(variants)}"
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached, None
+
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return message.content[0].text, cache_key
+
+    def _store_cached(self, cache_key: Optional[str], response_text: str):
+        """Cache a response returned by _create_cached after it parsed"""
+        if cache_key is None:
+            return
+        cache = get_response_cache()
+        if cache is not None:
+            cache.put(cache_key, response_text, self.model)
+
     def _get_prompt_template(self, goal_type: str, goal: str, timeframe: int, hours_per_day: float = 2.0, user_context: Dict = None) -> (str, str):
         """
         Get the appropriate system and user prompts based on goal type.
@@ -347,6 +424,182 @@ CHECKLIST:
 
         return system_prompt, user_prompt
 
+    def _generate_plan_outline(self, system_prompt: str, user_prompt: str, timeframe: int,
+                               summary_key: str, temperature: float) -> Dict:
+        """First pass of segmented generation: overview, summary list and phases"""
+        outline_prompt = f"""{user_prompt}
+
+STEP 1 OF 2 - OUTLINE ONLY:
+Do not write the day-by-day entries yet; they are generated separately, phase by phase.
+Return ONLY this JSON:
+{{
+    "overview": "As described above",
+    "{summary_key}": ["As described in the schema above"],
+    "sections": [
+        {{"title": "Phase name", "start_day": 1, "end_day": 10, "focus": "What these days cover and what they build towards"}}
+    ]
+}}
+The sections must cover Day 1 through Day {timeframe} in order with no gaps or overlaps."""
+
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=2000,
+            temperature=temperature,
+            system=system_prompt,
+            messages=[{"role": "user", "content": outline_prompt}]
+        )
+        return extract_json(message.content[0].text, expect=dict)
+
+    def _generate_plan_segment(self, system_prompt: str, user_prompt: str, outline: Dict,
+                               phase: Dict, start_day: int, end_day: int,
+                               list_key: str, temperature: float) -> List[Dict]:
+        """Second pass of segmented generation: the entries for one day range"""
+        sections = "\n".join(
+            f"- Days {p['start_day']}-{p['end_day']}: {p.get('title', '')} - {p.get('focus', '')}"
+            for p in outline['sections']
+        )
+        segment_prompt = f"""{user_prompt}
+
+STEP 2 - DAYS {start_day}-{end_day} ONLY:
+Overall plan: {outline.get('overview', '')}
+Phases:
+{sections}
+
+Write ONLY the "{list_key}" entries for Day {start_day} through Day {end_day} ({end_day - start_day + 1} entries),
+part of the "{phase.get('title', '')}" phase. Use absolute day numbers ({start_day}, {start_day + 1}, ...).
+The other days are generated separately, so ignore the instruction to produce the whole plan here.
+Return ONLY this JSON: {{"{list_key}": [ ...entries in the schema above... ]}}"""
+
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=4096,
+            temperature=temperature,
+            system=system_prompt,
+            messages=[{"role": "user", "content": segment_prompt}]
+        )
+        items = extract_list(message.content[0].text)
+        return align_segment_days(items, start_day, end_day)
+
+    def _iter_plan_segments(self, system_prompt: str, user_prompt: str, timeframe: int,
+                            list_key: str, summary_key: str, temperature: float) -> Iterator[Tuple[str, object]]:
+        """
+        Generate a long plan without hitting the per-response token limit
+
+        An outline request fixes the overview and phases, then each phase is
+        generated in day ranges concurrently. Any missing days are requested
+        once more before giving up.
+
+        Yields:
+            ("days", items) for each day range as soon as it completes (not
+            necessarily in day order), then ("plan", plan) with the stitched
+            plan, shaped like a single-request plan (overview, summary_key,
+            list_key)
+        """
+        outline = self._generate_plan_outline(system_prompt, user_prompt, timeframe, summary_key, temperature)
+        phases = normalize_phases(outline.get('sections'), timeframe)
+        outline['sections'] = phases
+
+        def run(segment):
+            phase, start_day, end_day = segment
+            try:
+                return self._generate_plan_segment(system_prompt, user_prompt, outline, phase,
+                                                   start_day, end_day, list_key, temperature)
+            except Exception as e:
+                print(f"Error generating days {start_day}-{end_day}: {str(e)}")
+                return []
+
+        segment_items = []
+        segments = split_day_ranges(phases)
+        for attempt in range(2):
+            with ThreadPoolExecutor(max_workers=max(1, MAX_SEGMENT_WORKERS)) as executor:
+                futures = [executor.submit(run, segment) for segment in segments]
+                for future in as_completed(futures):
+                    items = future.result()
+                    if items:
+                        segment_items.append(items)
+                        yield "days", items
+
+            items = stitch_segments(segment_items)
+            gaps = find_missing_days(items, timeframe)
+            if not gaps:
+                break
+
+            # Retry just the missing ranges once
+            segments = []
+            for gap_start, gap_end in gaps:
+                phase = next(p for p in phases if p['start_day'] <= gap_start <= p['end_day'])
+                segments.extend(split_day_ranges([{**phase, 'start_day': gap_start, 'end_day': gap_end}]))
+        else:
+            missing = ", ".join(f"{a}-{b}" if a != b else str(a) for a, b in gaps)
+            raise ValueError(f"Generated plan is missing day(s) {missing}")
+
+        yield "plan", {
+            'overview': outline.get('overview', ''),
+            summary_key: outline.get(summary_key, []),
+            list_key: items
+        }
+
+    def _generate_plan_in_segments(self, system_prompt: str, user_prompt: str, timeframe: int,
+                                   list_key: str, summary_key: str, temperature: float) -> Dict:
+        """Run _iter_plan_segments to completion and return the stitched plan"""
+        for kind, payload in self._iter_plan_segments(system_prompt, user_prompt, timeframe,
+                                                      list_key, summary_key, temperature):
+            if kind == "plan":
+                return payload
+
+    def _iter_plan_stream(self, system_prompt: str, user_prompt: str, max_tokens: int,
+                          temperature: float, list_key: str = "curriculum") -> Iterator[Tuple[str, object]]:
+        """
+        Stream a single-request plan, emitting day objects as they complete
+
+        A bare array of entries is stored under list_key.
+
+        Yields:
+            ("days", [item]) for each completed day object, then ("plan", plan).
+            If the response is cut off (e.g. at max_tokens) the plan holds
+            every field and day that finished.
+        """
+        parser = StreamingPlanParser(bare_array_key=list_key)
+        with self.client.messages.stream(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            system=system_prompt,
+            messages=[{"role": "user", "content": user_prompt}]
+        ) as stream:
+            for text in stream.text_stream:
+                for item in parser.feed(text):
+                    yield "days", [item]
+
+        plan = parser.partial_plan()
+        if not any(plan.get(key) for key in PLAN_ARRAY_KEYS):
+            raise ValueError("No complete plan entries in the response")
+        if not parser.complete:
+            plan['truncated'] = True
+        yield "plan", plan
+
+    def stream_learning_path(self, goal: str, timeframe: int, goal_type: str = 'learning',
+                             hours_per_day: float = 2.0, user_context: Dict = None) -> Iterator[Tuple[str, object]]:
+        """
+        Generate a goal plan, emitting day entries while it is being written
+
+        Same prompts as generate_learning_path. Long plans are generated in
+        concurrent segments, so their day batches can arrive out of order.
+
+        Yields:
+            ("days", items) batches as they complete, then ("plan", plan)
+        """
+        system_prompt, user_prompt = self._get_prompt_template(goal_type, goal, timeframe, hours_per_day, user_context)
+
+        if should_segment(goal_type, timeframe):
+            list_key, summary_key = DAY_LIST_KEYS[goal_type]
+            yield from self._iter_plan_segments(system_prompt, user_prompt, timeframe,
+                                                list_key, summary_key, temperature=0.6)
+        else:
+            list_key = PLAN_SCHEMAS.get(goal_type, PLAN_SCHEMAS['learning'])[1]
+            yield from self._iter_plan_stream(system_prompt, user_prompt, max_tokens=4096,
+                                              temperature=0.6, list_key=list_key)
+
     def generate_learning_path(self, goal: str, timeframe: int, goal_type: str = 'learning', hours_per_day: float = 2.0, user_context: Dict = None) -> Dict:
         """
         Generate a goal plan based on goal type and timeframe
@@ -364,6 +617,12 @@ CHECKLIST:
         system_prompt, user_prompt = self._get_prompt_template(goal_type, goal, timeframe, hours_per_day, user_context)
 
         try:
+            # Long day-by-day plans don't fit in one response; build them in segments
+            if should_segment(goal_type, timeframe):
+                list_key, summary_key = DAY_LIST_KEYS[goal_type]
+                return self._generate_plan_in_segments(system_prompt, user_prompt, timeframe,
+                                                       list_key, summary_key, temperature=0.6)
+
             message = self.client.messages.create(
                 model=self.model,
                 max_tokens=4096,  # Increased max_tokens for longer plans
@@ -377,24 +636,8 @@ CHECKLIST:
             # Extract the text content from the response
             response_text = message.content[0].text
 
-            # Parse JSON from the response
-            import json
-
-            # Try to extract JSON from the response
-            # Claude sometimes wraps JSON in markdown code blocks
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.rfind("```")
-                json_text = response_text[json_start:json_end].strip()
-            elif response_text.startswith("{") and response_text.endswith("}"):
-                json_text = response_text
-            else:
-                # Fallback for cases where JSON is not perfectly formatted
-                json_start = response_text.find("{")
-                json_end = response_text.rfind("}") + 1
-                json_text = response_text[json_start:json_end]
-
-            learning_path = json.loads(json_text)
+            # Parse JSON from the response (fences, stray prose and truncation are handled)
+            learning_path = extract_plan(response_text, goal_type)
             return learning_path
 
         except Exception as e:
@@ -403,13 +646,16 @@ CHECKLIST:
             print(f"LLM Response Text: {response_text if 'response_text' in locals() else 'No response text available'}")
             raise Exception(f"Error generating learning path. Please check the logs for details.")
 
-    def get_learning_assistance(self, question: str, context: str = "") -> str:
+    def get_learning_assistance(self, question: str, context: str = "", model_name: str = None) -> str:
         """
         Get AI assistance for learning questions
 
         Args:
             question: The user's question
             context: Optional context about what they're currently learning
+            model_name: Claude model for this call only (default: the client's
+                model). The client is shared across sessions, so callers pick
+                a model per call instead of using set_model.
 
         Returns:
             AI-generated response
@@ -422,9 +668,10 @@ User Question: {question}
 
 Provide a clear, concise explanation that helps the user understand the concept. Use examples where helpful."""
 
+        model = self.MODELS.get(model_name, self.model) if model_name else self.model
         try:
             message = self.client.messages.create(
-                model=self.model,
+                model=model,
                 max_tokens=2000,
                 temperature=0.7,
                 messages=[
@@ -463,31 +710,11 @@ Format your response as JSON:
 Make the problems practical and help reinforce understanding of the topic."""
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                temperature=0.8,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            response_text, cache_key = self._create_cached(prompt, max_tokens=2000, temperature=0.8,
+                                                           variants=SAMPLED_CACHE_VARIANTS)
 
-            response_text = message.content[0].text
-
-            # Extract JSON
-            import json
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                json_text = response_text
-
-            problems = json.loads(json_text)
+            problems = extract_list(response_text)
+            self._store_cached(cache_key, response_text)
             return problems
 
         except Exception as e:
@@ -528,31 +755,11 @@ Format as JSON:
 Provide 5-8 high-quality, reputable resources."""
 
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2000,
-                temperature=0.5,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
+            response_text, cache_key = self._create_cached(prompt, max_tokens=2000, temperature=0.5,
+                                                           variants=SAMPLED_CACHE_VARIANTS)
 
-            response_text = message.content[0].text
-
-            # Extract JSON
-            import json
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                json_text = response_text
-
-            resources = json.loads(json_text)
+            resources = extract_list(response_text)
+            self._store_cached(cache_key, response_text)
             return resources
 
         except Exception as e:
@@ -560,6 +767,27 @@ Provide 5-8 high-quality, reputable resources."""
 
     def get_ai_suggestions_for_focus_areas(self, template: Dict, proficiency: str) -> List[str]:
         """Get AI-suggested focus areas based on the template and user's proficiency."""
+        try:
+            return self.request_focus_area_suggestions(template, proficiency)
+        except Exception as e:
+            # Fallback: generate basic suggestions from description or return empty list
+            if template.get('subdivisions') and len(template['subdivisions']) > 0:
+                return template['subdivisions']
+            # If no subdivisions, create basic suggestions from description
+            description = template.get('description', '')
+            if description:
+                # Split description by commas and take first few items
+                parts = [p.strip() for p in description.split(',')[:5]]
+                return parts if parts else ["Focus area 1", "Focus area 2", "Focus area 3"]
+            return ["Focus area 1", "Focus area 2", "Focus area 3"]
+
+    def request_focus_area_suggestions(self, template: Dict, proficiency: str) -> List[str]:
+        """
+        Ask the model for focus areas, without the offline fallback
+
+        Raises:
+            Exception: If the API call fails or the response isn't a JSON array
+        """
         # Build template context from available fields
         subdivisions_text = ""
         if template.get('subdivisions') and len(template['subdivisions']) > 0:
@@ -603,45 +831,12 @@ Return a simple JSON array of strings (5-7 focus areas).
 ]
 ```"""
 
-        try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                temperature=0.6,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-
-            response_text = message.content[0].text
+        response_text, cache_key = self._create_cached(prompt, max_tokens=1000, temperature=0.6,
+                                                       variants=SAMPLED_CACHE_VARIANTS)
 
-            # Extract JSON
-            import json
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                json_text = response_text
-
-            suggestions = json.loads(json_text)
-            return suggestions
-
-        except Exception as e:
-            # Fallback: generate basic suggestions from description or return empty list
-            if template.get('subdivisions') and len(template['subdivisions']) > 0:
-                return template['subdivisions']
-            # If no subdivisions, create basic suggestions from description
-            description = template.get('description', '')
-            if description:
-                # Split description by commas and take first few items
-                parts = [p.strip() for p in description.split(',')[:5]]
-                return parts if parts else ["Focus area 1", "Focus area 2", "Focus area 3"]
-            return ["Focus area 1", "Focus area 2", "Focus area 3"]
+        suggestions = extract_list(response_text)
+        self._store_cached(cache_key, response_text)
+        return suggestions
 
     def generate_plan_from_template(self, template: Dict, proficiency: str, timeframe: int, hours_per_day: float, focus_areas: List[str], other_requests: str) -> Dict:
         """Generate a personalized learning plan from a template and user inputs."""
@@ -825,6 +1020,11 @@ QUALITY CHECKLIST (verify before submitting):
 Generate the complete {timeframe}-day personalized curriculum now."""
 
         try:
+            # Long plans don't fit in one response; build them in segments
+            if should_segment('learning', timeframe):
+                return self._generate_plan_in_segments(system_prompt, user_prompt, timeframe,
+                                                       'curriculum', 'milestones', temperature=0.7)
+
             message = self.client.messages.create(
                 model=self.model,
                 max_tokens=4000,
@@ -833,19 +1033,7 @@ Generate the complete {timeframe}-day personalized curriculum now."""
                 messages=[{"role": "user", "content": user_prompt}]
             )
             response_text = message.content[0].text
-            import json
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            elif "```" in response_text:
-                json_start = response_text.find("```") + 3
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                json_text = response_text.strip()
-            
-            return json.loads(json_text)
+            return extract_plan(response_text, 'learning')
         except Exception as e:
             raise Exception(f"Error generating personalized plan from template: {str(e)}")
 
@@ -868,23 +1056,10 @@ Output in this JSON format:
 }}
 """
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                temperature=0.8,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            response_text = message.content[0].text
-            import json
-            if "```json" in response_text:
-                json_start = response_text.find("```json") + 7
-                json_end = response_text.find("```", json_start)
-                json_text = response_text[json_start:json_end].strip()
-            else:
-                json_text = response_text
-            
-            return json.loads(json_text)
+            response_text, cache_key = self._create_cached(prompt, max_tokens=1000, temperature=0.8,
+                                                           variants=SAMPLED_CACHE_VARIANTS)
+            goal = extract_json(response_text, expect=dict)
+            self._store_cached(cache_key, response_text)
+            return goal
         except Exception as e:
             raise Exception(f"Error generating personalized goal: {str(e)}")
@@ -5,18 +5,76 @@ Implements silent failure for missing API keys
 """
 
 import os
-from typing import Dict, List, Optional, Any
+import asyncio
+import queue
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Any, Iterator, AsyncIterator, Tuple, Union
 from abc import ABC, abstractmethod
 import json
+from .client_pool import discard_shared_client, get_shared_client
+
+
+class TextChunk:
+    """A piece of streamed model output, shared by all providers"""
+
+    __slots__ = ("text", "provider", "model", "is_final", "finish_reason")
+
+    def __init__(self, text: str, provider: str, model: str,
+                 is_final: bool = False, finish_reason: Optional[str] = None):
+        self.text = text
+        self.provider = provider
+        self.model = model
+        self.is_final = is_final
+        self.finish_reason = finish_reason
+
+    def __repr__(self):
+        return f"TextChunk({self.text!r}, provider={self.provider!r}, is_final={self.is_final})"
+
+
+class FanOutResult:
+    """Outcome of one model's answer in AIProviderManager.fan_out"""
+
+    __slots__ = ("provider", "model", "text", "error", "latency")
+
+    def __init__(self, provider: str, model: str, text: Optional[str] = None,
+                 error: Optional[str] = None, latency: float = 0.0):
+        self.provider = provider
+        self.model = model
+        self.text = text
+        self.error = error
+        self.latency = latency
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        status = "ok" if self.ok else f"error={self.error!r}"
+        return f"FanOutResult({self.provider} / {self.model}, {status}, {self.latency:.2f}s)"
 
 
 class AIProvider(ABC):
     """Base class for all AI providers"""
 
+    PROVIDER_NAME = ""
+    ENV_KEY = ""
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
         self.is_configured = self.check_configuration()
 
+    @classmethod
+    def detect_api_key(cls) -> Optional[str]:
+        """Look up the provider's API key without building the provider or importing its SDK"""
+        return os.getenv(cls.ENV_KEY) if cls.ENV_KEY else None
+
+    @staticmethod
+    def is_valid_key(api_key: Optional[str]) -> bool:
+        """Check that an API key is set and isn't the .env.example placeholder"""
+        return bool(api_key and api_key != "your_api_key_here")
+
     @abstractmethod
     def check_configuration(self) -> bool:
         """Check if the provider is properly configured"""
@@ -27,6 +85,56 @@ class AIProvider(ABC):
         """Generate text response"""
         pass
 
+    def stream_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> Iterator[TextChunk]:
+        """
+        Stream a text response as TextChunks
+
+        Providers override this with real token streaming; the default yields
+        the full blocking response as a single final chunk.
+        """
+        text = self.generate_text(prompt, system_prompt, max_tokens)
+        yield TextChunk(text, self.PROVIDER_NAME, getattr(self, "model_name", ""), is_final=True)
+
+    async def agenerate_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> str:
+        """
+        Async counterpart of generate_text
+
+        Providers with an async SDK override this; the default runs the
+        blocking call in a worker thread so it doesn't block the event loop.
+        """
+        return await asyncio.to_thread(self.generate_text, prompt, system_prompt, max_tokens)
+
+    async def astream_text(self, prompt: str, system_prompt: str = "",
+                           max_tokens: int = 2000) -> AsyncIterator[TextChunk]:
+        """
+        Async counterpart of stream_text
+
+        The default drives the blocking stream_text in a worker thread and
+        hands chunks to the event loop as they arrive.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+        done = object()
+
+        def produce():
+            try:
+                for chunk in self.stream_text(prompt, system_prompt, max_tokens):
+                    loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(chunks.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(chunks.put_nowait, done)
+
+        producer = loop.run_in_executor(None, produce)
+        while True:
+            item = await chunks.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+        await producer
+
     @abstractmethod
     def analyze_image(self, image_data: bytes, prompt: str) -> str:
         """Analyze an image (if supported)"""
@@ -37,9 +145,105 @@ class AIProvider(ABC):
         return False
 
 
+def _stream_openai_chunks(stream, provider: str, model: str) -> Iterator[TextChunk]:
+    """Convert an OpenAI-style chat completion stream (delta chunks) into TextChunks"""
+    finish_reason = None
+    for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        text = choice.delta.content if choice.delta else None
+        if text:
+            yield TextChunk(text, provider, model)
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+
+    yield TextChunk("", provider, model, is_final=True, finish_reason=finish_reason)
+
+
+async def _astream_openai_chunks(stream, provider: str, model: str) -> AsyncIterator[TextChunk]:
+    """Async version of _stream_openai_chunks for AsyncOpenAI streams"""
+    finish_reason = None
+    async for chunk in stream:
+        if not chunk.choices:
+            continue
+        choice = chunk.choices[0]
+        text = choice.delta.content if choice.delta else None
+        if text:
+            yield TextChunk(text, provider, model)
+        if choice.finish_reason:
+            finish_reason = choice.finish_reason
+
+    yield TextChunk("", provider, model, is_final=True, finish_reason=finish_reason)
+
+
+# Event loops with pooled async clients: id(loop) -> (weakref to loop, pool keys)
+_async_client_loops = {}
+_async_client_loops_lock = threading.Lock()
+
+
+def _forget_loop(loop_id: int, loop_ref: weakref.ref):
+    """Drop the pooled async clients of a finished event loop"""
+    with _async_client_loops_lock:
+        tracked = _async_client_loops.get(loop_id)
+        if tracked is None or tracked[0] is not loop_ref:
+            return  # Already forgotten, or the id now belongs to a newer loop
+        del _async_client_loops[loop_id]
+    for key in tracked[1]:
+        discard_shared_client(key)
+
+
+def _close_async_client(client: Any, loop_ref: weakref.ref):
+    """Pool eviction callback: close an async client on the loop that owns it"""
+    loop = loop_ref()
+    close = getattr(client, "aclose", None) or getattr(client, "close", None)
+    if loop is None or close is None or loop.is_closed() or not loop.is_running():
+        return  # Nothing can await the close; the client goes with its loop
+
+    async def run_close():
+        await close()
+
+    asyncio.run_coroutine_threadsafe(run_close(), loop)
+
+
+def _get_async_client(key: Tuple, factory) -> Any:
+    """
+    Get a pooled async SDK client for the running event loop
+
+    Async HTTP clients are bound to the loop they were created on, so the
+    loop's id is part of the pool key. Only a weak reference to the loop is
+    kept: once it is closed or garbage collected its clients are dropped
+    from the pool, and clients evicted while their loop still runs are
+    closed on it.
+    """
+    loop = asyncio.get_running_loop()
+    loop_id = id(loop)
+    pool_key = key + (loop_id,)
+
+    with _async_client_loops_lock:
+        stale = [(other_id, ref) for other_id, (ref, _keys) in _async_client_loops.items()
+                 if other_id != loop_id and (ref() is None or ref().is_closed())]
+        tracked = _async_client_loops.get(loop_id)
+        if tracked is None or tracked[0]() is not loop:
+            loop_ref = weakref.ref(loop)
+            tracked = _async_client_loops[loop_id] = (loop_ref, set())
+            weakref.finalize(loop, _forget_loop, loop_id, loop_ref)
+        tracked[1].add(pool_key)
+        loop_ref = tracked[0]
+
+    for other_id, ref in stale:
+        _forget_loop(other_id, ref)
+
+    return get_shared_client(pool_key, factory,
+                             on_evict=lambda client: _close_async_client(client, loop_ref))
+
+
 class ClaudeProvider(AIProvider):
     """Anthropic Claude provider"""
 
+    PROVIDER_NAME = "Claude"
+    ENV_KEY = "ANTHROPIC_API_KEY"
+
     MODELS = {
         "Claude Sonnet 4.5": "claude-sonnet-4-5-20250929",
         "Claude Sonnet 3.5": "claude-3-5-sonnet-20241022",
@@ -49,13 +253,15 @@ class ClaudeProvider(AIProvider):
     def __init__(self, api_key: Optional[str] = None, model_name: str = "Claude Sonnet 4.5"):
         self.model_name = model_name
         # Try to get API key from: 1) parameter, 2) streamlit secrets, 3) environment variable
-        if not api_key:
-            try:
-                import streamlit as st
-                api_key = st.secrets.get("ANTHROPIC_API_KEY")
-            except:
-                api_key = os.getenv("ANTHROPIC_API_KEY")
-        super().__init__(api_key)
+        super().__init__(api_key or self.detect_api_key())
+
+    @classmethod
+    def detect_api_key(cls) -> Optional[str]:
+        try:
+            import streamlit as st
+            return st.secrets.get(cls.ENV_KEY)
+        except:
+            return os.getenv(cls.ENV_KEY)
 
     def check_configuration(self) -> bool:
         return bool(self.api_key and self.api_key != "your_api_key_here")
@@ -65,7 +271,8 @@ class ClaudeProvider(AIProvider):
             raise ValueError("Claude API key not configured")
 
         import anthropic
-        client = anthropic.Anthropic(api_key=self.api_key)
+        client = get_shared_client(("anthropic", self.api_key),
+                                   lambda: anthropic.Anthropic(api_key=self.api_key))
         model = self.MODELS.get(self.model_name, self.MODELS["Claude Sonnet 4.5"])
 
         messages = [{"role": "user", "content": prompt}]
@@ -86,6 +293,62 @@ class ClaudeProvider(AIProvider):
 
         return response.content[0].text
 
+    def _message_kwargs(self, prompt: str, system_prompt: str, max_tokens: int) -> Dict:
+        """Build messages.create/stream arguments"""
+        kwargs = {
+            "model": self.MODELS.get(self.model_name, self.MODELS["Claude Sonnet 4.5"]),
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}]
+        }
+        if system_prompt:
+            kwargs["system"] = system_prompt
+        return kwargs
+
+    def _get_async_client(self):
+        import anthropic
+        return _get_async_client(("anthropic-async", self.api_key),
+                                 lambda: anthropic.AsyncAnthropic(api_key=self.api_key))
+
+    async def agenerate_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> str:
+        if not self.is_configured:
+            raise ValueError("Claude API key not configured")
+
+        client = self._get_async_client()
+        response = await client.messages.create(**self._message_kwargs(prompt, system_prompt, max_tokens))
+        return response.content[0].text
+
+    async def astream_text(self, prompt: str, system_prompt: str = "",
+                           max_tokens: int = 2000) -> AsyncIterator[TextChunk]:
+        if not self.is_configured:
+            raise ValueError("Claude API key not configured")
+
+        client = self._get_async_client()
+        async with client.messages.stream(**self._message_kwargs(prompt, system_prompt, max_tokens)) as stream:
+            async for text in stream.text_stream:
+                if text:
+                    yield TextChunk(text, self.PROVIDER_NAME, self.model_name)
+            final_message = await stream.get_final_message()
+
+        yield TextChunk("", self.PROVIDER_NAME, self.model_name, is_final=True,
+                        finish_reason=final_message.stop_reason)
+
+    def stream_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> Iterator[TextChunk]:
+        if not self.is_configured:
+            raise ValueError("Claude API key not configured")
+
+        import anthropic
+        client = get_shared_client(("anthropic", self.api_key),
+                                   lambda: anthropic.Anthropic(api_key=self.api_key))
+
+        with client.messages.stream(**self._message_kwargs(prompt, system_prompt, max_tokens)) as stream:
+            for text in stream.text_stream:
+                if text:
+                    yield TextChunk(text, self.PROVIDER_NAME, self.model_name)
+            final_message = stream.get_final_message()
+
+        yield TextChunk("", self.PROVIDER_NAME, self.model_name, is_final=True,
+                        finish_reason=final_message.stop_reason)
+
     def analyze_image(self, image_data: bytes, prompt: str) -> str:
         if not self.is_configured:
             raise ValueError("Claude API key not configured")
@@ -93,7 +356,8 @@ class ClaudeProvider(AIProvider):
         import anthropic
         import base64
 
-        client = anthropic.Anthropic(api_key=self.api_key)
+        client = get_shared_client(("anthropic", self.api_key),
+                                   lambda: anthropic.Anthropic(api_key=self.api_key))
         model = self.MODELS.get(self.model_name, self.MODELS["Claude Sonnet 4.5"])
 
         # Encode image to base64
@@ -135,6 +399,9 @@ class ClaudeProvider(AIProvider):
 class OpenAIProvider(AIProvider):
     """OpenAI provider"""
 
+    PROVIDER_NAME = "OpenAI"
+    ENV_KEY = "OPENAI_API_KEY"
+
     MODELS = {
         "GPT-4": "gpt-4",
         "GPT-4 Turbo": "gpt-4-turbo-preview",
@@ -144,7 +411,7 @@ class OpenAIProvider(AIProvider):
 
     def __init__(self, api_key: Optional[str] = None, model_name: str = "GPT-4 Turbo"):
         self.model_name = model_name
-        super().__init__(api_key or os.getenv("OPENAI_API_KEY"))
+        super().__init__(api_key or self.detect_api_key())
 
     def check_configuration(self) -> bool:
         return bool(self.api_key and self.api_key != "your_api_key_here")
@@ -158,7 +425,8 @@ class OpenAIProvider(AIProvider):
         except ImportError:
             raise ImportError("OpenAI package not installed. Run: pip install openai")
 
-        client = OpenAI(api_key=self.api_key)
+        client = get_shared_client(("openai", self.api_key),
+                                   lambda: OpenAI(api_key=self.api_key))
         model = self.MODELS.get(self.model_name, self.MODELS["GPT-4 Turbo"])
 
         messages = []
@@ -174,6 +442,75 @@ class OpenAIProvider(AIProvider):
 
         return response.choices[0].message.content
 
+    def stream_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> Iterator[TextChunk]:
+        if not self.is_configured:
+            raise ValueError("OpenAI API key not configured")
+
+        try:
+            from openai import OpenAI
+        except ImportError:
+            raise ImportError("OpenAI package not installed. Run: pip install openai")
+
+        client = get_shared_client(("openai", self.api_key),
+                                   lambda: OpenAI(api_key=self.api_key))
+        model = self.MODELS.get(self.model_name, self.MODELS["GPT-4 Turbo"])
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        stream = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            max_tokens=max_tokens,
+            stream=True
+        )
+
+        yield from _stream_openai_chunks(stream, self.PROVIDER_NAME, self.model_name)
+
+    def _get_async_client(self):
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
+            raise ImportError("OpenAI package not installed. Run: pip install openai")
+
+        return _get_async_client(("openai-async", self.api_key),
+                                 lambda: AsyncOpenAI(api_key=self.api_key))
+
+    def _chat_kwargs(self, prompt: str, system_prompt: str, max_tokens: int) -> Dict:
+        """Build chat.completions.create arguments"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        return {
+            "model": self.MODELS.get(self.model_name, self.MODELS["GPT-4 Turbo"]),
+            "messages": messages,
+            "max_tokens": max_tokens
+        }
+
+    async def agenerate_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> str:
+        if not self.is_configured:
+            raise ValueError("OpenAI API key not configured")
+
+        client = self._get_async_client()
+        response = await client.chat.completions.create(**self._chat_kwargs(prompt, system_prompt, max_tokens))
+        return response.choices[0].message.content
+
+    async def astream_text(self, prompt: str, system_prompt: str = "",
+                           max_tokens: int = 2000) -> AsyncIterator[TextChunk]:
+        if not self.is_configured:
+            raise ValueError("OpenAI API key not configured")
+
+        client = self._get_async_client()
+        stream = await client.chat.completions.create(
+            stream=True, **self._chat_kwargs(prompt, system_prompt, max_tokens)
+        )
+        async for chunk in _astream_openai_chunks(stream, self.PROVIDER_NAME, self.model_name):
+            yield chunk
+
     def analyze_image(self, image_data: bytes, prompt: str) -> str:
         if not self.is_configured:
             raise ValueError("OpenAI API key not configured")
@@ -184,7 +521,8 @@ class OpenAIProvider(AIProvider):
         except ImportError:
             raise ImportError("OpenAI package not installed. Run: pip install openai")
 
-        client = OpenAI(api_key=self.api_key)
+        client = get_shared_client(("openai", self.api_key),
+                                   lambda: OpenAI(api_key=self.api_key))
 
         # Encode image to base64
         image_base64 = base64.b64encode(image_data).decode('utf-8')
@@ -208,9 +546,22 @@ class OpenAIProvider(AIProvider):
         return True
 
 
+def _gemini_block_reason(chunk) -> str:
+    """Why a Gemini response chunk has no text (prompt block or finish reason)"""
+    reason = getattr(getattr(chunk, "prompt_feedback", None), "block_reason", None)
+    if not reason:
+        candidates = getattr(chunk, "candidates", None) or []
+        reason = getattr(candidates[0], "finish_reason", None) if candidates else None
+    reason = getattr(reason, "name", reason)
+    return str(reason) if reason else "blocked"
+
+
 class GeminiProvider(AIProvider):
     """Google Gemini provider"""
 
+    PROVIDER_NAME = "Google Gemini"
+    ENV_KEY = "GOOGLE_API_KEY"
+
     MODELS = {
         "Gemini 2.5 Pro": "gemini-2.5-pro",
         "Gemini 2.5 Flash": "gemini-2.5-flash",
@@ -220,11 +571,21 @@ class GeminiProvider(AIProvider):
 
     def __init__(self, api_key: Optional[str] = None, model_name: str = "Gemini 2.5 Flash"):
         self.model_name = model_name
-        super().__init__(api_key or os.getenv("GOOGLE_API_KEY"))
+        super().__init__(api_key or self.detect_api_key())
 
     def check_configuration(self) -> bool:
         return bool(self.api_key and self.api_key != "your_api_key_here")
 
+    def _get_model(self, genai):
+        """Get the pooled GenerativeModel (configure() only runs when it is first built)"""
+        model_id = self.MODELS.get(self.model_name, self.MODELS["Gemini 2.5 Flash"])
+
+        def build():
+            genai.configure(api_key=self.api_key)
+            return genai.GenerativeModel(model_id)
+
+        return get_shared_client(("gemini", self.api_key, model_id), build)
+
     def generate_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> str:
         if not self.is_configured:
             raise ValueError("Google API key not configured")
@@ -234,14 +595,46 @@ class GeminiProvider(AIProvider):
         except ImportError:
             raise ImportError("Google Generative AI package not installed. Run: pip install google-generativeai")
 
-        genai.configure(api_key=self.api_key)
-        model = genai.GenerativeModel(self.MODELS.get(self.model_name, self.MODELS["Gemini 2.5 Flash"]))
+        model = self._get_model(genai)
 
         full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
         response = model.generate_content(full_prompt)
 
         return response.text
 
+    def stream_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> Iterator[TextChunk]:
+        if not self.is_configured:
+            raise ValueError("Google API key not configured")
+
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            raise ImportError("Google Generative AI package not installed. Run: pip install google-generativeai")
+
+        model = self._get_model(genai)
+
+        full_prompt = f"{system_prompt}\n\n{prompt}" if system_prompt else prompt
+        response = model.generate_content(full_prompt, stream=True)
+
+        started = False
+        finish_reason = None
+        for chunk in response:
+            try:
+                text = chunk.text
+            except ValueError:
+                # chunk.text raises for blocked or empty candidates, as
+                # response.text does in generate_text; skip the chunk
+                finish_reason = _gemini_block_reason(chunk)
+                continue
+            if text:
+                started = True
+                yield TextChunk(text, self.PROVIDER_NAME, self.model_name)
+
+        if not started and finish_reason:
+            raise ValueError(f"Gemini response was blocked ({finish_reason})")
+        yield TextChunk("", self.PROVIDER_NAME, self.model_name, is_final=True,
+                        finish_reason=finish_reason)
+
     def analyze_image(self, image_data: bytes, prompt: str) -> str:
         if not self.is_configured:
             raise ValueError("Google API key not configured")
@@ -253,9 +646,8 @@ class GeminiProvider(AIProvider):
         except ImportError:
             raise ImportError("Required packages not installed. Run: pip install google-generativeai pillow")
 
-        genai.configure(api_key=self.api_key)
         # Gemini 2.5 models support vision natively
-        model = genai.GenerativeModel(self.MODELS.get(self.model_name, self.MODELS["Gemini 2.5 Flash"]))
+        model = self._get_model(genai)
 
         # Convert bytes to PIL Image
         image = Image.open(io.BytesIO(image_data))
@@ -270,6 +662,9 @@ class GeminiProvider(AIProvider):
 class DeepSeekProvider(AIProvider):
     """DeepSeek provider with OCR support"""
 
+    PROVIDER_NAME = "DeepSeek"
+    ENV_KEY = "DEEPSEEK_API_KEY"
+
     MODELS = {
         "DeepSeek Chat": "deepseek-chat",
         "DeepSeek Coder": "deepseek-coder"
@@ -277,7 +672,7 @@ class DeepSeekProvider(AIProvider):
 
     def __init__(self, api_key: Optional[str] = None, model_name: str = "DeepSeek Chat"):
         self.model_name = model_name
-        super().__init__(api_key or os.getenv("DEEPSEEK_API_KEY"))
+        super().__init__(api_key or self.detect_api_key())
 
     def check_configuration(self) -> bool:
         return bool(self.api_key and self.api_key != "your_api_key_here")
@@ -292,9 +687,9 @@ class DeepSeekProvider(AIProvider):
             raise ImportError("OpenAI package not installed. Run: pip install openai")
 
         # DeepSeek uses OpenAI-compatible API
-        client = OpenAI(
-            api_key=self.api_key,
-            base_url="https://api.deepseek.com"
+        client = get_shared_client(
+            ("deepseek", self.api_key),
+            lambda: OpenAI(api_key=self.api_key, base_url="https://api.deepseek.com")
         )
 
         messages = []
@@ -310,6 +705,79 @@ class DeepSeekProvider(AIProvider):
 
         return response.choices[0].message.content
 
+    def stream_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> Iterator[TextChunk]:
+        if not self.is_configured:
+            raise ValueError("DeepSeek API key not configured")
+
+        try:
+            from openai import OpenAI
+        except ImportError:
+            raise ImportError("OpenAI package not installed. Run: pip install openai")
+
+        # DeepSeek uses OpenAI-compatible API
+        client = get_shared_client(
+            ("deepseek", self.api_key),
+            lambda: OpenAI(api_key=self.api_key, base_url="https://api.deepseek.com")
+        )
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        stream = client.chat.completions.create(
+            model=self.MODELS.get(self.model_name, self.MODELS["DeepSeek Chat"]),
+            messages=messages,
+            max_tokens=max_tokens,
+            stream=True
+        )
+
+        yield from _stream_openai_chunks(stream, self.PROVIDER_NAME, self.model_name)
+
+    def _get_async_client(self):
+        try:
+            from openai import AsyncOpenAI
+        except ImportError:
+            raise ImportError("OpenAI package not installed. Run: pip install openai")
+
+        return _get_async_client(
+            ("deepseek-async", self.api_key),
+            lambda: AsyncOpenAI(api_key=self.api_key, base_url="https://api.deepseek.com")
+        )
+
+    def _chat_kwargs(self, prompt: str, system_prompt: str, max_tokens: int) -> Dict:
+        """Build chat.completions.create arguments"""
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        return {
+            "model": self.MODELS.get(self.model_name, self.MODELS["DeepSeek Chat"]),
+            "messages": messages,
+            "max_tokens": max_tokens
+        }
+
+    async def agenerate_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> str:
+        if not self.is_configured:
+            raise ValueError("DeepSeek API key not configured")
+
+        client = self._get_async_client()
+        response = await client.chat.completions.create(**self._chat_kwargs(prompt, system_prompt, max_tokens))
+        return response.choices[0].message.content
+
+    async def astream_text(self, prompt: str, system_prompt: str = "",
+                           max_tokens: int = 2000) -> AsyncIterator[TextChunk]:
+        if not self.is_configured:
+            raise ValueError("DeepSeek API key not configured")
+
+        client = self._get_async_client()
+        stream = await client.chat.completions.create(
+            stream=True, **self._chat_kwargs(prompt, system_prompt, max_tokens)
+        )
+        async for chunk in _astream_openai_chunks(stream, self.PROVIDER_NAME, self.model_name):
+            yield chunk
+
     def analyze_image(self, image_data: bytes, prompt: str) -> str:
         """Use OCR capabilities for image analysis"""
         if not self.is_configured:
@@ -338,6 +806,9 @@ class DeepSeekProvider(AIProvider):
 class MistralProvider(AIProvider):
     """Mistral AI provider"""
 
+    PROVIDER_NAME = "Mistral"
+    ENV_KEY = "MISTRAL_API_KEY"
+
     MODELS = {
         "Mistral Large": "mistral-large-latest",
         "Mistral Medium": "mistral-medium-latest",
@@ -346,7 +817,7 @@ class MistralProvider(AIProvider):
 
     def __init__(self, api_key: Optional[str] = None, model_name: str = "Mistral Large"):
         self.model_name = model_name
-        super().__init__(api_key or os.getenv("MISTRAL_API_KEY"))
+        super().__init__(api_key or self.detect_api_key())
 
     def check_configuration(self) -> bool:
         return bool(self.api_key and self.api_key != "your_api_key_here")
@@ -361,7 +832,8 @@ class MistralProvider(AIProvider):
         except ImportError:
             raise ImportError("Mistral package not installed. Run: pip install mistralai")
 
-        client = MistralClient(api_key=self.api_key)
+        client = get_shared_client(("mistral", self.api_key),
+                                   lambda: MistralClient(api_key=self.api_key))
 
         messages = []
         if system_prompt:
@@ -376,6 +848,33 @@ class MistralProvider(AIProvider):
 
         return response.choices[0].message.content
 
+    def stream_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> Iterator[TextChunk]:
+        if not self.is_configured:
+            raise ValueError("Mistral API key not configured")
+
+        try:
+            from mistralai.client import MistralClient
+            from mistralai.models.chat_completion import ChatMessage
+        except ImportError:
+            raise ImportError("Mistral package not installed. Run: pip install mistralai")
+
+        client = get_shared_client(("mistral", self.api_key),
+                                   lambda: MistralClient(api_key=self.api_key))
+
+        messages = []
+        if system_prompt:
+            messages.append(ChatMessage(role="system", content=system_prompt))
+        messages.append(ChatMessage(role="user", content=prompt))
+
+        stream = client.chat_stream(
+            model=self.MODELS.get(self.model_name, self.MODELS["Mistral Large"]),
+            messages=messages,
+            max_tokens=max_tokens
+        )
+
+        # Mistral stream chunks mirror the OpenAI delta format
+        yield from _stream_openai_chunks(stream, self.PROVIDER_NAME, self.model_name)
+
     def analyze_image(self, image_data: bytes, prompt: str) -> str:
         raise NotImplementedError("Mistral does not support image analysis")
 
@@ -386,6 +885,9 @@ class MistralProvider(AIProvider):
 class QwenProvider(AIProvider):
     """Qwen provider"""
 
+    PROVIDER_NAME = "Qwen"
+    ENV_KEY = "QWEN_API_KEY"
+
     MODELS = {
         "Qwen Turbo": "qwen-turbo",
         "Qwen Plus": "qwen-plus",
@@ -394,7 +896,7 @@ class QwenProvider(AIProvider):
 
     def __init__(self, api_key: Optional[str] = None, model_name: str = "Qwen Plus"):
         self.model_name = model_name
-        super().__init__(api_key or os.getenv("QWEN_API_KEY"))
+        super().__init__(api_key or self.detect_api_key())
 
     def check_configuration(self) -> bool:
         return bool(self.api_key and self.api_key != "your_api_key_here")
@@ -409,8 +911,6 @@ class QwenProvider(AIProvider):
         except ImportError:
             raise ImportError("DashScope package not installed. Run: pip install dashscope")
 
-        dashscope.api_key = self.api_key
-
         messages = []
         if system_prompt:
             messages.append({"role": "system", "content": system_prompt})
@@ -419,11 +919,49 @@ class QwenProvider(AIProvider):
         response = Generation.call(
             model=self.MODELS.get(self.model_name, self.MODELS["Qwen Plus"]),
             messages=messages,
-            result_format='message'
+            result_format='message',
+            api_key=self.api_key
         )
 
         return response.output.choices[0].message.content
 
+    def stream_text(self, prompt: str, system_prompt: str = "", max_tokens: int = 2000) -> Iterator[TextChunk]:
+        if not self.is_configured:
+            raise ValueError("Qwen API key not configured")
+
+        try:
+            import dashscope
+            from dashscope import Generation
+        except ImportError:
+            raise ImportError("DashScope package not installed. Run: pip install dashscope")
+
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": prompt})
+
+        responses = Generation.call(
+            model=self.MODELS.get(self.model_name, self.MODELS["Qwen Plus"]),
+            messages=messages,
+            result_format='message',
+            api_key=self.api_key,
+            stream=True,
+            incremental_output=True  # Each response carries only the new text
+        )
+
+        finish_reason = None
+        for response in responses:
+            if response.status_code != 200:
+                raise RuntimeError(f"Qwen streaming error: {response.code} {response.message}")
+            choice = response.output.choices[0]
+            if choice.message.content:
+                yield TextChunk(choice.message.content, self.PROVIDER_NAME, self.model_name)
+            if choice.finish_reason and choice.finish_reason != "null":
+                finish_reason = choice.finish_reason
+
+        yield TextChunk("", self.PROVIDER_NAME, self.model_name, is_final=True,
+                        finish_reason=finish_reason)
+
     def analyze_image(self, image_data: bytes, prompt: str) -> str:
         raise NotImplementedError("Qwen does not support image analysis in this implementation")
 
@@ -468,32 +1006,59 @@ class AIProviderManager:
         }
     }
 
+    # Default per-provider timeouts (seconds) for fan_out
+    PROVIDER_TIMEOUTS = {
+        "Claude": 60.0,
+        "OpenAI": 60.0,
+        "Google Gemini": 60.0,
+        "DeepSeek": 90.0,
+        "Mistral": 60.0,
+        "Qwen": 60.0
+    }
+
     def __init__(self):
         self.providers = {}
         self._initialize_providers()
 
     def _initialize_providers(self):
-        """Initialize all providers (silently fail if not configured)"""
+        """
+        Register all providers from API key presence only (silently fail if not configured)
+
+        Provider instances, and the SDK imports they trigger, are created on
+        first use by get_instance()/get_provider().
+        """
         for provider_name, config in self.PROVIDERS.items():
             try:
-                provider_class = config["class"]
-                provider = provider_class()
+                api_key = config["class"].detect_api_key()
                 self.providers[provider_name] = {
-                    "instance": provider,
-                    "configured": provider.is_configured,
+                    "api_key": api_key,
+                    "configured": AIProvider.is_valid_key(api_key),
                     "models": config["models"],
                     "supports_vision": config["supports_vision"]
                 }
             except Exception as e:
                 # Silent failure - provider not available
                 self.providers[provider_name] = {
-                    "instance": None,
+                    "api_key": None,
                     "configured": False,
                     "models": config["models"],
                     "supports_vision": config["supports_vision"],
                     "error": str(e)
                 }
 
+    def get_instance(self, provider_name: str) -> Optional[AIProvider]:
+        """Get the provider instance for its default model, building it on first use"""
+        provider_data = self.providers.get(provider_name)
+        if not provider_data or not provider_data["configured"]:
+            return None
+
+        provider_class = self.PROVIDERS[provider_name]["class"]
+        api_key = provider_data["api_key"]
+        return get_shared_client(
+            ("provider", provider_name, None, api_key),
+            lambda: provider_class(api_key=api_key)
+        )
+
     def get_available_models(self) -> Dict[str, List[str]]:
         """Get all models grouped by provider (including unconfigured)"""
         models = {}
@@ -514,9 +1079,13 @@ class AIProviderManager:
         if not provider_data["configured"]:
             return None
 
-        # Create new instance with specific model
+        # Reuse one instance per provider, model and API key
         provider_class = self.PROVIDERS[provider_name]["class"]
-        return provider_class(model_name=model_name)
+        api_key = provider_data["api_key"]
+        return get_shared_client(
+            ("provider", provider_name, model_name, api_key),
+            lambda: provider_class(api_key=api_key, model_name=model_name)
+        )
 
     def generate_text(self, provider_name: str, model_name: str, prompt: str,
                      system_prompt: str = "", max_tokens: int = 2000) -> str:
@@ -527,6 +1096,102 @@ class AIProviderManager:
 
         return provider.generate_text(prompt, system_prompt, max_tokens)
 
+    def stream_text(self, provider_name: str, model_name: str, prompt: str,
+                    system_prompt: str = "", max_tokens: int = 2000) -> Iterator[TextChunk]:
+        """Stream text using specified provider and model"""
+        provider = self.get_provider(provider_name, model_name)
+        if not provider:
+            raise ValueError(f"{provider_name} is not configured. Please add API key to .env file.")
+
+        return provider.stream_text(prompt, system_prompt, max_tokens)
+
+    async def agenerate_text(self, provider_name: str, model_name: str, prompt: str,
+                             system_prompt: str = "", max_tokens: int = 2000) -> str:
+        """Async: generate text using specified provider and model"""
+        provider = self.get_provider(provider_name, model_name)
+        if not provider:
+            raise ValueError(f"{provider_name} is not configured. Please add API key to .env file.")
+
+        return await provider.agenerate_text(prompt, system_prompt, max_tokens)
+
+    async def fan_out(self, prompt: str, models: List[Union[str, Tuple[str, str]]],
+                      system_prompt: str = "", max_tokens: int = 2000,
+                      max_concurrency: int = 4,
+                      timeouts: Dict[str, float] = None) -> AsyncIterator[FanOutResult]:
+        """
+        Ask several models the same question concurrently
+
+        Args:
+            prompt: The prompt to send to every model
+            models: "Provider / Model" strings or (provider, model) tuples
+            system_prompt: Optional system prompt
+            max_tokens: Max tokens per response
+            max_concurrency: Max requests in flight at once across all providers
+            timeouts: Per-provider timeout overrides in seconds (see PROVIDER_TIMEOUTS)
+
+        Yields:
+            FanOutResult for each model, in the order they complete. Failures
+            and timeouts are reported in the result instead of raised.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        timeouts = {**self.PROVIDER_TIMEOUTS, **(timeouts or {})}
+
+        async def run_one(provider_name: str, model_name: str) -> FanOutResult:
+            async with semaphore:
+                started = time.perf_counter()
+                timeout = timeouts.get(provider_name, 60.0)
+                try:
+                    text = await asyncio.wait_for(
+                        self.agenerate_text(provider_name, model_name, prompt, system_prompt, max_tokens),
+                        timeout
+                    )
+                    return FanOutResult(provider_name, model_name, text=text,
+                                        latency=time.perf_counter() - started)
+                except asyncio.TimeoutError:
+                    error = f"Timed out after {timeout:g}s"
+                except Exception as e:
+                    error = str(e)
+                return FanOutResult(provider_name, model_name, error=error,
+                                    latency=time.perf_counter() - started)
+
+        tasks = [asyncio.ensure_future(run_one(*parse_model_selection(m))) for m in models]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early: don't leave requests running
+            for task in tasks:
+                task.cancel()
+
+    def fan_out_sync(self, prompt: str, models: List[Union[str, Tuple[str, str]]],
+                     system_prompt: str = "", max_tokens: int = 2000,
+                     max_concurrency: int = 4,
+                     timeouts: Dict[str, float] = None) -> Iterator[FanOutResult]:
+        """
+        Blocking iterator over fan_out results, for sync callers such as Streamlit
+
+        Runs fan_out on a shared background event loop and yields each
+        result as soon as it completes.
+        """
+        results = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for result in self.fan_out(prompt, models, system_prompt, max_tokens,
+                                                 max_concurrency, timeouts):
+                    results.put(result)
+            finally:
+                results.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), _get_background_loop())
+        while True:
+            item = results.get()
+            if item is done:
+                break
+            yield item
+        future.result()
+
     def analyze_image(self, provider_name: str, model_name: str,
                      image_data: bytes, prompt: str) -> str:
         """Analyze image using specified provider"""
@@ -540,11 +1205,59 @@ class AIProviderManager:
         return provider.analyze_image(image_data, prompt)
 
 
+def parse_model_selection(selection: Union[str, Tuple[str, str]]) -> Tuple[str, str]:
+    """
+    Split a model selection into (provider_name, model_name)
+
+    Accepts "Provider / Model", a (provider, model) tuple, or a bare model
+    name (assumed to be Claude for backward compatibility).
+    """
+    if isinstance(selection, (tuple, list)):
+        return selection[0], selection[1]
+    if " / " in selection:
+        provider_name, model_name = selection.split(" / ", 1)
+        return provider_name, model_name
+    return "Claude", selection
+
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """Get the long-lived event loop used to run async provider calls from sync code"""
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="ai-provider-loop", daemon=True)
+            thread.start()
+            _background_loop = loop
+    return _background_loop
+
+
+_default_manager = None
+_default_manager_lock = threading.Lock()
+
+
 def get_available_providers() -> Dict[str, Any]:
     """Get a dictionary of all available providers with their instances"""
-    manager = AIProviderManager()
+    global _default_manager
+    if _default_manager is None:
+        with _default_manager_lock:
+            if _default_manager is None:
+                # Key detection is cheap, but there's no need to repeat it on every rerun
+                _default_manager = AIProviderManager()
+
     providers = {}
-    for provider_name, data in manager.providers.items():
+    for provider_name, data in _default_manager.providers.items():
         if data["configured"]:
-            providers[provider_name] = data["instance"]
-    return providers
\ No newline at end of file
+            providers[provider_name] = _default_manager.get_instance(provider_name)
+    return providers
+
+
+def reset_default_manager():
+    """Drop the manager behind get_available_providers(); the next call re-detects keys"""
+    global _default_manager
+    with _default_manager_lock:
+        _default_manager = None
@@ -0,0 +1,130 @@
+"""
+Shared SDK client pool for LearnPath AI
+Reuses AI SDK clients (and their keep-alive HTTP connections) across calls
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+def _run_quietly(func: Callable, *args):
+    """Call func, ignoring errors (used for best-effort client cleanup)"""
+    try:
+        func(*args)
+    except Exception:
+        pass
+
+
+class ClientPool:
+    """
+    Bounded, thread-safe LRU cache of SDK clients and provider instances
+
+    Keys are tuples such as ("anthropic", api_key) or
+    ("provider", provider_name, model_name, api_key). The Anthropic and
+    OpenAI SDK clients each hold an httpx connection pool, so reusing the
+    client keeps TCP/TLS connections alive between requests.
+
+    A client can be stored with an on_evict callback, which is called with
+    the client when it is evicted or the pool shuts down, instead of the
+    default close(). Async clients use it to close on their own event loop.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max(1, max_size)
+        self._clients = OrderedDict()  # key -> (client, on_evict)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'discards': 0}
+
+    def get(self, key: Hashable, factory: Callable[[], Any],
+            on_evict: Optional[Callable[[Any], None]] = None) -> Any:
+        """Get the client for key, building it with factory() on first use"""
+        with self._lock:
+            entry = self._clients.get(key)
+            if entry is not None:
+                self._clients.move_to_end(key)
+                self._stats['hits'] += 1
+                return entry[0]
+
+        # Build outside the lock; SDK imports and construction can be slow
+        client = factory()
+
+        evicted = []
+        with self._lock:
+            existing = self._clients.get(key)
+            if existing is not None:
+                # Another thread built it first; use theirs and drop ours
+                self._clients.move_to_end(key)
+                self._stats['hits'] += 1
+                return existing[0]
+
+            self._clients[key] = (client, on_evict)
+            self._stats['misses'] += 1
+
+            while len(self._clients) > self.max_size:
+                evicted.append(self._clients.popitem(last=False)[1])
+                self._stats['evictions'] += 1
+
+        # Evicted clients without a callback aren't closed, because a request
+        # in another thread may still be using them; they close when garbage
+        # collected
+        for evicted_client, evicted_callback in evicted:
+            if evicted_callback is not None:
+                _run_quietly(evicted_callback, evicted_client)
+
+        return client
+
+    def discard(self, key: Hashable) -> bool:
+        """Drop a client without closing it (e.g. its event loop is gone)"""
+        with self._lock:
+            removed = self._clients.pop(key, None) is not None
+            if removed:
+                self._stats['discards'] += 1
+        return removed
+
+    def shutdown(self):
+        """Close every pooled client (via on_evict or close()) and empty the pool"""
+        with self._lock:
+            entries = list(self._clients.values())
+            self._clients.clear()
+
+        for client, on_evict in entries:
+            if on_evict is not None:
+                _run_quietly(on_evict, client)
+                continue
+            close = getattr(client, "close", None)
+            if callable(close):
+                _run_quietly(close)
+
+    def get_stats(self) -> Dict:
+        """Get pool metrics (hits, misses, evictions, discards, size)"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['size'] = len(self._clients)
+            stats['max_size'] = self.max_size
+        return stats
+
+
+# Process-wide pool shared by AIProviderManager and ClaudeAI
+_client_pool = ClientPool()
+
+
+def get_shared_client(key: Hashable, factory: Callable[[], Any],
+                      on_evict: Optional[Callable[[Any], None]] = None) -> Any:
+    """Get a client from the process-wide pool, building it on first use"""
+    return _client_pool.get(key, factory, on_evict)
+
+
+def discard_shared_client(key: Hashable) -> bool:
+    """Drop a client from the process-wide pool without closing it"""
+    return _client_pool.discard(key)
+
+
+def get_client_pool_stats() -> Dict:
+    """Get metrics for the process-wide client pool"""
+    return _client_pool.get_stats()
+
+
+def shutdown_clients():
+    """Close all pooled clients; later calls build fresh ones"""
+    _client_pool.shutdown()
@@ -0,0 +1,213 @@
+"""
+SQLite connection pool for LearnPath AI
+Keeps tuned connections open across calls instead of reconnecting per query
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+from typing import Dict
+
+
+# Per-connection tuning applied once when a connection is opened
+_CONNECTION_PRAGMAS = [
+    "PRAGMA journal_mode = WAL",       # Readers don't block the writer
+    "PRAGMA synchronous = NORMAL",     # Safe with WAL, far fewer fsyncs
+    "PRAGMA cache_size = -8000",       # ~8 MB page cache per connection
+    "PRAGMA mmap_size = 67108864",     # 64 MB memory-mapped reads
+    "PRAGMA temp_store = MEMORY",
+]
+
+
+class PooledConnection:
+    """
+    Proxy around a pooled sqlite3.Connection
+
+    Behaves like the wrapped connection, except close() hands it back to the
+    pool. Uncommitted work is rolled back on close, matching what closing a
+    plain sqlite3 connection would do. A proxy that is dropped without being
+    closed (e.g. an exception skipped the close() call) is returned to the
+    pool when it is garbage collected.
+    """
+
+    __slots__ = ("_pool", "_conn")
+
+    def __init__(self, pool: "ConnectionPool", conn: sqlite3.Connection):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        # Forward attributes such as isolation_level to the real connection
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    @property
+    def raw(self) -> sqlite3.Connection:
+        """The underlying sqlite3 connection"""
+        return self._conn
+
+    def close(self):
+        """Return the connection to the pool"""
+        conn = self._conn
+        if conn is not None:
+            object.__setattr__(self, "_conn", None)
+            self._pool.release(conn)
+
+
+class ConnectionPool:
+    """
+    Bounded pool of persistent SQLite connections
+
+    Each thread checks out its own connection for the duration of a call and
+    hands it back on close(), so concurrent Streamlit sessions never share a
+    connection at the same time. Connections are opened lazily up to `size`;
+    after that, callers wait for one to be released.
+    """
+
+    def __init__(self, db_path: str, size: int = 5, timeout: float = 30.0,
+                 cached_statements: int = 256):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            size: Maximum number of open connections
+            timeout: Seconds to wait for a free connection before failing
+            cached_statements: Prepared statements cached per connection
+        """
+        self.db_path = db_path
+        self.size = max(1, size)
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self._opened = 0
+        self._in_use = 0
+        self._stats = {
+            'acquired': 0,
+            'reused': 0,
+            'created': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'peak_in_use': 0,
+        }
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and tune a new connection"""
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            cached_statements=self.cached_statements
+        )
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection, opening or waiting for one as needed"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection pool is closed")
+
+        conn = None
+        create = False
+        with self._lock:
+            try:
+                conn = self._idle.get_nowait()
+                self._stats['reused'] += 1
+            except queue.Empty:
+                if self._opened < self.size:
+                    self._opened += 1
+                    create = True
+
+        if create:
+            try:
+                conn = self._open_connection()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+            with self._lock:
+                self._stats['created'] += 1
+        elif conn is None:
+            # Pool exhausted: wait for another thread to release a connection
+            started = time.perf_counter()
+            try:
+                conn = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise sqlite3.OperationalError(
+                    f"Timed out after {self.timeout}s waiting for a database connection"
+                ) from None
+            with self._lock:
+                self._stats['waits'] += 1
+                self._stats['wait_seconds'] += time.perf_counter() - started
+                self._stats['reused'] += 1
+
+        with self._lock:
+            self._in_use += 1
+            self._stats['acquired'] += 1
+            self._stats['peak_in_use'] = max(self._stats['peak_in_use'], self._in_use)
+
+        return PooledConnection(self, conn)
+
+    def release(self, conn: sqlite3.Connection):
+        """Return a connection to the pool (or close it if the pool is closed)"""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Broken connection: drop it instead of pooling it
+            with self._lock:
+                self._in_use -= 1
+                self._opened -= 1
+            conn.close()
+            return
+
+        with self._lock:
+            self._in_use -= 1
+            if self._closed:
+                self._opened -= 1
+                conn.close()
+            else:
+                self._idle.put(conn)
+
+    def close(self):
+        """Close all idle connections; busy ones are closed when released"""
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                self._opened -= 1
+                conn.close()
+
+    def get_stats(self) -> Dict:
+        """Get pool usage metrics"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                'size': self.size,
+                'open': self._opened,
+                'in_use': self._in_use,
+                'idle': self._idle.qsize(),
+            })
+        stats['wait_seconds'] = round(stats['wait_seconds'], 4)
+        return stats
@@ -3,188 +3,144 @@ Database operations for LearnPath AI
 Handles SQLite database for storing learning paths and progress tracking
 """
 
+import atexit
 import sqlite3
 import json
+import threading
+import time
+import weakref
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import os
+from .connection_pool import ConnectionPool
+from .migrations import migrate
+from .plan_models import TOPIC_COLUMNS, Topic
 
 
 # Determine the absolute path to the project's root directory
 # The current file is in 'utils', so we go one level up.
 _PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 _DB_PATH = os.path.join(_PROJECT_ROOT, "learnpath.db")
+_DEFAULT_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+
+
+def _flush_at_exit(database_ref):
+    """atexit hook: write any queued resource link edits before the process ends"""
+    database = database_ref()
+    if database is not None:
+        try:
+            database.flush_resource_links()
+        except Exception as e:
+            print(f"Error flushing resource links at exit: {str(e)}")
 
 
 class Database:
-    def __init__(self, db_path: str = _DB_PATH):
+    def __init__(self, db_path: str = _DB_PATH, pool_size: int = _DEFAULT_POOL_SIZE,
+                 resource_links_flush_interval: float = 2.0):
         """Initialize database connection and create tables if they don't exist"""
         self.db_path = db_path
-        self.init_database()
-
-    def get_connection(self):
-        """Get a database connection"""
-        return sqlite3.connect(self.db_path)
-
-    def init_database(self):
-        """Create tables if they don't exist"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        self.pool = ConnectionPool(db_path, size=pool_size)
+
+        # Write-behind buffer for resource link edits: {topic_id: links}
+        self.resource_links_flush_interval = resource_links_flush_interval
+        self._pending_links = {}
+        self._pending_links_lock = threading.Lock()
+        self._pending_links_timer = None
+        self._links_stats = {
+            'queued': 0,
+            'coalesced': 0,
+            'flushes': 0,
+            'rows_written': 0,
+            'last_flush_seconds': 0.0,
+        }
 
-        # Learning Paths table (now supports all goal types)
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS learning_paths (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                goal TEXT NOT NULL,
-                timeframe INTEGER NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_active BOOLEAN DEFAULT 1,
-                status TEXT DEFAULT 'active',
-                goal_type TEXT DEFAULT 'learning',
-                start_date DATE,
-                hours_per_day REAL DEFAULT 2.0,
-                unavailable_dates TEXT,
-                weekly_pattern TEXT
-            )
-        """)
+        # The flush timer is a daemon thread, so flush on interpreter exit too
+        # (weakref: the hook must not keep a discarded Database alive)
+        self._exit_hook = lambda ref=weakref.ref(self): _flush_at_exit(ref)
+        atexit.register(self._exit_hook)
 
-        # Add new columns to existing tables if they don't exist
-        try:
-            cursor.execute("ALTER TABLE learning_paths ADD COLUMN status TEXT DEFAULT 'active'")
-        except sqlite3.OperationalError:
-            pass
+        self.init_database()
 
-        try:
-            cursor.execute("ALTER TABLE learning_paths ADD COLUMN goal_type TEXT DEFAULT 'learning'")
-        except sqlite3.OperationalError:
-            pass
+    def get_connection(self):
+        """
+        Get a pooled database connection
 
-        # Add new date/time planning columns
-        try:
-            cursor.execute("ALTER TABLE learning_paths ADD COLUMN start_date DATE")
-        except sqlite3.OperationalError:
-            pass
+        Call close() on it when done to hand it back to the pool.
+        """
+        return self.pool.acquire()
 
-        try:
-            cursor.execute("ALTER TABLE learning_paths ADD COLUMN hours_per_day REAL DEFAULT 2.0")
-        except sqlite3.OperationalError:
-            pass
+    def get_pool_stats(self) -> Dict:
+        """Get connection pool metrics (connections opened, reused, waits, ...)"""
+        return self.pool.get_stats()
 
-        try:
-            cursor.execute("ALTER TABLE learning_paths ADD COLUMN unavailable_dates TEXT")
-        except sqlite3.OperationalError:
-            pass
+    def close(self):
+        """Flush buffered writes and close all pooled connections"""
+        atexit.unregister(self._exit_hook)
+        self.flush_resource_links()
+        self.pool.close()
 
+    def init_database(self):
+        """Create or upgrade the schema (a single pragma read once up to date)"""
+        conn = self.get_connection()
         try:
-            cursor.execute("ALTER TABLE learning_paths ADD COLUMN weekly_pattern TEXT")
-        except sqlite3.OperationalError:
-            pass
-
-        # Topics table (now with priority, due dates, and notes)
+            migrate(conn)
+        finally:
+            conn.close()
+
+    def _insert_learning_path(self, cursor, goal: str, timeframe: int, goal_type: str,
+                              start_date: str, hours_per_day: float,
+                              unavailable_dates: str, weekly_pattern: str) -> int:
+        """Insert a learning path row on an open cursor and return its ID"""
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS topics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                path_id INTEGER NOT NULL,
-                day_number INTEGER NOT NULL,
-                topic_name TEXT NOT NULL,
-                subtopics TEXT,
-                estimated_hours REAL,
-                resources TEXT,
-                is_completed BOOLEAN DEFAULT 0,
-                completed_at TIMESTAMP,
-                time_spent_minutes INTEGER DEFAULT 0,
-                priority TEXT DEFAULT 'medium',
-                due_date DATE,
-                notes TEXT,
-                FOREIGN KEY (path_id) REFERENCES learning_paths(id)
-            )
-        """)
-
-        # Add new columns to topics table
-        try:
-            cursor.execute("ALTER TABLE topics ADD COLUMN priority TEXT DEFAULT 'medium'")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            cursor.execute("ALTER TABLE topics ADD COLUMN due_date DATE")
-        except sqlite3.OperationalError:
-            pass
-
-        try:
-            cursor.execute("ALTER TABLE topics ADD COLUMN notes TEXT")
-        except sqlite3.OperationalError:
-            pass
+            INSERT INTO learning_paths (goal, timeframe, goal_type, start_date, hours_per_day,
+                                       unavailable_dates, weekly_pattern)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (goal, timeframe, goal_type, start_date, hours_per_day, unavailable_dates, weekly_pattern))
 
-        try:
-            cursor.execute("ALTER TABLE topics ADD COLUMN actual_hours REAL DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
+        return cursor.lastrowid
 
-        try:
-            cursor.execute("ALTER TABLE topics ADD COLUMN resource_links TEXT")
-        except sqlite3.OperationalError:
-            pass
+    def _insert_topics(self, cursor, path_id: int, topics: List) -> List[int]:
+        """
+        Bulk insert topics on an open cursor and return their IDs in order
 
-        # Time tracking sessions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS time_sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                topic_id INTEGER NOT NULL,
-                path_id INTEGER NOT NULL,
-                start_time TIMESTAMP,
-                end_time TIMESTAMP,
-                duration_minutes INTEGER,
-                session_date DATE,
-                notes TEXT,
-                FOREIGN KEY (topic_id) REFERENCES topics(id),
-                FOREIGN KEY (path_id) REFERENCES learning_paths(id)
-            )
-        """)
+        Must run inside the caller's write transaction so no other writer can
+        interleave rows between the max-id probe and the insert.
+        """
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM topics")
+        last_id_before = cursor.fetchone()[0]
 
-        # AI coaching reviews table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS coaching_reviews (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                path_id INTEGER NOT NULL,
-                review_text TEXT NOT NULL,
-                performance_summary TEXT,
-                insights TEXT,
-                recommendations TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (path_id) REFERENCES learning_paths(id)
+        # Rows are built lazily so long plans stream straight into executemany;
+        # Topic objects are already validated and convert without lookups
+        rows = (
+            topic.to_row(path_id) if isinstance(topic, Topic) else (
+                path_id,
+                topic.get('day', 0),
+                topic.get('topic', ''),
+                json.dumps(topic.get('subtopics', [])),
+                topic.get('estimated_hours', 0),
+                json.dumps(topic.get('resources', [])),
+                topic.get('priority', 'medium'),
+                topic.get('due_date', None),
+                topic.get('notes', '')
             )
-        """)
+            for topic in topics
+        )
 
-        # AI coaching chat history table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS coaching_chats (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                path_id INTEGER NOT NULL,
-                message TEXT NOT NULL,
-                role TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (path_id) REFERENCES learning_paths(id)
+        cursor.executemany("""
+            INSERT INTO topics (
+                path_id, day_number, topic_name, subtopics,
+                estimated_hours, resources, priority, due_date, notes
             )
-        """)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
 
-        # Progress tracking table
         cursor.execute("""
-            CREATE TABLE IF NOT EXISTS progress_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                path_id INTEGER NOT NULL,
-                topic_id INTEGER NOT NULL,
-                action TEXT NOT NULL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                notes TEXT,
-                FOREIGN KEY (path_id) REFERENCES learning_paths(id),
-                FOREIGN KEY (topic_id) REFERENCES topics(id)
-            )
-        """)
+            SELECT id FROM topics
+            WHERE path_id = ? AND id > ?
+            ORDER BY id
+        """, (path_id, last_id_before))
 
-        conn.commit()
-        conn.close()
+        return [row[0] for row in cursor.fetchall()]
 
     def save_learning_path(self, goal: str, timeframe: int, goal_type: str = 'learning',
                           start_date: str = None, hours_per_day: float = 2.0,
@@ -193,44 +149,59 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        cursor.execute("""
-            INSERT INTO learning_paths (goal, timeframe, goal_type, start_date, hours_per_day,
-                                       unavailable_dates, weekly_pattern)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (goal, timeframe, goal_type, start_date, hours_per_day, unavailable_dates, weekly_pattern))
-
-        path_id = cursor.lastrowid
+        path_id = self._insert_learning_path(cursor, goal, timeframe, goal_type, start_date,
+                                             hours_per_day, unavailable_dates, weekly_pattern)
         conn.commit()
         conn.close()
 
         return path_id
 
-    def save_topics(self, path_id: int, topics: List[Dict]):
-        """Save action items/milestones for a goal plan"""
+    def save_topics(self, path_id: int, topics: List) -> List[int]:
+        """Save action items/milestones for a goal plan in one transaction and return their IDs"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
-        for topic in topics:
-            cursor.execute("""
-                INSERT INTO topics (
-                    path_id, day_number, topic_name, subtopics,
-                    estimated_hours, resources, priority, due_date, notes
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                path_id,
-                topic.get('day', 0),
-                topic.get('topic', ''),
-                json.dumps(topic.get('subtopics', [])),
-                topic.get('estimated_hours', 0),
-                json.dumps(topic.get('resources', [])),
-                topic.get('priority', 'medium'),
-                topic.get('due_date', None),
-                topic.get('notes', '')
-            ))
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            topic_ids = self._insert_topics(cursor, path_id, topics)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return topic_ids
+
+    def save_path_with_topics(self, goal: str, timeframe: int, topics: List,
+                              goal_type: str = 'learning', start_date: str = None,
+                              hours_per_day: float = 2.0, unavailable_dates: str = None,
+                              weekly_pattern: str = None) -> Tuple[int, List[int]]:
+        """
+        Save a goal plan and all of its topics atomically
 
-        conn.commit()
-        conn.close()
+        Either the path and every topic are written, or nothing is, so a
+        crash mid-save can't leave a path with half a curriculum.
+
+        Returns:
+            Tuple of (path_id, topic_ids)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            path_id = self._insert_learning_path(cursor, goal, timeframe, goal_type, start_date,
+                                                 hours_per_day, unavailable_dates, weekly_pattern)
+            topic_ids = self._insert_topics(cursor, path_id, topics)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return path_id, topic_ids
 
     def get_learning_paths(self, active_only: bool = True) -> List[Dict]:
         """Get all learning paths"""
@@ -306,6 +277,28 @@ class Database:
             })
 
         conn.close()
+        return self._overlay_pending_links(topics)
+
+    def get_topic_models(self, path_id: int) -> List[Topic]:
+        """Get all topics for a learning path as Topic objects"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute(f"""
+            SELECT {TOPIC_COLUMNS}
+            FROM topics
+            WHERE path_id = ?
+            ORDER BY day_number
+        """, (path_id,))
+
+        topics = [Topic.from_row(row) for row in cursor.fetchall()]
+        conn.close()
+
+        with self._pending_links_lock:
+            if self._pending_links:
+                for topic in topics:
+                    if topic.id in self._pending_links:
+                        topic.resource_links = self._pending_links[topic.id]
         return topics
 
     def update_topic_completion(self, topic_id: int, is_completed: bool, time_spent: int = 0):
@@ -449,6 +442,68 @@ class Database:
         conn.close()
         return paths
 
+    def get_paths_with_stats(self, status: str = None) -> List[Dict]:
+        """
+        Get learning paths with their progress stats in a single query
+        Filters like get_paths_by_status (deleted paths are never shown)
+
+        Returns:
+            List of path dicts, each with a 'stats' dict shaped like
+            get_progress_stats plus estimated/actual hour totals
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        query = """
+            SELECT p.id, p.goal, p.timeframe, p.created_at, p.updated_at, p.status,
+                   p.goal_type,
+                   COUNT(t.id) as total_topics,
+                   SUM(CASE WHEN t.is_completed = 1 THEN 1 ELSE 0 END) as completed_topics,
+                   SUM(t.time_spent_minutes) as total_time_spent,
+                   SUM(COALESCE(t.estimated_hours, 0)) as total_estimated,
+                   SUM(COALESCE(t.actual_hours, 0)) as total_actual
+            FROM learning_paths p
+            LEFT JOIN topics t ON t.path_id = p.id
+            WHERE p.status != 'deleted'
+        """
+        params = []
+        if status:
+            query += " AND p.status = ?"
+            params.append(status)
+        query += """
+            GROUP BY p.id
+            ORDER BY p.updated_at DESC
+        """
+
+        cursor.execute(query, params)
+
+        paths = []
+        for row in cursor.fetchall():
+            total = row[7] or 0
+            completed = row[8] or 0
+            time_spent = row[9] or 0
+            paths.append({
+                'id': row[0],
+                'goal': row[1],
+                'timeframe': row[2],
+                'created_at': row[3],
+                'updated_at': row[4],
+                'status': row[5] or 'active',
+                'goal_type': row[6] or 'learning',
+                'stats': {
+                    'total_topics': total,
+                    'completed_topics': completed,
+                    'progress_percentage': (completed / total * 100) if total > 0 else 0,
+                    'total_time_spent_minutes': time_spent,
+                    'total_time_spent_hours': round(time_spent / 60, 1),
+                    'total_estimated_hours': row[10] or 0,
+                    'total_actual_hours': row[11] or 0
+                }
+            })
+
+        conn.close()
+        return paths
+
     def update_topic_due_date(self, topic_id: int, due_date: str):
         """Update the due date for a specific topic"""
         conn = self.get_connection()
@@ -463,13 +518,10 @@ class Database:
         conn.commit()
         conn.close()
 
-    def update_path_schedule(self, path_id: int, start_date: str = None,
-                           hours_per_day: float = None, unavailable_dates: str = None,
-                           weekly_pattern: str = None):
-        """Update the scheduling parameters for a learning path"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
+    def _apply_path_schedule(self, cursor, path_id: int, start_date: str = None,
+                             hours_per_day: float = None, unavailable_dates: str = None,
+                             weekly_pattern: str = None) -> bool:
+        """Update scheduling columns on an open cursor; returns True if anything was set"""
         updates = []
         params = []
 
@@ -489,20 +541,146 @@ class Database:
             updates.append("weekly_pattern = ?")
             params.append(weekly_pattern)
 
-        if updates:
-            updates.append("updated_at = CURRENT_TIMESTAMP")
-            params.append(path_id)
+        if not updates:
+            return False
 
-            query = f"""
-                UPDATE learning_paths
-                SET {', '.join(updates)}
-                WHERE id = ?
-            """
+        updates.append("updated_at = CURRENT_TIMESTAMP")
+        params.append(path_id)
+
+        query = f"""
+            UPDATE learning_paths
+            SET {', '.join(updates)}
+            WHERE id = ?
+        """
+
+        cursor.execute(query, params)
+        return True
+
+    def update_path_schedule(self, path_id: int, start_date: str = None,
+                           hours_per_day: float = None, unavailable_dates: str = None,
+                           weekly_pattern: str = None):
+        """Update the scheduling parameters for a learning path"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        if self._apply_path_schedule(cursor, path_id, start_date, hours_per_day,
+                                     unavailable_dates, weekly_pattern):
+            conn.commit()
+
+        conn.close()
 
-            cursor.execute(query, params)
+    def bulk_update_due_dates(self, path_id: int, due_dates: List[Tuple[int, str]],
+                              start_date: str = None, hours_per_day: float = None,
+                              unavailable_dates: str = None, weekly_pattern: str = None) -> int:
+        """
+        Rewrite many topic due dates and the path schedule in one transaction
+
+        Args:
+            path_id: The learning path the topics belong to
+            due_dates: List of (topic_id, due_date) tuples
+            start_date, hours_per_day, unavailable_dates, weekly_pattern:
+                Optional schedule changes, applied like update_path_schedule
+
+        Returns:
+            Number of topics whose due date actually changed
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+
+            # Rows that already have the target date are skipped (no write, not counted)
+            cursor.executemany("""
+                UPDATE topics
+                SET due_date = ?
+                WHERE id = ? AND path_id = ? AND due_date IS NOT ?
+            """, ((due_date, topic_id, path_id, due_date) for topic_id, due_date in due_dates))
+            changed = max(cursor.rowcount, 0)
+
+            self._apply_path_schedule(cursor, path_id, start_date, hours_per_day,
+                                      unavailable_dates, weekly_pattern)
             conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return changed
+
+    def get_active_schedules(self) -> List[Dict]:
+        """
+        Get the schedule settings and incomplete topics of every active path
+
+        One query covers all paths, for batch rescheduling.
+
+        Returns:
+            List of dicts with path 'id', 'start_date', 'hours_per_day',
+            'unavailable_dates', 'weekly_pattern', and 'topic_ids' /
+            'estimated_hours' for incomplete topics in day order
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT p.id, p.start_date, p.hours_per_day, p.unavailable_dates, p.weekly_pattern,
+                   t.id, t.estimated_hours
+            FROM learning_paths p
+            JOIN topics t ON t.path_id = p.id
+            WHERE p.is_active = 1 AND p.status = 'active' AND t.is_completed = 0
+            ORDER BY p.id, t.day_number
+        """)
+
+        schedules = []
+        current = None
+        for row in cursor.fetchall():
+            if current is None or current['id'] != row[0]:
+                current = {
+                    'id': row[0],
+                    'start_date': row[1],
+                    'hours_per_day': row[2] or 2.0,
+                    'unavailable_dates': row[3],
+                    'weekly_pattern': row[4],
+                    'topic_ids': [],
+                    'estimated_hours': []
+                }
+                schedules.append(current)
+            current['topic_ids'].append(row[5])
+            current['estimated_hours'].append(row[6] if row[6] is not None else 2.0)
 
         conn.close()
+        return schedules
+
+    def set_due_dates(self, due_dates: List[Tuple[int, str]]) -> int:
+        """
+        Rewrite topic due dates across any number of paths in one transaction
+
+        Args:
+            due_dates: List of (topic_id, due_date) tuples
+
+        Returns:
+            Number of topics whose due date actually changed
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.executemany("""
+                UPDATE topics
+                SET due_date = ?
+                WHERE id = ? AND due_date IS NOT ?
+            """, ((due_date, topic_id, due_date) for topic_id, due_date in due_dates))
+            changed = max(cursor.rowcount, 0)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return changed
 
     def get_path_details(self, path_id: int) -> Optional[Dict]:
         """Get detailed information about a specific learning path"""
@@ -535,6 +713,184 @@ class Database:
             }
         return None
 
+    def get_path_bundle(self, path_id: int) -> Optional[Dict]:
+        """
+        Get a learning path with its topics and progress stats in one query
+
+        Returns:
+            Dict with 'path_info', 'curriculum' and 'stats' (same shapes as
+            get_path_details, get_topics and get_progress_stats), or None
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT p.id, p.goal, p.timeframe, p.created_at, p.updated_at, p.status,
+                   p.goal_type, p.start_date, p.hours_per_day, p.unavailable_dates,
+                   p.weekly_pattern,
+                   t.id, t.day_number, t.topic_name, t.subtopics, t.estimated_hours,
+                   t.resources, t.is_completed, t.completed_at, t.time_spent_minutes,
+                   t.priority, t.due_date, t.notes, t.actual_hours, t.resource_links
+            FROM learning_paths p
+            LEFT JOIN topics t ON t.path_id = p.id
+            WHERE p.id = ?
+            ORDER BY t.day_number
+        """, (path_id,))
+
+        rows = cursor.fetchall()
+        conn.close()
+
+        if not rows:
+            return None
+
+        first = rows[0]
+        path_info = {
+            'id': first[0],
+            'goal': first[1],
+            'timeframe': first[2],
+            'created_at': first[3],
+            'updated_at': first[4],
+            'status': first[5],
+            'goal_type': first[6],
+            'start_date': first[7],
+            'hours_per_day': first[8],
+            'unavailable_dates': first[9],
+            'weekly_pattern': first[10]
+        }
+
+        topics = []
+        completed = 0
+        time_spent = 0
+        for row in rows:
+            if row[11] is None:
+                # LEFT JOIN row for a path without topics
+                continue
+            topic = {
+                'id': row[11],
+                'day': row[12],
+                'topic': row[13],
+                'subtopics': json.loads(row[14]) if row[14] else [],
+                'estimated_hours': row[15],
+                'resources': json.loads(row[16]) if row[16] else [],
+                'is_completed': bool(row[17]),
+                'completed_at': row[18],
+                'time_spent_minutes': row[19],
+                'priority': row[20],
+                'due_date': row[21],
+                'notes': row[22],
+                'actual_hours': row[23],
+                'resource_links': row[24]
+            }
+            topics.append(topic)
+            if topic['is_completed']:
+                completed += 1
+            time_spent += topic['time_spent_minutes'] or 0
+
+        self._overlay_pending_links(topics)
+
+        total = len(topics)
+        stats = {
+            'total_topics': total,
+            'completed_topics': completed,
+            'progress_percentage': (completed / total * 100) if total > 0 else 0,
+            'total_time_spent_minutes': time_spent,
+            'total_time_spent_hours': round(time_spent / 60, 1)
+        }
+
+        return {
+            'path_info': path_info,
+            'curriculum': topics,
+            'stats': stats
+        }
+
+    # ========================================================================
+    # RESOURCE LINKS (WRITE-BEHIND)
+    # ========================================================================
+
+    def update_resource_links(self, topic_id: int, resource_links: str):
+        """
+        Queue a resource links edit for a topic
+
+        Edits are buffered and coalesced per topic, then written in one batch
+        after resource_links_flush_interval seconds (or on flush_resource_links).
+        Reads through get_topics/get_path_bundle already see queued values.
+        """
+        with self._pending_links_lock:
+            if topic_id in self._pending_links:
+                self._links_stats['coalesced'] += 1
+            self._pending_links[topic_id] = resource_links
+            self._links_stats['queued'] += 1
+
+            if self.resource_links_flush_interval <= 0:
+                flush_now = True
+            else:
+                flush_now = False
+                if self._pending_links_timer is None:
+                    timer = threading.Timer(self.resource_links_flush_interval,
+                                            self.flush_resource_links)
+                    timer.daemon = True
+                    self._pending_links_timer = timer
+                    timer.start()
+
+        if flush_now:
+            self.flush_resource_links()
+
+    def flush_resource_links(self) -> int:
+        """Write all queued resource link edits in one transaction; returns rows written"""
+        with self._pending_links_lock:
+            pending = self._pending_links
+            self._pending_links = {}
+            if self._pending_links_timer is not None:
+                self._pending_links_timer.cancel()
+                self._pending_links_timer = None
+
+        if not pending:
+            return 0
+
+        started = time.perf_counter()
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.executemany("""
+                UPDATE topics
+                SET resource_links = ?
+                WHERE id = ?
+            """, [(links, topic_id) for topic_id, links in pending.items()])
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            # Put the edits back (newer edits queued meanwhile win) so they aren't lost
+            with self._pending_links_lock:
+                for topic_id, links in pending.items():
+                    self._pending_links.setdefault(topic_id, links)
+            raise
+        finally:
+            conn.close()
+
+        with self._pending_links_lock:
+            self._links_stats['flushes'] += 1
+            self._links_stats['rows_written'] += len(pending)
+            self._links_stats['last_flush_seconds'] = round(time.perf_counter() - started, 4)
+
+        return len(pending)
+
+    def get_resource_links_stats(self) -> Dict:
+        """Get write-behind buffer metrics (queued, coalesced, flushes, rows written, pending)"""
+        with self._pending_links_lock:
+            stats = dict(self._links_stats)
+            stats['pending'] = len(self._pending_links)
+        return stats
+
+    def _overlay_pending_links(self, topics: List[Dict]) -> List[Dict]:
+        """Apply queued resource link edits to topics read from the database"""
+        with self._pending_links_lock:
+            if self._pending_links:
+                for topic in topics:
+                    if topic['id'] in self._pending_links:
+                        topic['resource_links'] = self._pending_links[topic['id']]
+        return topics
+
     # ========================================================================
     # TIME TRACKING METHODS
     # ========================================================================
@@ -776,13 +1132,13 @@ class Database:
             return None
 
         # Get path info and topics
-        paths = self.get_learning_paths(active_only=False)
-        path_info = next((p for p in paths if p['id'] == path_id), None)
+        bundle = self.get_path_bundle(path_id)
 
-        if not path_info:
+        if not bundle:
             return None
 
-        topics = self.get_topics(path_id)
+        path_info = bundle['path_info']
+        topics = bundle['curriculum']
 
         # Check if any topics have due dates
         has_due_dates = any(topic.get('due_date') for topic in topics)
@@ -900,8 +1256,7 @@ class Database:
 
     def get_calendar_filename(self, path_id: int) -> str:
         """Generate a filename for the calendar export"""
-        paths = self.get_learning_paths(active_only=False)
-        path_info = next((p for p in paths if p['id'] == path_id), None)
+        path_info = self.get_path_details(path_id)
 
         if not path_info:
             return f"goalpath_plan_{datetime.now().strftime('%Y-%m-%d')}.ics"
@@ -0,0 +1,191 @@
+"""
+Date interval storage for LearnPath AI
+Compact storage and fast lookups for unavailable dates and weekly patterns
+
+Stored formats (learning_paths columns):
+    unavailable_dates  JSON list of single days and inclusive ranges, e.g.
+                       ["2025-11-27", ["2025-12-20", "2026-01-04"]]
+                       (the older list of every individual day is still read)
+    weekly_pattern     Seven '1'/'0' characters, Monday first, 1 = available
+                       (the older JSON {"0": true, ...} dict is still read)
+"""
+
+import json
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+def merge_intervals(intervals: Iterable[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Sort inclusive (start, end) intervals and merge overlapping or adjacent ones"""
+    merged = []
+    for start, end in sorted(i for i in intervals if i[0] <= i[1]):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class DateIntervalIndex:
+    """
+    Sorted, disjoint date intervals with binary-search lookups
+
+    `day in index` checks the intervals only, so an index can be passed
+    wherever a list of unavailable dates was used. is_blocked() and
+    next_free() also apply an optional weekday mask. Iterating yields every
+    blocked day, for code that needs individual dates.
+
+    Instances are treated as immutable (from_json shares them).
+    """
+
+    __slots__ = ("_starts", "_ends", "weekday_ok")
+
+    def __init__(self, intervals: Iterable[Tuple[date, date]] = (), weekday_ok: Tuple[bool, ...] = None):
+        merged = merge_intervals(intervals)
+        self._starts = [start.toordinal() for start, _end in merged]
+        self._ends = [end.toordinal() for _start, end in merged]
+        self.weekday_ok = weekday_ok
+
+    @classmethod
+    def from_dates(cls, dates: Iterable[date]) -> "DateIntervalIndex":
+        """Build an index from individual days"""
+        return cls((d, d) for d in dates)
+
+    @classmethod
+    def from_json(cls, value: Optional[str]) -> "DateIntervalIndex":
+        """Build an index from the stored column value (either format)"""
+        return _index_from_json(value or "")
+
+    @property
+    def intervals(self) -> List[Tuple[date, date]]:
+        return [(date.fromordinal(s), date.fromordinal(e)) for s, e in zip(self._starts, self._ends)]
+
+    def to_json(self) -> Optional[str]:
+        """Stored column value, or None when there are no dates"""
+        if not self._starts:
+            return None
+        return json.dumps([
+            date.fromordinal(s).isoformat() if s == e
+            else [date.fromordinal(s).isoformat(), date.fromordinal(e).isoformat()]
+            for s, e in zip(self._starts, self._ends)
+        ])
+
+    def _interval_end(self, ordinal: int) -> Optional[int]:
+        """End of the interval containing ordinal, or None"""
+        i = bisect_right(self._starts, ordinal) - 1
+        if i >= 0 and ordinal <= self._ends[i]:
+            return self._ends[i]
+        return None
+
+    def __contains__(self, day: date) -> bool:
+        return self._interval_end(day.toordinal()) is not None
+
+    def is_blocked(self, day: date) -> bool:
+        """Whether day falls in an interval or on a skipped weekday"""
+        if self.weekday_ok is not None and not self.weekday_ok[day.weekday()]:
+            return True
+        return day in self
+
+    def next_free(self, day: date) -> date:
+        """
+        The first date on or after day that isn't blocked
+
+        Raises:
+            ValueError: If the weekday mask blocks every day
+        """
+        if self.weekday_ok is not None and not any(self.weekday_ok):
+            raise ValueError("No available days: every weekday is skipped")
+        ordinal = day.toordinal()
+        while True:
+            end = self._interval_end(ordinal)
+            if end is not None:
+                ordinal = end + 1  # Jump over the whole interval
+            elif self.weekday_ok is not None and not self.weekday_ok[date.fromordinal(ordinal).weekday()]:
+                ordinal += 1
+            else:
+                return date.fromordinal(ordinal)
+
+    def dates_from(self, day: date) -> Iterator[date]:
+        """Every blocked day on or after day, skipping earlier intervals"""
+        ordinal = day.toordinal()
+        first = max(0, bisect_right(self._ends, ordinal - 1))
+        for start, end in zip(self._starts[first:], self._ends[first:]):
+            for current in range(max(start, ordinal), end + 1):
+                yield date.fromordinal(current)
+
+    def __iter__(self) -> Iterator[date]:
+        for start, end in zip(self._starts, self._ends):
+            for ordinal in range(start, end + 1):
+                yield date.fromordinal(ordinal)
+
+    def __len__(self) -> int:
+        """Number of blocked days in the intervals"""
+        return sum(e - s + 1 for s, e in zip(self._starts, self._ends))
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __repr__(self):
+        return f"DateIntervalIndex({len(self._starts)} intervals, {len(self)} days)"
+
+
+@lru_cache(maxsize=256)
+def _index_from_json(value: str) -> DateIntervalIndex:
+    if not value:
+        return DateIntervalIndex()
+    try:
+        items = json.loads(value)
+    except ValueError:
+        return DateIntervalIndex()
+
+    intervals = []
+    for item in items if isinstance(items, list) else ():
+        try:
+            if isinstance(item, str):
+                day = date.fromisoformat(item)
+                intervals.append((day, day))
+            elif isinstance(item, list) and len(item) == 2:
+                intervals.append((date.fromisoformat(item[0]), date.fromisoformat(item[1])))
+        except (TypeError, ValueError):
+            continue
+    return DateIntervalIndex(intervals)
+
+
+def encode_weekly_pattern(pattern: Dict[int, bool]) -> Optional[str]:
+    """Stored weekly_pattern value for a {weekday: available} dict (None if empty)"""
+    if not pattern:
+        return None
+    return "".join("1" if pattern.get(weekday, True) else "0" for weekday in range(7))
+
+
+@lru_cache(maxsize=64)
+def _decode_weekly_pattern(value: str) -> Tuple[Tuple[int, bool], ...]:
+    if len(value) == 7 and set(value) <= {"0", "1"}:
+        return tuple((weekday, flag == "1") for weekday, flag in enumerate(value))
+    try:
+        pattern = json.loads(value)
+    except ValueError:
+        return ()
+    items = []
+    for key, available in (pattern.items() if isinstance(pattern, dict) else ()):
+        try:
+            weekday = int(key)
+        except (TypeError, ValueError):
+            continue
+        if 0 <= weekday <= 6:
+            items.append((weekday, bool(available)))
+    return tuple(sorted(items))
+
+
+def decode_weekly_pattern(value: Optional[str]) -> Dict[int, bool]:
+    """
+    Weekly pattern dict with int weekday keys from the stored value
+
+    Accepts the seven-character mask or the older JSON dict.
+    """
+    if not value:
+        return {}
+    return dict(_decode_weekly_pattern(value))
@@ -3,128 +3,163 @@ Date scheduling utilities for GoalPath AI
 Handles calendar date calculations, unavailable dates, and rescheduling
 """
 
+from array import array
 from datetime import datetime, timedelta, date
+from functools import lru_cache
 from typing import List, Dict, Optional, Tuple
-import json
 import re
 
+from .date_intervals import DateIntervalIndex, decode_weekly_pattern, merge_intervals
+
+
+# ============================================================================
+# DATE EXPRESSIONS
+# ============================================================================
+
+_MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"),
+        ("may",), ("jun", "june"), ("jul", "july"), ("aug", "august"),
+        ("sep", "sept", "september"), ("oct", "october"), ("nov", "november"), ("dec", "december")
+    ], start=1)
+    for name in names
+}
+
+# One date: ISO, US (4- or 2-digit year), "Nov 20" / "November 20, 2025", or a bare day
+_DATE_PATTERN = r"""
+    (?P<{p}iso_y>\d{{4}})-(?P<{p}iso_m>\d{{1,2}})-(?P<{p}iso_d>\d{{1,2}})
+  | (?P<{p}us_m>\d{{1,2}})/(?P<{p}us_d>\d{{1,2}})/(?P<{p}us_y>\d{{4}}|\d{{2}})
+  | (?P<{p}name>[A-Za-z]+)\.?\s+(?P<{p}name_d>\d{{1,2}})(?:,?\s+(?P<{p}name_y>\d{{4}}))?
+  | (?P<{p}day>\d{{1,2}})
+"""
 
-def parse_unavailable_dates(unavailable_str: str) -> List[date]:
-    """
-    Parse unavailable dates string into list of date objects
-    Supports formats like: "Nov 20-22, Dec 1", "2025-11-20, 2025-12-01"
-    """
-    if not unavailable_str or not unavailable_str.strip():
-        return []
+_SINGLE_DATE = re.compile(r"\s*(?:" + _DATE_PATTERN.format(p="a_") + r")\s*", re.VERBOSE)
+
+# A date or a range: "Nov 20", "Nov 20-22", "Nov 20 to Dec 3", "2025-11-20 - 2025-11-25"
+_DATE_EXPRESSION = re.compile(
+    r"\s*(?:" + _DATE_PATTERN.format(p="a_") + r")"
+    r"(?:\s*(?:-|\u2013|\s+to\s+)\s*(?:" + _DATE_PATTERN.format(p="b_") + r"))?\s*",
+    re.VERBOSE | re.IGNORECASE
+)
 
-    unavailable_dates = []
 
-    # Split by comma
-    parts = [p.strip() for p in unavailable_str.split(',')]
+def _build_date(match, prefix: str, year: int, reference_date: date = None) -> Tuple[Optional[date], bool]:
+    """
+    Turn one matched date into a date
 
-    for part in parts:
-        if not part:
+    Returns:
+        (date or None if invalid, whether the year was written out)
+    """
+    group = match.group
+    try:
+        if group(prefix + "iso_y"):
+            return date(int(group(prefix + "iso_y")), int(group(prefix + "iso_m")), int(group(prefix + "iso_d"))), True
+        if group(prefix + "us_y"):
+            us_year = int(group(prefix + "us_y"))
+            if len(group(prefix + "us_y")) == 2:
+                us_year += 1900 if us_year >= 69 else 2000  # Same pivot as strptime's %y
+            return date(us_year, int(group(prefix + "us_m")), int(group(prefix + "us_d"))), True
+        if group(prefix + "name"):
+            month = _MONTHS.get(group(prefix + "name").lower())
+            if month is None:
+                return None, False
+            explicit = group(prefix + "name_y") is not None
+            return date(int(group(prefix + "name_y")) if explicit else year, month, int(group(prefix + "name_d"))), explicit
+        if reference_date is not None:
+            return reference_date.replace(day=int(group(prefix + "day"))), True
+    except ValueError:
+        pass  # Day or month out of range
+    return None, False
+
+
+@lru_cache(maxsize=512)
+def _parse_intervals(unavailable_str: str, year: int) -> Tuple[Tuple[date, date], ...]:
+    """Memoized worker for parse_unavailable_intervals"""
+    intervals = []
+    for part in unavailable_str.split(','):
+        if not part.strip():
+            continue
+        match = _DATE_EXPRESSION.fullmatch(part)
+        if match is None:
             continue
 
-        # Check for date range (e.g., "Nov 20-22" or "2025-11-20 to 2025-11-25")
-        if '-' in part and 'to' not in part.lower():
-            # Try to parse as range
-            try:
-                # Handle "Nov 20-22" format
-                range_parts = part.split('-')
-                if len(range_parts) == 2:
-                    # Try parsing with different formats
-                    start_date = parse_single_date(range_parts[0].strip())
-                    end_date = parse_single_date(range_parts[1].strip(), reference_date=start_date)
-
-                    if start_date and end_date:
-                        current = start_date
-                        while current <= end_date:
-                            unavailable_dates.append(current)
-                            current += timedelta(days=1)
-            except:
-                pass
-        elif 'to' in part.lower():
-            # Handle "Nov 20 to Nov 22" format
-            try:
-                range_parts = re.split(r'\s+to\s+', part, flags=re.IGNORECASE)
-                if len(range_parts) == 2:
-                    start_date = parse_single_date(range_parts[0].strip())
-                    end_date = parse_single_date(range_parts[1].strip())
-
-                    if start_date and end_date:
-                        current = start_date
-                        while current <= end_date:
-                            unavailable_dates.append(current)
-                            current += timedelta(days=1)
-            except:
-                pass
+        start, _explicit = _build_date(match, "a_", year)
+        if start is None:
+            continue
+        if match.group("b_iso_y") or match.group("b_us_y") or match.group("b_name") or match.group("b_day"):
+            end, explicit = _build_date(match, "b_", year, reference_date=start)
+            if end is None:
+                continue
+            if end < start and not explicit and match.group("b_name"):
+                # "Dec 28 - Jan 3": the end month is in the following year
+                try:
+                    end = end.replace(year=end.year + 1)
+                except ValueError:
+                    continue
+            if end < start:
+                continue
         else:
-            # Single date
-            single_date = parse_single_date(part)
-            if single_date:
-                unavailable_dates.append(single_date)
+            end = start
+        intervals.append((start, end))
 
-    return list(set(unavailable_dates))  # Remove duplicates
+    return tuple(merge_intervals(intervals))
 
 
-def parse_single_date(date_str: str, reference_date: date = None) -> Optional[date]:
+def parse_unavailable_intervals(unavailable_str: str) -> List[Tuple[date, date]]:
     """
-    Parse a single date string into a date object
-    Supports: "Nov 20", "2025-11-20", "11/20/2025", "20"
+    Parse an unavailable-dates expression into merged date intervals
+
+    Each comma-separated part is a date or a range, matched in one pass by a
+    compiled grammar: "Nov 20", "Nov 20-22", "Nov 20 - Dec 3",
+    "Nov 20 to Dec 3", "2025-11-20", "11/20/2025", "11/20/25". Dates without
+    a year use the current year; a range like "Dec 28 - Jan 3" ends in the
+    following year. Results are memoized per expression.
+
+    Returns:
+        Sorted, non-overlapping inclusive (start, end) tuples
     """
-    if not date_str:
-        return None
+    if not unavailable_str or not unavailable_str.strip():
+        return []
+    return list(_parse_intervals(unavailable_str, date.today().year))
 
-    date_str = date_str.strip()
-    current_year = datetime.now().year
-
-    # Try different formats
-    formats = [
-        "%Y-%m-%d",      # 2025-11-20
-        "%m/%d/%Y",      # 11/20/2025
-        "%m/%d/%y",      # 11/20/25
-        "%b %d",         # Nov 20
-        "%B %d",         # November 20
-        "%b %d, %Y",     # Nov 20, 2025
-        "%B %d, %Y",     # November 20, 2025
+
+def parse_unavailable_dates(unavailable_str: str) -> List[date]:
+    """
+    Parse unavailable dates string into list of date objects
+    Supports formats like: "Nov 20-22, Dec 1", "2025-11-20, 2025-12-01"
+
+    Prefer parse_unavailable_intervals where ranges can stay as intervals.
+    """
+    return [
+        start + timedelta(days=offset)
+        for start, end in parse_unavailable_intervals(unavailable_str)
+        for offset in range((end - start).days + 1)
     ]
 
-    for fmt in formats:
-        try:
-            parsed = datetime.strptime(date_str, fmt)
-            # If year is not in format, use current year
-            if "%Y" not in fmt and "%y" not in fmt:
-                return parsed.replace(year=current_year).date()
-            return parsed.date()
-        except ValueError:
-            continue
 
-    # Try parsing just day number (e.g., "22")
-    if date_str.isdigit() and reference_date:
-        try:
-            day = int(date_str)
-            return reference_date.replace(day=day)
-        except:
-            pass
+def parse_single_date(date_str: str, reference_date: date = None) -> Optional[date]:
+    """
+    Parse a single date string into a date object
+    Supports: "Nov 20", "2025-11-20", "11/20/2025", "Nov 20, 2025", "20"
+    (a bare day number needs reference_date)
+    """
+    if not date_str:
+        return None
 
-    return None
+    match = _SINGLE_DATE.fullmatch(date_str)
+    if match is None:
+        return None
+    return _build_date(match, "a_", date.today().year, reference_date)[0]
 
 
 def parse_weekly_pattern(pattern_json: str) -> Dict[int, bool]:
     """
-    Parse weekly pattern JSON into dict
+    Parse a stored weekly pattern into dict
     Returns: {0: True, 1: False, ...} where 0=Monday, 6=Sunday
     True = available, False = skip
     """
-    if not pattern_json:
-        return {}
-
-    try:
-        pattern = json.loads(pattern_json)
-        return pattern
-    except:
-        return {}
+    return decode_weekly_pattern(pattern_json)
 
 
 def is_day_available(check_date: date, unavailable_dates: List[date],
@@ -164,31 +199,150 @@ def is_day_available(check_date: date, unavailable_dates: List[date],
     return True
 
 
-def calculate_calendar_dates(start_date: date, topics: List[Dict],
+# A Monday, used to evaluate each weekday's rules
+_REFERENCE_MONDAY = date(2024, 1, 1)
+
+
+def weekday_mask(weekly_pattern: Dict[int, bool] = None, skip_weekends: bool = False,
+                 skip_weekdays: List[int] = None) -> Tuple[bool, ...]:
+    """
+    Availability of each weekday (Monday first) under the weekly rules
+
+    Uses is_day_available itself, so the rules can't drift apart.
+    """
+    return tuple(
+        bool(is_day_available(_REFERENCE_MONDAY + timedelta(days=weekday), (),
+                              weekly_pattern, skip_weekends, skip_weekdays))
+        for weekday in range(7)
+    )
+
+
+class AvailabilityCalendar:
+    """
+    Precomputed work-day calendar for scheduling
+
+    Folds the scheduling constraints into a 7-entry weekday mask and a
+    frozen set of blocked dates, then keeps the offsets (days from `start`)
+    of every available day in order together with a prefix count of
+    available days. "The Nth available day on or after D" is then two array
+    reads instead of a day-by-day walk. The arrays grow a year at a time as
+    later dates are asked for.
+
+    Availability rules are exactly those of is_day_available().
+    """
+
+    _CHUNK_DAYS = 366
+
+    def __init__(self, start: date, unavailable_dates: List[date] = None,
+                 weekly_pattern: Dict[int, bool] = None, skip_weekends: bool = False,
+                 skip_weekdays: List[int] = None):
+        self.start = start
+        self._origin = start.toordinal()
+        self._weekday_ok = weekday_mask(weekly_pattern, skip_weekends, skip_weekdays)
+        # Only blocked dates that would otherwise be available matter
+        if isinstance(unavailable_dates, DateIntervalIndex):
+            blocked = unavailable_dates.dates_from(start)
+        else:
+            blocked = (d for d in (unavailable_dates or ()) if d >= start)
+        self._blocked = frozenset(
+            d.toordinal() - self._origin for d in blocked if self._weekday_ok[d.weekday()]
+        )
+        self._days = array('l')       # Offsets of available days, ascending
+        self._prefix = array('l', [0])  # Available days in [start, start + i)
+
+    def _extend(self, until_offset: int):
+        """Cover offsets up to and including until_offset"""
+        if not any(self._weekday_ok):
+            raise ValueError("No available days: every weekday is skipped")
+        weekday_ok, blocked = self._weekday_ok, self._blocked
+        first_weekday = self.start.weekday()
+        days, prefix = self._days, self._prefix
+        offset = len(prefix) - 1
+        stop = max(until_offset + 1, offset + self._CHUNK_DAYS)
+        count = prefix[-1]
+        while offset < stop:
+            if weekday_ok[(first_weekday + offset) % 7] and offset not in blocked:
+                days.append(offset)
+                count += 1
+            prefix.append(count)
+            offset += 1
+
+    def _offset(self, day: date) -> int:
+        offset = day.toordinal() - self._origin
+        if offset < 0:
+            raise ValueError(f"{day} is before the calendar start {self.start}")
+        return offset
+
+    def is_available(self, day: date) -> bool:
+        """Whether a date (on or after start) is available for work"""
+        offset = self._offset(day)
+        if offset >= len(self._prefix) - 1:
+            self._extend(offset)
+        return self._prefix[offset + 1] != self._prefix[offset]
+
+    def available_before(self, day: date) -> int:
+        """Number of available days from start up to (not including) day"""
+        offset = self._offset(day)
+        if offset >= len(self._prefix):
+            self._extend(offset)
+        return self._prefix[offset]
+
+    def index_of(self, day: date) -> int:
+        """Position of day among the available days, or -1 if it isn't one"""
+        offset = day.toordinal() - self._origin
+        if offset < 0:
+            return -1
+        prefix = self._prefix
+        if offset >= len(prefix) - 1:
+            self._extend(offset)
+        count = prefix[offset]
+        return count if prefix[offset + 1] != count else -1
+
+    def nth_available(self, index: int) -> date:
+        """The available day at 0-based position index, counting from start"""
+        while index >= len(self._days):
+            self._extend(len(self._prefix) - 1 + self._CHUNK_DAYS)
+        return date.fromordinal(self._origin + self._days[index])
+
+    def nth_available_from(self, day: date, n: int) -> date:
+        """The n-th (1-based) available day on or after day"""
+        return self.nth_available(self.available_before(day) + n - 1)
+
+
+def calculate_calendar_dates(start_date: date, topics: List,
                             hours_per_day: float = 2.0,
                             unavailable_dates: List[date] = None,
                             weekly_pattern: Dict[int, bool] = None,
                             skip_weekends: bool = False,
-                            skip_weekdays: List[int] = None) -> List[Dict]:
+                            skip_weekdays: List[int] = None,
+                            calendar: AvailabilityCalendar = None) -> List[Dict]:
     """
     Calculate calendar due dates for all topics based on scheduling constraints
 
+    Each topic takes round(estimated_hours / hours_per_day) available days
+    (at least one), and the next topic starts on the next available day.
+
     Args:
         start_date: When to start the goal plan
-        topics: List of topic dicts with 'estimated_hours' field
+        topics: Topic objects or topic dicts with an 'estimated_hours' field
         hours_per_day: Average hours available per day
         unavailable_dates: List of specific unavailable dates
         weekly_pattern: Custom weekly pattern
         skip_weekends: Whether to skip weekends
         skip_weekdays: List of weekdays to skip
+        calendar: Prebuilt AvailabilityCalendar for these constraints (it
+            must start on or before start_date); built if omitted
 
     Returns:
-        Updated topics list with 'due_date' field added
+        Updated topics list with 'due_date' set (dicts are copies, Topics
+        are the same objects)
     """
-    if unavailable_dates is None:
-        unavailable_dates = []
+    if calendar is None:
+        calendar = AvailabilityCalendar(start_date, unavailable_dates, weekly_pattern,
+                                        skip_weekends, skip_weekdays)
 
-    current_date = start_date
+    # Position in the calendar's list of available days
+    position = calendar.available_before(start_date)
     updated_topics = []
 
     for topic in topics:
@@ -197,31 +351,17 @@ def calculate_calendar_dates(start_date: date, topics: List[Dict],
         # Calculate how many days this topic will take
         days_needed = max(1, round(estimated_hours / hours_per_day))
 
-        # Find the due date by counting available days
-        days_counted = 0
-        check_date = current_date
-
-        while days_counted < days_needed:
-            if is_day_available(check_date, unavailable_dates, weekly_pattern,
-                              skip_weekends, skip_weekdays):
-                days_counted += 1
-                if days_counted == days_needed:
-                    due_date = check_date
-                    break
-            check_date += timedelta(days=1)
-
-        # Update topic with due date
-        topic_copy = topic.copy()
-        topic_copy['due_date'] = due_date.strftime('%Y-%m-%d')
-        updated_topics.append(topic_copy)
+        position += days_needed
+        due_date = calendar.nth_available(position - 1).isoformat()
 
-        # Next topic starts day after this one's due date
-        current_date = due_date + timedelta(days=1)
-
-        # Skip to next available day
-        while not is_day_available(current_date, unavailable_dates, weekly_pattern,
-                                   skip_weekends, skip_weekdays):
-            current_date += timedelta(days=1)
+        # Topic objects are owned by the caller and updated in place; dicts
+        # are copied so callers' plan data is left untouched
+        if isinstance(topic, dict):
+            topic = topic.copy()
+            topic['due_date'] = due_date
+        else:
+            topic.due_date = due_date
+        updated_topics.append(topic)
 
     return updated_topics
 
@@ -339,6 +479,117 @@ def reschedule_incomplete_topics(topics: List[Dict], new_start_date: date,
     return all_topics
 
 
+def _as_intervals(unavailable) -> List[Tuple[date, date]]:
+    """Merged intervals of a DateIntervalIndex or a list of dates"""
+    if isinstance(unavailable, DateIntervalIndex):
+        return unavailable.intervals
+    return merge_intervals((d, d) for d in unavailable or ())
+
+
+def _first_difference(old: List[Tuple[date, date]], new: List[Tuple[date, date]]) -> Optional[date]:
+    """
+    Earliest day blocked by exactly one of two merged interval lists
+
+    Merged intervals are disjoint and never adjacent, so the lists can be
+    walked pairwise: the first pair that differs gives the answer without
+    expanding any range into days.
+    """
+    for (old_start, old_end), (new_start, new_end) in zip(old, new):
+        if old_start != new_start:
+            return min(old_start, new_start)
+        if old_end != new_end:
+            return min(old_end, new_end) + timedelta(days=1)
+    if len(old) != len(new):
+        return (old if len(old) > len(new) else new)[min(len(old), len(new))][0]
+    return None
+
+
+def first_changed_date(old_start: Optional[date], new_start: date,
+                       old_hours: Optional[float], new_hours: float,
+                       old_unavailable: List[date] = None,
+                       new_unavailable: List[date] = None) -> date:
+    """
+    Earliest date from which a schedule edit can move due dates
+
+    A new hours-per-day value re-sizes every topic, so everything from the
+    start is affected; a moved start affects everything from the earlier of
+    the two starts; added or removed unavailable dates affect everything
+    from the first such date on. Unavailable dates may be lists of dates or
+    DateIntervalIndexes, which are compared interval by interval.
+
+    Returns:
+        The first affected date (date.max if the edit changes nothing)
+    """
+    if old_start is None or old_hours is None or old_hours != new_hours:
+        return date.min
+
+    changed = date.max
+    if old_start != new_start:
+        changed = min(old_start, new_start)
+
+    toggled = _first_difference(_as_intervals(old_unavailable), _as_intervals(new_unavailable))
+    if toggled is not None:
+        changed = min(changed, toggled)
+    return changed
+
+
+def reschedule_diff(topics: List, new_start_date: date, new_hours_per_day: float,
+                    unavailable_dates: List[date] = None,
+                    weekly_pattern: Dict[int, bool] = None,
+                    skip_weekends: bool = False,
+                    skip_weekdays: List[int] = None,
+                    changed_from: date = date.min) -> List[Tuple[int, Optional[str], str]]:
+    """
+    Reschedule incomplete topics and return only the due dates that change
+
+    Gives the same dates as reschedule_incomplete_topics. Incomplete topics
+    due before `changed_from` (see first_changed_date) are checked in place:
+    a topic keeps its date if that date is exactly where the new schedule
+    puts it, which is one calendar lookup and no date formatting. From the
+    first topic that fails the check, the rest of the plan is recomputed.
+
+    Args:
+        topics: Topic dicts (or Topics) in day order, with 'id', 'due_date',
+            'estimated_hours' and 'is_completed'
+        new_start_date, new_hours_per_day, unavailable_dates, weekly_pattern,
+        skip_weekends, skip_weekdays: The new schedule settings
+        changed_from: First date the edit can affect
+
+    Returns:
+        List of (topic_id, old_due_date, new_due_date) for moved topics
+    """
+    calendar = AvailabilityCalendar(new_start_date, unavailable_dates, weekly_pattern,
+                                    skip_weekends, skip_weekdays)
+    start_iso = new_start_date.isoformat()
+    changed_iso = changed_from.isoformat() if changed_from != date.min else start_iso
+
+    diff = []
+    position = 0
+    in_prefix = True
+
+    for topic in topics:
+        if topic.get('is_completed', False):
+            continue
+
+        position += max(1, round(topic.get('estimated_hours', 2.0) / new_hours_per_day))
+        old_due = topic.get('due_date')
+
+        if in_prefix:
+            if old_due and start_iso <= old_due < changed_iso:
+                try:
+                    if calendar.index_of(date.fromisoformat(old_due)) == position - 1:
+                        continue
+                except ValueError:
+                    pass
+            in_prefix = False
+
+        new_due = calendar.nth_available(position - 1).isoformat()
+        if new_due != old_due:
+            diff.append((topic.get('id'), old_due, new_due))
+
+    return diff
+
+
 def get_days_until(due_date_str: str) -> Optional[int]:
     """
     Get number of days until due date
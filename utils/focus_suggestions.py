@@ -0,0 +1,240 @@
+"""
+Precomputed focus-area suggestions for LearnPath AI
+Batch-generates AI focus areas for every (template, proficiency) pair and serves them at runtime
+
+Run the batch job with:
+    python -m utils.focus_suggestions [--workers 4] [--force]
+
+It writes focus_suggestions.json in the project root, which is deployed with
+the app (see DEPLOYMENT.md). Without the file, or for templates edited since
+it was generated, suggestions come from the live AI call.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .templates import GoalTemplate, get_all_templates
+
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_ARTIFACT_PATH = os.path.join(_PROJECT_ROOT, "focus_suggestions.json")
+
+# Bump when the artifact layout or the suggestion prompt changes; older
+# artifacts are then ignored and every pair falls back to the live call
+ARTIFACT_VERSION = 1
+
+PROFICIENCY_LEVELS = ["Beginner", "Intermediate", "Expert"]
+
+_MAX_AGE_DAYS = float(os.getenv("FOCUS_SUGGESTIONS_MAX_AGE_DAYS", "90"))
+
+
+def _entry_key(template_name: str, proficiency: str) -> str:
+    return f"{template_name}|{proficiency}"
+
+
+def template_fingerprint(template: Dict, proficiency: str) -> str:
+    """
+    Hash of everything the suggestion depends on
+
+    An entry whose fingerprint no longer matches (the template was edited)
+    is treated as stale.
+    """
+    payload = json.dumps([ARTIFACT_VERSION, template, proficiency], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class FocusSuggestionStore:
+    """
+    Read side of the precomputed artifact
+
+    The JSON file is loaded once and reloaded only when its mtime changes,
+    so lookups after the first are dictionary reads.
+    """
+
+    def __init__(self, path: str = _ARTIFACT_PATH, max_age_days: float = _MAX_AGE_DAYS):
+        self.path = path
+        self.max_age_seconds = max_age_days * 86400
+        self._entries = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'stale': 0}
+
+    def _load(self):
+        """(Re)load the artifact if it changed on disk"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            self._entries, self._mtime = {}, None
+            return
+        if mtime == self._mtime:
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                artifact = json.load(f)
+        except (OSError, ValueError):
+            artifact = {}
+
+        if artifact.get("version") == ARTIFACT_VERSION:
+            self._entries = artifact.get("entries", {})
+        else:
+            self._entries = {}
+        self._mtime = mtime
+
+    def lookup(self, template: Dict, proficiency: str) -> Optional[List[str]]:
+        """Get fresh precomputed suggestions, or None if missing or stale"""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(_entry_key(template.get('name', ''), proficiency))
+
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            too_old = time.time() - entry.get("generated_at", 0) > self.max_age_seconds
+            if too_old or entry.get("fingerprint") != template_fingerprint(template, proficiency):
+                self._stats['stale'] += 1
+                return None
+
+            self._stats['hits'] += 1
+            return list(entry["suggestions"])
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        return stats
+
+
+_store = FocusSuggestionStore()
+
+
+def get_focus_suggestions(ai_client, template: GoalTemplate, proficiency: str) -> List[str]:
+    """
+    Get focus-area suggestions for a template, precomputed when possible
+
+    Args:
+        ai_client: ClaudeAI instance used when the pair is missing or stale
+        template: The selected goal template
+        proficiency: Beginner, Intermediate or Expert
+
+    Returns:
+        List of focus areas
+    """
+    template_dict = template.to_dict()
+    suggestions = _store.lookup(template_dict, proficiency)
+    if suggestions is not None:
+        return suggestions
+    return ai_client.get_ai_suggestions_for_focus_areas(template_dict, proficiency)
+
+
+def get_focus_suggestion_stats() -> Dict:
+    """Get hit/miss/stale counters for precomputed suggestions"""
+    return _store.get_stats()
+
+
+def _write_artifact(path: str, entries: Dict, model: str):
+    """Write the artifact atomically so readers never see a partial file"""
+    artifact = {
+        "version": ARTIFACT_VERSION,
+        "model": model,
+        "generated_at": datetime.now().isoformat(timespec="seconds"),
+        "entries": entries
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(artifact, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def precompute_focus_suggestions(ai_client=None, templates: List[GoalTemplate] = None,
+                                 levels: List[str] = None, max_workers: int = 4,
+                                 path: str = _ARTIFACT_PATH, force: bool = False,
+                                 checkpoint_every: int = 25) -> Dict:
+    """
+    Generate suggestions for every (template, proficiency) pair
+
+    Existing fresh entries are kept unless force is set, so an interrupted
+    run can simply be restarted. Progress is checkpointed to disk every
+    `checkpoint_every` completed pairs.
+
+    Args:
+        ai_client: ClaudeAI instance (created from the environment if omitted)
+        templates: Templates to cover (default: all)
+        levels: Proficiency levels to cover (default: PROFICIENCY_LEVELS)
+        max_workers: Maximum concurrent API calls
+        path: Artifact path
+        force: Regenerate entries that are still fresh
+        checkpoint_every: Completed pairs between intermediate writes
+
+    Returns:
+        Dictionary with generated, skipped, failed and total counts
+    """
+    if ai_client is None:
+        from .ai_helpers import ClaudeAI
+        ai_client = ClaudeAI()
+    templates = templates if templates is not None else get_all_templates()
+    levels = levels or PROFICIENCY_LEVELS
+
+    store = FocusSuggestionStore(path)
+    store._load()
+    entries = {} if force else dict(store._entries)
+
+    jobs = []
+    for template in templates:
+        template_dict = template.to_dict()
+        for proficiency in levels:
+            if not force and store.lookup(template_dict, proficiency) is not None:
+                continue
+            jobs.append((template_dict, proficiency))
+
+    stats = {'total': len(templates) * len(levels), 'generated': 0,
+             'skipped': len(templates) * len(levels) - len(jobs), 'failed': 0, 'errors': []}
+
+    def run(template_dict: Dict, proficiency: str) -> List[str]:
+        return ai_client.request_focus_area_suggestions(template_dict, proficiency)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {executor.submit(run, t, p): (t, p) for t, p in jobs}
+        for done_count, future in enumerate(as_completed(futures), start=1):
+            template_dict, proficiency = futures[future]
+            try:
+                suggestions = future.result()
+            except Exception as e:
+                stats['failed'] += 1
+                stats['errors'].append(f"{template_dict['name']} ({proficiency}): {e}")
+                continue
+
+            entries[_entry_key(template_dict['name'], proficiency)] = {
+                "fingerprint": template_fingerprint(template_dict, proficiency),
+                "generated_at": time.time(),
+                "suggestions": [str(s) for s in suggestions]
+            }
+            stats['generated'] += 1
+
+            if done_count % checkpoint_every == 0:
+                _write_artifact(path, entries, ai_client.model)
+
+    _write_artifact(path, entries, ai_client.model)
+    return stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute focus-area suggestions for all goal templates")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum concurrent API calls")
+    parser.add_argument("--force", action="store_true", help="Regenerate entries that are still fresh")
+    parser.add_argument("--output", default=_ARTIFACT_PATH, help="Artifact path")
+    args = parser.parse_args()
+
+    result = precompute_focus_suggestions(max_workers=args.workers, path=args.output, force=args.force)
+    print(f"Generated {result['generated']}, kept {result['skipped']}, failed {result['failed']} "
+          f"of {result['total']} pairs -> {args.output}")
+    for error in result['errors']:
+        print(f"  ! {error}")
@@ -0,0 +1,324 @@
+"""
+Schema migrations for LearnPath AI
+Versioned SQLite schema changes, tracked with PRAGMA user_version
+"""
+
+import json
+import sqlite3
+from datetime import date, timedelta
+from typing import Callable, List, Optional, Tuple
+
+
+def _get_columns(cursor: sqlite3.Cursor, table: str) -> set:
+    """Get the column names of a table"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _add_columns_if_missing(cursor: sqlite3.Cursor, table: str, columns: List[Tuple[str, str]]):
+    """Add (name, definition) columns that the table doesn't have yet"""
+    existing = _get_columns(cursor, table)
+    for name, definition in columns:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+def _create_base_tables(cursor: sqlite3.Cursor):
+    """Create all tables if they don't exist"""
+    # Learning Paths table (now supports all goal types)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS learning_paths (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            goal TEXT NOT NULL,
+            timeframe INTEGER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            is_active BOOLEAN DEFAULT 1,
+            status TEXT DEFAULT 'active',
+            goal_type TEXT DEFAULT 'learning',
+            start_date DATE,
+            hours_per_day REAL DEFAULT 2.0,
+            unavailable_dates TEXT,
+            weekly_pattern TEXT
+        )
+    """)
+
+    # Topics table (now with priority, due dates, and notes)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS topics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path_id INTEGER NOT NULL,
+            day_number INTEGER NOT NULL,
+            topic_name TEXT NOT NULL,
+            subtopics TEXT,
+            estimated_hours REAL,
+            resources TEXT,
+            is_completed BOOLEAN DEFAULT 0,
+            completed_at TIMESTAMP,
+            time_spent_minutes INTEGER DEFAULT 0,
+            priority TEXT DEFAULT 'medium',
+            due_date DATE,
+            notes TEXT,
+            actual_hours REAL DEFAULT 0,
+            resource_links TEXT,
+            FOREIGN KEY (path_id) REFERENCES learning_paths(id)
+        )
+    """)
+
+    # Time tracking sessions table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS time_sessions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            topic_id INTEGER NOT NULL,
+            path_id INTEGER NOT NULL,
+            start_time TIMESTAMP,
+            end_time TIMESTAMP,
+            duration_minutes INTEGER,
+            session_date DATE,
+            notes TEXT,
+            FOREIGN KEY (topic_id) REFERENCES topics(id),
+            FOREIGN KEY (path_id) REFERENCES learning_paths(id)
+        )
+    """)
+
+    # AI coaching reviews table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS coaching_reviews (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path_id INTEGER NOT NULL,
+            review_text TEXT NOT NULL,
+            performance_summary TEXT,
+            insights TEXT,
+            recommendations TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (path_id) REFERENCES learning_paths(id)
+        )
+    """)
+
+    # AI coaching chat history table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS coaching_chats (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path_id INTEGER NOT NULL,
+            message TEXT NOT NULL,
+            role TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (path_id) REFERENCES learning_paths(id)
+        )
+    """)
+
+    # Progress tracking table
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS progress_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path_id INTEGER NOT NULL,
+            topic_id INTEGER NOT NULL,
+            action TEXT NOT NULL,
+            timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            notes TEXT,
+            FOREIGN KEY (path_id) REFERENCES learning_paths(id),
+            FOREIGN KEY (topic_id) REFERENCES topics(id)
+        )
+    """)
+
+
+def _add_legacy_columns(cursor: sqlite3.Cursor):
+    """Add columns introduced after the first release to older databases"""
+    _add_columns_if_missing(cursor, "learning_paths", [
+        ("status", "TEXT DEFAULT 'active'"),
+        ("goal_type", "TEXT DEFAULT 'learning'"),
+        ("start_date", "DATE"),
+        ("hours_per_day", "REAL DEFAULT 2.0"),
+        ("unavailable_dates", "TEXT"),
+        ("weekly_pattern", "TEXT"),
+    ])
+
+    _add_columns_if_missing(cursor, "topics", [
+        ("priority", "TEXT DEFAULT 'medium'"),
+        ("due_date", "DATE"),
+        ("notes", "TEXT"),
+        ("actual_hours", "REAL DEFAULT 0"),
+        ("resource_links", "TEXT"),
+    ])
+
+
+# Secondary indexes, keyed by name. Each one backs a per-path or per-topic
+# lookup in Database that would otherwise scan the whole table.
+INDEXES = {
+    "idx_topics_path_day": "topics(path_id, day_number)",
+    "idx_time_sessions_topic_date": "time_sessions(topic_id, session_date)",
+    "idx_coaching_chats_path_created": "coaching_chats(path_id, created_at)",
+    "idx_coaching_reviews_path_created": "coaching_reviews(path_id, created_at)",
+    "idx_progress_log_path_timestamp": "progress_log(path_id, timestamp)",
+    "idx_learning_paths_status_created": "learning_paths(status, created_at)",
+    "idx_learning_paths_status_updated": "learning_paths(status, updated_at)",
+}
+
+
+def _create_indexes(cursor: sqlite3.Cursor):
+    """Create the secondary indexes"""
+    for name, definition in INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition}")
+
+
+# Migration 4's conversions are frozen here rather than imported from
+# date_intervals, so later changes to the live storage helpers can't change
+# what this migration does to a database that hasn't run it yet.
+
+def _compact_unavailable_dates_v4(value: str) -> Optional[str]:
+    """
+    Rewrite a JSON list of days as merged single days and [start, end] ranges
+
+    Returns None when the value can't be read, so it is left as it is.
+    """
+    try:
+        items = json.loads(value)
+    except ValueError:
+        return None
+    if not isinstance(items, list):
+        return None
+
+    intervals = []
+    for item in items:
+        try:
+            if isinstance(item, str):
+                day = date.fromisoformat(item)
+                intervals.append((day, day))
+            elif isinstance(item, list) and len(item) == 2:
+                intervals.append((date.fromisoformat(item[0]), date.fromisoformat(item[1])))
+            else:
+                return None
+        except (TypeError, ValueError):
+            return None
+
+    merged = []
+    for start, end in sorted(i for i in intervals if i[0] <= i[1]):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return json.dumps([
+        start.isoformat() if start == end else [start.isoformat(), end.isoformat()]
+        for start, end in merged
+    ])
+
+
+def _compact_weekly_pattern_v4(value: str) -> Optional[str]:
+    """
+    Rewrite a JSON {"0": true, ...} weekly pattern as a seven-character mask
+
+    Returns None when the value can't be read, so it is left as it is.
+    """
+    if len(value) == 7 and set(value) <= {"0", "1"}:
+        return value
+    try:
+        pattern = json.loads(value)
+    except ValueError:
+        return None
+    if not isinstance(pattern, dict):
+        return None
+
+    available = {}
+    for key, flag in pattern.items():
+        try:
+            weekday = int(key)
+        except (TypeError, ValueError):
+            return None
+        if not 0 <= weekday <= 6:
+            return None
+        available[weekday] = bool(flag)
+    if not available:
+        return None
+    return "".join("1" if available.get(weekday, True) else "0" for weekday in range(7))
+
+
+def _compact_schedule_columns(cursor: sqlite3.Cursor):
+    """Rewrite unavailable_dates as intervals and weekly_pattern as a weekday mask"""
+    cursor.execute("""
+        SELECT id, unavailable_dates, weekly_pattern
+        FROM learning_paths
+        WHERE unavailable_dates IS NOT NULL OR weekly_pattern IS NOT NULL
+    """)
+    updates = []
+    for path_id, unavailable_dates, weekly_pattern in cursor.fetchall():
+        # Values that can't be read are kept exactly as stored
+        compact_dates = unavailable_dates
+        if unavailable_dates:
+            compact_dates = _compact_unavailable_dates_v4(unavailable_dates) or unavailable_dates
+        compact_pattern = weekly_pattern
+        if weekly_pattern:
+            compact_pattern = _compact_weekly_pattern_v4(weekly_pattern) or weekly_pattern
+        if compact_dates != unavailable_dates or compact_pattern != weekly_pattern:
+            updates.append((compact_dates, compact_pattern, path_id))
+
+    cursor.executemany("""
+        UPDATE learning_paths
+        SET unavailable_dates = ?, weekly_pattern = ?
+        WHERE id = ?
+    """, updates)
+
+
+# Ordered list of (version, description, apply function).
+# Append new migrations at the end with the next version number; never edit
+# or reorder a migration that has already shipped.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "Create base tables", _create_base_tables),
+    (2, "Add status, goal type, scheduling and time tracking columns", _add_legacy_columns),
+    (3, "Add secondary indexes for per-path and per-topic lookups", _create_indexes),
+    (4, "Store unavailable dates as intervals and weekly patterns as weekday masks", _compact_schedule_columns),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Get the schema version stored in the database header"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> List[int]:
+    """
+    Apply any migrations the database hasn't seen yet
+
+    All pending migrations run in a single transaction together with the
+    user_version bump, so a failure leaves the schema untouched. An
+    up-to-date database costs a single pragma read.
+
+    Args:
+        conn: Open SQLite connection
+
+    Returns:
+        List of migration versions that were applied
+    """
+    if get_schema_version(conn) >= SCHEMA_VERSION:
+        return []
+
+    previous_isolation = conn.isolation_level
+    conn.isolation_level = None  # Manage the transaction explicitly
+    cursor = conn.cursor()
+    applied = []
+
+    try:
+        # IMMEDIATE takes the write lock up front; re-read the version under it
+        # in case another process migrated while we were waiting
+        cursor.execute("BEGIN IMMEDIATE")
+        current_version = get_schema_version(conn)
+
+        for version, _description, apply in MIGRATIONS:
+            if version <= current_version:
+                continue
+            apply(cursor)
+            applied.append(version)
+
+        if applied:
+            cursor.execute(f"PRAGMA user_version = {int(applied[-1])}")
+        cursor.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+    finally:
+        conn.isolation_level = previous_isolation
+
+    return applied
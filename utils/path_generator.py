@@ -3,31 +3,52 @@ Learning Path Generator
 Combines AI generation with database storage and retrieval
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from datetime import datetime
-import json
+import threading
 from .ai_helpers import ClaudeAI
-from .ai_providers import AIProviderManager
+from .ai_providers import AIProviderManager, reset_default_manager
+from .client_pool import shutdown_clients
 from .database import Database
+from .plan_models import Plan, PlanValidationError, Topic, get_schema
+from .routing import HedgedRouter
+from .date_intervals import DateIntervalIndex
 from .date_scheduler import (
-    parse_unavailable_dates,
+    parse_unavailable_intervals,
     calculate_calendar_dates,
     format_date_display,
     get_date_status
 )
 
 
+# Process-wide generator shared by every Streamlit session. Streamlit reruns the
+# whole script on each interaction, so building the AI clients and opening the
+# database per rerun is wasted work. Per-session data stays in st.session_state.
+_shared_generator = None
+_shared_generator_key = None
+_shared_generator_lock = threading.Lock()
+
+# Claude model that answers assistant questions when the chosen provider fails
+_FALLBACK_MODEL = "Claude Sonnet 4.5"
+
+
 class LearningPathGenerator:
     def __init__(self, api_key: str = None):
         """Initialize the learning path generator"""
         self.ai = ClaudeAI(api_key=api_key)  # Keep for backward compatibility
         self.ai_manager = AIProviderManager()  # New multi-model manager
+        self.router = HedgedRouter(self.ai_manager)  # Latency-aware routing with hedging
         self.db = Database()
 
     def get_ai_client(self) -> ClaudeAI:
         """Returns the underlying AI client."""
         return self.ai
 
+    def close(self):
+        """Release resources held by the generator (hedging threads, pooled DB connections)"""
+        self.router.close()
+        self.db.close()
+
     def create_learning_path(self, goal: str, timeframe: int, goal_type: str = 'learning',
                            start_date: str = None, hours_per_day: float = 2.0,
                            unavailable_dates_input: str = None,
@@ -49,24 +70,20 @@ class LearningPathGenerator:
         Returns:
             Dictionary containing the goal plan with path_id
         """
-        # Generate goal plan using AI
+        # Generate goal plan using AI and validate it before anything is stored
         learning_path = self.ai.generate_learning_path(goal, timeframe, goal_type, hours_per_day)
+        plan = Plan.from_ai(learning_path, goal_type, hours_per_day)
 
-        # Parse unavailable dates
-        unavailable_dates = []
-        if unavailable_dates_input:
-            unavailable_dates = parse_unavailable_dates(unavailable_dates_input)
-
-        # Calculate calendar dates for curriculum
-        curriculum = learning_path.get('curriculum', [])
+        # Parse unavailable dates into intervals
+        unavailable_dates = DateIntervalIndex(parse_unavailable_intervals(unavailable_dates_input))
 
         if start_date:
             start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
 
-            # Calculate calendar dates for all topics
-            curriculum_with_dates = calculate_calendar_dates(
+            # Sets due_date on each Topic in place
+            calculate_calendar_dates(
                 start_date_obj,
-                curriculum,
+                plan.topics,
                 hours_per_day,
                 unavailable_dates,
                 weekly_pattern=None,
@@ -74,32 +91,135 @@ class LearningPathGenerator:
                 skip_weekdays=skip_weekdays
             )
 
-            learning_path['curriculum'] = curriculum_with_dates
+        # Stored as compact intervals
+        unavailable_dates_json = unavailable_dates.to_json()
 
-        # Convert unavailable_dates list to JSON for storage
-        unavailable_dates_json = None
-        if unavailable_dates:
-            unavailable_dates_json = json.dumps([d.strftime('%Y-%m-%d') for d in unavailable_dates])
-
-        # Save to database
-        path_id = self.db.save_learning_path(
+        # Save the goal and its action items/milestones atomically
+        path_id, _topic_ids = self.db.save_path_with_topics(
             goal,
             timeframe,
+            plan.topics,
             goal_type,
             start_date=start_date,
             hours_per_day=hours_per_day,
             unavailable_dates=unavailable_dates_json
         )
 
-        # Save action items/milestones with due dates
-        self.db.save_topics(path_id, learning_path.get('curriculum', []))
-
         # Add path_id and goal_type to the response
+        learning_path = plan.to_dict()
         learning_path['path_id'] = path_id
         learning_path['goal_type'] = goal_type
 
         return learning_path
 
+    def create_learning_path_stream(self, goal: str, timeframe: int, goal_type: str = 'learning',
+                                    start_date: str = None, hours_per_day: float = 2.0,
+                                    unavailable_dates_input: str = None,
+                                    skip_weekends: bool = False,
+                                    skip_weekdays: List[int] = None) -> Iterator[Dict]:
+        """
+        Create a goal plan, saving each day as soon as the AI finishes writing it
+
+        Takes the same arguments as create_learning_path. The path row is
+        created first and topics are appended as they arrive, so the plan can
+        be shown while later days are still generating. If generation stops
+        part-way, every completed day stays saved; if it produced nothing, the
+        empty path is removed.
+
+        Yields:
+            {'type': 'days', 'path_id', 'topics', 'saved'} for each batch of
+            completed days, then {'type': 'done', 'path_id', 'plan'} where
+            plan has the same shape as create_learning_path's result, plus
+            'truncated': True if generation stopped early
+        """
+        unavailable_dates = DateIntervalIndex(parse_unavailable_intervals(unavailable_dates_input))
+        unavailable_dates_json = unavailable_dates.to_json()
+
+        start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date() if start_date else None
+
+        path_id = self.db.save_learning_path(goal, timeframe, goal_type, start_date=start_date,
+                                             hours_per_day=hours_per_day,
+                                             unavailable_dates=unavailable_dates_json)
+
+        received = {}     # day -> Topic
+        topic_ids = {}    # day -> topic_id
+        saved_dates = {}  # day -> due_date as written
+        scheduled = []
+        default_hours = hours_per_day * 7 if goal_type == 'freelance' else hours_per_day
+
+        def schedule() -> List[Topic]:
+            ordered = [received[day] for day in sorted(received)]
+            if start_date_obj:
+                calculate_calendar_dates(start_date_obj, ordered, hours_per_day, unavailable_dates,
+                                         weekly_pattern=None, skip_weekends=skip_weekends,
+                                         skip_weekdays=skip_weekdays)
+            return ordered
+
+        plan = None
+        truncated = False
+        try:
+            for kind, payload in self.ai.stream_learning_path(goal, timeframe, goal_type, hours_per_day):
+                if kind == 'plan':
+                    plan = payload
+                    continue
+
+                new_days = []
+                for entry in payload:
+                    if isinstance(entry, dict):
+                        try:
+                            int(entry.get('day', entry.get('week')))  # "3" and 3.0 are fine too
+                        except (TypeError, ValueError):
+                            # No usable day number: number it by arrival order
+                            entry = {**entry, 'day': len(received) + 1}
+                    try:
+                        topic = Topic.from_ai(entry, goal_type, default_hours)
+                    except PlanValidationError:
+                        continue  # Malformed entries never reach the database
+                    if topic.day not in received:
+                        received[topic.day] = topic
+                        new_days.append(topic.day)
+                if not new_days:
+                    continue
+
+                # Batches can arrive out of day order, which shifts later due dates
+                scheduled = schedule()
+                new_topics = [received[day] for day in sorted(new_days)]
+
+                ids = self.db.save_topics(path_id, new_topics)
+                for topic, topic_id in zip(new_topics, ids):
+                    topic_ids[topic.day] = topic_id
+                    saved_dates[topic.day] = topic.due_date
+
+                moved = {
+                    day: topic.due_date
+                    for day, topic in received.items()
+                    if day in saved_dates and topic.due_date != saved_dates[day]
+                }
+                if moved:
+                    self.db.bulk_update_due_dates(path_id, [(topic_ids[day], due) for day, due in moved.items()])
+                    saved_dates.update(moved)
+
+                yield {'type': 'days', 'path_id': path_id, 'topics': [t.to_dict(goal_type) for t in new_topics],
+                       'saved': len(received)}
+        except Exception:
+            if not received:
+                self.db.delete_learning_path(path_id)
+                raise
+            truncated = True
+
+        if plan is None:
+            truncated = True
+            plan = {}
+
+        list_key = get_schema(goal_type)[0]
+        plan[list_key] = [topic.to_dict(goal_type) for topic in (scheduled or schedule())]
+        plan['path_id'] = path_id
+        plan['goal_type'] = goal_type
+        if truncated:
+            plan['truncated'] = True
+
+        yield {'type': 'done', 'path_id': path_id, 'plan': plan}
+
     def save_plan_from_template(self, plan: Dict, goal_name: str, timeframe: int, goal_type: str = 'learning',
                                 start_date: str = None, hours_per_day: float = 2.0,
                                 unavailable_dates_input: str = None, skip_weekends: bool = False,
@@ -122,30 +242,15 @@ class LearningPathGenerator:
             path_id: The ID of the saved learning path
         """
         # Parse unavailable dates if provided
-        unavailable_dates = []
-        unavailable_dates_json = None
-        if unavailable_dates_input and unavailable_dates_input.strip():
-            from utils.date_scheduler import parse_unavailable_dates
-            unavailable_dates = parse_unavailable_dates(unavailable_dates_input)
-            if unavailable_dates:
-                unavailable_dates_json = json.dumps([d.strftime('%Y-%m-%d') for d in unavailable_dates])
-        
-        # Save learning path to database
-        path_id = self.db.save_learning_path(
-            goal=goal_name,
-            timeframe=timeframe,
-            goal_type=goal_type,
-            start_date=start_date,
-            hours_per_day=hours_per_day,
-            unavailable_dates=unavailable_dates_json,
-            weekly_pattern=None
-        )
+        unavailable_dates = DateIntervalIndex(parse_unavailable_intervals(unavailable_dates_input))
+        unavailable_dates_json = unavailable_dates.to_json()
         
-        # Calculate calendar dates if start_date provided
-        curriculum = plan.get('curriculum', [])
+        # Validate before anything is stored (template plans always use the
+        # curriculum schema); dates are set on the Topics in place
+        curriculum = Plan.from_ai(plan, 'learning', hours_per_day).topics
         if start_date:
             start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-            curriculum_with_dates = calculate_calendar_dates(
+            calculate_calendar_dates(
                 start_date_obj,
                 curriculum,
                 hours_per_day,
@@ -154,10 +259,18 @@ class LearningPathGenerator:
                 skip_weekends=skip_weekends,
                 skip_weekdays=skip_weekdays
             )
-            curriculum = curriculum_with_dates
-        
-        # Save topics/curriculum
-        self.db.save_topics(path_id, curriculum)
+
+        # Save learning path and topics/curriculum atomically
+        path_id, _topic_ids = self.db.save_path_with_topics(
+            goal=goal_name,
+            timeframe=timeframe,
+            topics=curriculum,
+            goal_type=goal_type,
+            start_date=start_date,
+            hours_per_day=hours_per_day,
+            unavailable_dates=unavailable_dates_json,
+            weekly_pattern=None
+        )
         
         return path_id
 
@@ -171,23 +284,7 @@ class LearningPathGenerator:
         Returns:
             Complete learning path with topics and progress
         """
-        paths = self.db.get_learning_paths(active_only=False)
-        path = next((p for p in paths if p['id'] == path_id), None)
-
-        if not path:
-            return None
-
-        # Get topics
-        topics = self.db.get_topics(path_id)
-
-        # Get progress stats
-        stats = self.db.get_progress_stats(path_id)
-
-        return {
-            'path_info': path,
-            'curriculum': topics,
-            'stats': stats
-        }
+        return self.db.get_path_bundle(path_id)
 
     def get_all_paths(self, active_only: bool = True) -> List[Dict]:
         """Get all learning paths"""
@@ -258,7 +355,20 @@ class LearningPathGenerator:
         """
         return self.db.get_paths_by_status(status)
 
-    def get_assistance(self, question: str, context: str = "", model_selection: str = "Claude Sonnet 4.5") -> str:
+    def get_paths_with_stats(self, status: str = None) -> List[Dict]:
+        """
+        Get learning paths filtered by status, each with its progress stats
+
+        Args:
+            status: Filter by status (None for all paths)
+
+        Returns:
+            List of learning paths with a 'stats' dict
+        """
+        return self.db.get_paths_with_stats(status)
+
+    def get_assistance(self, question: str, context: str = "", model_selection: str = "Claude Sonnet 4.5",
+                       answered_by: Dict = None) -> str:
         """
         Get AI assistance for learning questions
 
@@ -266,6 +376,9 @@ class LearningPathGenerator:
             question: The user's question
             context: Learning context
             model_selection: Full model selection (e.g., "Claude / Claude Sonnet 4.5" or "Claude Sonnet 4.5" for backward compat)
+            answered_by: Optional dict; 'model' is set to the "Provider / Model"
+                         that answered, which differs from model_selection when
+                         a hedge or the Claude fallback answered
 
         Returns:
             AI response
@@ -287,23 +400,85 @@ class LearningPathGenerator:
         system_prompt = "You are a helpful learning assistant. Provide clear, concise explanations that help users understand concepts."
 
         try:
-            response = self.ai_manager.generate_text(
+            # Routed call: hedges to a second model if this one is slow or failing
+            response = self.router.generate_text(
                 provider_name=provider_name,
                 model_name=model_name,
                 prompt=full_prompt,
                 system_prompt=system_prompt
             )
-            return response
+            if answered_by is not None:
+                answered_by['model'] = f"{response.provider} / {response.model}"
+            return response.text
         except Exception as e:
             # Fallback to Claude if configured
             if provider_name != "Claude":
                 try:
-                    self.ai.set_model(model_name if model_name.startswith("Claude") else "Claude Sonnet 4.5")
-                    return self.ai.get_learning_assistance(question, context)
+                    # Model is passed per call: self.ai is shared by every session
+                    response = self.ai.get_learning_assistance(question, context, model_name=_FALLBACK_MODEL)
+                    if answered_by is not None:
+                        answered_by['model'] = f"Claude / {_FALLBACK_MODEL}"
+                    return response
                 except:
                     pass
             raise e
 
+    def stream_assistance(self, question: str, context: str = "",
+                          model_selection: str = "Claude Sonnet 4.5",
+                          answered_by: Dict = None) -> Iterator[str]:
+        """
+        Stream AI assistance for learning questions, piece by piece
+
+        Same arguments and fallback behaviour as get_assistance, but yields
+        text as the model produces it (suitable for st.write_stream).
+        answered_by is filled in once the first text arrives.
+        """
+        # Parse model selection
+        if " / " in model_selection:
+            provider_name, model_name = model_selection.split(" / ", 1)
+        else:
+            # Backward compatibility - assume Claude
+            provider_name = "Claude"
+            model_name = model_selection
+
+        # Build the full prompt
+        if context:
+            full_prompt = f"{context}\n\nQuestion: {question}"
+        else:
+            full_prompt = question
+
+        system_prompt = "You are a helpful learning assistant. Provide clear, concise explanations that help users understand concepts."
+
+        started = False
+        try:
+            # Routed stream: hedges to a second model if the first chunk is slow
+            for chunk in self.router.stream_text(
+                provider_name=provider_name,
+                model_name=model_name,
+                prompt=full_prompt,
+                system_prompt=system_prompt
+            ):
+                if chunk.text:
+                    if not started and answered_by is not None:
+                        answered_by['model'] = f"{chunk.provider} / {chunk.model}"
+                    started = True
+                    yield chunk.text
+        except Exception as e:
+            # Fall back to Claude only if nothing has been shown yet
+            if started or provider_name == "Claude":
+                raise
+            try:
+                fallback = self.ai.get_learning_assistance(question, context, model_name=_FALLBACK_MODEL)
+            except Exception:
+                raise e
+            if answered_by is not None:
+                answered_by['model'] = f"Claude / {_FALLBACK_MODEL}"
+            yield fallback
+
+    def get_routing_metrics(self) -> Dict:
+        """Get per-model latency/error stats and hedge counters for the assistant"""
+        return self.router.get_metrics()
+
     def get_available_models(self) -> Dict:
         """Get all available AI models"""
         return self.ai_manager.get_available_models()
@@ -341,3 +516,62 @@ class LearningPathGenerator:
     def find_resources(self, topic: str, resource_types: List[str] = None) -> List[Dict]:
         """Find learning resources for a topic"""
         return self.ai.find_resources(topic, resource_types)
+
+
+def get_shared_generator(api_key: str = None) -> LearningPathGenerator:
+    """
+    Get the process-wide LearningPathGenerator, creating it on first use
+
+    Args:
+        api_key: Optional Anthropic API key. If it differs from the key the
+                 shared generator was built with, the generator is rebuilt
+                 and the previous one released as in reset_shared_generator().
+
+    Returns:
+        The shared LearningPathGenerator instance
+    """
+    global _shared_generator, _shared_generator_key
+
+    generator = _shared_generator
+    if generator is not None and _shared_generator_key == api_key:
+        return generator
+
+    previous = None
+    with _shared_generator_lock:
+        # Re-check under the lock in case another session built it meanwhile
+        if _shared_generator is None or _shared_generator_key != api_key:
+            previous = _shared_generator
+            _shared_generator = LearningPathGenerator(api_key=api_key)
+            _shared_generator_key = api_key
+        generator = _shared_generator
+
+    if previous is not None:
+        _release_generator(previous)
+    return generator
+
+
+def reset_shared_generator():
+    """
+    Drop the process-wide LearningPathGenerator
+
+    The next call to get_shared_generator() builds a fresh instance, picking
+    up changed API keys or database settings. Pooled AI SDK clients and the
+    provider manager behind get_available_providers() are dropped as well.
+    """
+    global _shared_generator, _shared_generator_key
+
+    with _shared_generator_lock:
+        generator = _shared_generator
+        _shared_generator = None
+        _shared_generator_key = None
+
+    _release_generator(generator)
+
+
+def _release_generator(generator: Optional[LearningPathGenerator]):
+    """Close a generator that is no longer shared, and the clients built for it"""
+    if generator is not None:
+        # Writes its queued resource link edits and stops its timer and threads
+        generator.close()
+    shutdown_clients()
+    reset_default_manager()
@@ -0,0 +1,342 @@
+"""
+Plan models for LearnPath AI
+Compact, validated Plan/Topic/Resource objects for AI output and database rows
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+
+class PlanValidationError(ValueError):
+    """Raised when AI output can't be turned into a usable plan"""
+
+
+PRIORITIES = ("high", "medium", "low")
+
+# Per goal type: (entry list key, summary list key, title field, item list
+# fields, note field). The first item list field becomes Topic.subtopics;
+# any others (learning_objectives) are cleaned and kept under their own name
+# in Topic.extra, along with entry fields not mapped here.
+GOAL_SCHEMAS = {
+    'learning': ('curriculum', 'milestones', 'topic', ('subtopics', 'learning_objectives'), None),
+    'career': ('schedule', 'phases', 'focus', ('action_items',), 'deliverable'),
+    'freelance': ('weekly_focus', 'revenue_milestones', 'theme', ('tasks',), 'goal'),
+    'project': ('timeline', 'deliverables', 'task', ('sub_tasks',), None),
+    'personal': ('daily_plan', 'key_habits', 'focus_habit', ('actions',), 'mindset_tip'),
+}
+
+
+def get_schema(goal_type: str) -> Tuple:
+    """Schema tuple for a goal type (unknown types use the learning schema)"""
+    return GOAL_SCHEMAS.get(goal_type, GOAL_SCHEMAS['learning'])
+
+
+def _as_text(value) -> str:
+    if value is None:
+        return ""
+    return value.strip() if isinstance(value, str) else str(value).strip()
+
+
+def _as_text_list(value) -> List[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    return [text for text in (_as_text(v) for v in value if not isinstance(v, (dict, list))) if text]
+
+
+class Resource:
+    """A learning resource attached to a topic"""
+
+    __slots__ = ("type", "name", "url", "description")
+
+    def __init__(self, type: str = "", name: str = "", url: str = "", description: str = ""):
+        self.type = type
+        self.name = name
+        self.url = url
+        self.description = description
+
+    @classmethod
+    def from_dict(cls, data) -> Optional["Resource"]:
+        """Build a Resource, or None if data has neither a name nor a URL"""
+        if isinstance(data, str):
+            data = {"name": data}
+        if not isinstance(data, dict):
+            return None
+        name = _as_text(data.get("name") or data.get("title"))
+        url = _as_text(data.get("url"))
+        if not name and not url:
+            return None
+        return cls(_as_text(data.get("type")), name or url, url, _as_text(data.get("description")))
+
+    def to_dict(self) -> Dict:
+        data = {"type": self.type, "name": self.name, "url": self.url}
+        if self.description:
+            data["description"] = self.description
+        return data
+
+
+class Topic:
+    """
+    One plan entry (a day, or a week for freelance plans)
+
+    Built from AI output with from_ai() or from a topics row with from_row().
+    Fields that only exist once saved (id, completion, time tracking) stay
+    None for topics that haven't been stored yet.
+    """
+
+    __slots__ = ("day", "topic", "subtopics", "estimated_hours", "priority", "resources",
+                 "due_date", "notes", "extra", "id", "is_completed", "completed_at",
+                 "time_spent_minutes", "actual_hours", "resource_links")
+
+    def __init__(self, day: int, topic: str, subtopics: List[str] = None,
+                 estimated_hours: float = None, priority: str = "medium",
+                 resources: List = None, due_date: str = None, notes: str = "",
+                 extra: Dict = None):
+        self.day = day
+        self.topic = topic
+        self.subtopics = subtopics or []
+        self.estimated_hours = estimated_hours
+        self.priority = priority
+        self.resources = resources or []
+        self.due_date = due_date
+        self.notes = notes
+        self.extra = extra
+        self.id = None
+        self.is_completed = None
+        self.completed_at = None
+        self.time_spent_minutes = None
+        self.actual_hours = None
+        self.resource_links = None
+
+    @classmethod
+    def from_ai(cls, data: Dict, goal_type: str = 'learning', default_hours: float = None) -> "Topic":
+        """
+        Validate one AI-generated entry and build a Topic
+
+        Args:
+            data: Entry dict from the goal type's list (curriculum, schedule, ...)
+            goal_type: Which schema the entry follows
+            default_hours: estimated_hours when the entry has none (or a bad value)
+
+        Raises:
+            PlanValidationError: If the entry isn't an object, has no usable
+                day/week number, or has no title
+        """
+        if not isinstance(data, dict):
+            raise PlanValidationError(f"Entry is not an object: {data!r:.60}")
+
+        _list_key, _summary_key, title_field, item_fields, note_field = get_schema(goal_type)
+
+        try:
+            day = int(data.get("day", data.get("week")))
+        except (TypeError, ValueError):
+            raise PlanValidationError(f"Entry has no valid day number: {data!r:.60}") from None
+        if day < 1:
+            raise PlanValidationError(f"Day number must be positive, got {day}")
+
+        title = _as_text(data.get(title_field) or data.get("topic"))
+        if not title:
+            raise PlanValidationError(f"Day {day} has no '{title_field}'")
+
+        subtopics = _as_text_list(data.get(item_fields[0]))
+
+        try:
+            hours = float(data.get("estimated_hours"))
+            if not 0 < hours <= 24 * 7:
+                hours = default_hours
+        except (TypeError, ValueError):
+            hours = default_hours
+
+        priority = _as_text(data.get("priority")).lower()
+        if priority not in PRIORITIES:
+            priority = "medium"
+
+        resources = []
+        raw_resources = data.get("resources")
+        if isinstance(raw_resources, list):
+            for raw in raw_resources:
+                resource = Resource.from_dict(raw)
+                if resource is not None:
+                    resources.append(resource)
+
+        notes = _as_text(data.get(note_field)) if note_field else _as_text(data.get("notes"))
+
+        known = {"day", "week", title_field, "topic", "estimated_hours", "priority",
+                 "resources", "due_date", "notes", *item_fields}
+        if note_field:
+            known.add(note_field)
+        extra = {k: v for k, v in data.items() if k not in known}
+        for field in item_fields[1:]:
+            if field in data:
+                extra[field] = _as_text_list(data[field])
+        extra = extra or None
+
+        return cls(day, title, subtopics, hours, priority, resources,
+                   data.get("due_date"), notes, extra)
+
+    @classmethod
+    def from_row(cls, row) -> "Topic":
+        """
+        Build a Topic from a topics row selected in TOPIC_COLUMNS order
+        """
+        topic = cls(
+            row[1], row[2],
+            json.loads(row[3]) if row[3] else [],
+            row[4],
+            row[9] or "medium",
+            json.loads(row[5]) if row[5] else [],
+            row[10],
+            row[11] or ""
+        )
+        topic.id = row[0]
+        topic.is_completed = bool(row[6])
+        topic.completed_at = row[7]
+        topic.time_spent_minutes = row[8]
+        topic.actual_hours = row[12] or 0
+        topic.resource_links = row[13] or ""
+        return topic
+
+    def to_row(self, path_id: int) -> Tuple:
+        """Values for Database._insert_topics, in its column order"""
+        return (
+            path_id,
+            self.day,
+            self.topic,
+            json.dumps(self.subtopics),
+            self.estimated_hours if self.estimated_hours is not None else 0,
+            json.dumps([r.to_dict() if isinstance(r, Resource) else r for r in self.resources]),
+            self.priority,
+            self.due_date,
+            self.notes
+        )
+
+    def get(self, key: str, default=None):
+        """Dict-style read so Topics can go where topic dicts went"""
+        if key == "estimated_hours":
+            return self.estimated_hours if self.estimated_hours is not None else default
+        try:
+            value = getattr(self, key)
+        except AttributeError:
+            return self.extra.get(key, default) if self.extra else default
+        return default if value is None else value
+
+    def to_dict(self, goal_type: str = None) -> Dict:
+        """
+        Plain dict in the shape the app and templates use
+
+        With a goal_type, the entry also carries that schema's own field
+        names (focus, action_items, ...) alongside topic/subtopics/notes.
+        """
+        data = dict(self.extra) if self.extra else {}
+        if goal_type is not None:
+            _list_key, _summary_key, title_field, item_fields, note_field = get_schema(goal_type)
+            data[title_field] = self.topic
+            data[item_fields[0]] = list(self.subtopics)
+            if note_field:
+                data[note_field] = self.notes
+            if goal_type == 'freelance':
+                data["week"] = self.day
+        data.update({
+            "day": self.day,
+            "topic": self.topic,
+            "subtopics": list(self.subtopics),
+            "estimated_hours": self.estimated_hours,
+            "priority": self.priority,
+            "resources": [r.to_dict() if isinstance(r, Resource) else r for r in self.resources],
+            "due_date": self.due_date,
+            "notes": self.notes
+        })
+        if self.id is not None:
+            data.update({
+                "id": self.id,
+                "is_completed": self.is_completed,
+                "completed_at": self.completed_at,
+                "time_spent_minutes": self.time_spent_minutes,
+                "actual_hours": self.actual_hours,
+                "resource_links": self.resource_links
+            })
+        return data
+
+    def __repr__(self):
+        return f"Topic(day={self.day}, topic={self.topic!r})"
+
+
+# Column order expected by Topic.from_row
+TOPIC_COLUMNS = ("id, day_number, topic_name, subtopics, estimated_hours, resources, "
+                 "is_completed, completed_at, time_spent_minutes, priority, due_date, "
+                 "notes, actual_hours, resource_links")
+
+
+class Plan:
+    """
+    A validated goal plan
+
+    Wraps the AI result for one goal type: overview, the summary list
+    (milestones, phases, ...), the entries as Topics, and any other top-level
+    fields. Invalid entries are dropped and described in `errors`.
+    """
+
+    __slots__ = ("goal_type", "overview", "summary", "topics", "extra", "errors")
+
+    def __init__(self, goal_type: str, overview: str = "", summary: List[str] = None,
+                 topics: List[Topic] = None, extra: Dict = None, errors: List[str] = None):
+        self.goal_type = goal_type
+        self.overview = overview
+        self.summary = summary or []
+        self.topics = topics or []
+        self.extra = extra
+        self.errors = errors or []
+
+    @classmethod
+    def from_ai(cls, data: Dict, goal_type: str = 'learning', hours_per_day: float = None) -> "Plan":
+        """
+        Validate an AI-generated plan
+
+        Entries that fail validation and repeated day numbers are dropped
+        (first one wins); entries are returned in day order.
+
+        Raises:
+            PlanValidationError: If the plan isn't an object or has no valid entries
+        """
+        if not isinstance(data, dict):
+            raise PlanValidationError("Plan is not a JSON object")
+
+        list_key, summary_key = get_schema(goal_type)[:2]
+        entries = data.get(list_key)
+        if not isinstance(entries, list):
+            raise PlanValidationError(f"Plan has no '{list_key}' list")
+
+        default_hours = hours_per_day * 7 if goal_type == 'freelance' and hours_per_day else hours_per_day
+
+        topics = {}
+        errors = []
+        for entry in entries:
+            try:
+                topic = Topic.from_ai(entry, goal_type, default_hours)
+            except PlanValidationError as e:
+                errors.append(str(e))
+                continue
+            if topic.day in topics:
+                errors.append(f"Duplicate day {topic.day} dropped")
+                continue
+            topics[topic.day] = topic
+
+        if not topics:
+            raise PlanValidationError(f"Plan has no valid '{list_key}' entries" +
+                                      (f": {errors[0]}" if errors else ""))
+
+        extra = {k: v for k, v in data.items() if k not in ("overview", summary_key, list_key)} or None
+        return cls(goal_type, _as_text(data.get("overview")), _as_text_list(data.get(summary_key)),
+                   [topics[day] for day in sorted(topics)], extra, errors)
+
+    def to_dict(self) -> Dict:
+        """Plain dict in the same shape as the AI result"""
+        list_key, summary_key = get_schema(self.goal_type)[:2]
+        data = dict(self.extra) if self.extra else {}
+        data.update({
+            "overview": self.overview,
+            summary_key: list(self.summary),
+            list_key: [topic.to_dict(self.goal_type) for topic in self.topics]
+        })
+        return data
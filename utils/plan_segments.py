@@ -0,0 +1,168 @@
+"""
+Segmented plan generation helpers for LearnPath AI
+Splits long plans into day ranges and stitches the generated ranges back together
+"""
+
+import os
+from typing import Dict, List, Tuple
+
+
+# Plans longer than this are generated as an outline plus day-range segments
+CHUNK_THRESHOLD_DAYS = int(os.getenv("PLAN_CHUNK_THRESHOLD_DAYS", "21"))
+
+# Days requested per segment; keeps each response well under max_tokens
+DAYS_PER_SEGMENT = int(os.getenv("PLAN_DAYS_PER_SEGMENT", "14"))
+
+# Segments generated at the same time
+MAX_SEGMENT_WORKERS = int(os.getenv("PLAN_SEGMENT_WORKERS", "4"))
+
+# Day-based plan list and its summary list for each goal type. Freelance plans
+# are organised by week and are always generated in one request.
+DAY_LIST_KEYS = {
+    'learning': ('curriculum', 'milestones'),
+    'career': ('schedule', 'phases'),
+    'project': ('timeline', 'deliverables'),
+    'personal': ('daily_plan', 'key_habits'),
+}
+
+
+def should_segment(goal_type: str, timeframe: int) -> bool:
+    """Whether a plan is long enough to be generated in segments"""
+    return goal_type in DAY_LIST_KEYS and timeframe > CHUNK_THRESHOLD_DAYS
+
+
+def _default_phases(timeframe: int) -> List[Dict]:
+    """Foundation/Application/Integration/Mastery split used by the prompts"""
+    bounds = [0, int(timeframe * 0.3), int(timeframe * 0.65), int(timeframe * 0.85), timeframe]
+    names = ["Foundation", "Application", "Integration", "Mastery"]
+    return [
+        {"title": name, "start_day": bounds[i] + 1, "end_day": bounds[i + 1], "focus": name}
+        for i, name in enumerate(names)
+        if bounds[i + 1] > bounds[i]
+    ]
+
+
+def normalize_phases(phases: List[Dict], timeframe: int) -> List[Dict]:
+    """
+    Clean up outline phases so they tile days 1..timeframe exactly
+
+    Out-of-range, overlapping or malformed phases from the model are clipped
+    or dropped, and gaps are absorbed by the following phase. Falls back to
+    the standard four-phase split if nothing usable remains.
+    """
+    cleaned = []
+    for phase in phases or []:
+        try:
+            start = max(1, int(phase.get("start_day")))
+            end = min(timeframe, int(phase.get("end_day")))
+        except (AttributeError, TypeError, ValueError):
+            continue
+        if end >= start:
+            cleaned.append({**phase, "start_day": start, "end_day": end})
+
+    cleaned.sort(key=lambda p: p["start_day"])
+
+    tiled = []
+    next_day = 1
+    for phase in cleaned:
+        if phase["end_day"] < next_day:
+            continue  # Fully covered by an earlier phase
+        phase["start_day"] = next_day
+        tiled.append(phase)
+        next_day = phase["end_day"] + 1
+
+    if not tiled:
+        return _default_phases(timeframe)
+    tiled[-1]["end_day"] = timeframe
+    return tiled
+
+
+def split_day_ranges(phases: List[Dict], days_per_segment: int = None) -> List[Tuple[Dict, int, int]]:
+    """
+    Break phases into (phase, start_day, end_day) segments of bounded size
+
+    Args:
+        phases: Phases from normalize_phases
+        days_per_segment: Maximum days per segment
+
+    Returns:
+        Segments in day order
+    """
+    size = max(1, days_per_segment or DAYS_PER_SEGMENT)
+    segments = []
+    for phase in phases:
+        start = phase["start_day"]
+        while start <= phase["end_day"]:
+            end = min(phase["end_day"], start + size - 1)
+            segments.append((phase, start, end))
+            start = end + 1
+    return segments
+
+
+def _day_number(item: Dict):
+    """The item's day as an int, or None if missing or not numeric"""
+    try:
+        return int(item.get("day"))
+    except (TypeError, ValueError):
+        return None
+
+
+def align_segment_days(items: List[Dict], start_day: int, end_day: int) -> List[Dict]:
+    """
+    Keep the items that belong to a segment, with absolute day numbers
+
+    Models sometimes number a later range from Day 1; such segments are
+    shifted to start_day. Items outside the range are dropped.
+    """
+    items = [item for item in items if isinstance(item, dict)]
+    numeric = [d for d in map(_day_number, items) if d is not None]
+
+    offset = 0
+    if numeric and start_day > 1 and min(numeric) == 1 and max(numeric) <= end_day - start_day + 1:
+        offset = start_day - 1
+
+    aligned = []
+    for position, item in enumerate(items):
+        day = _day_number(item)
+        if day is None:
+            day = start_day + position  # Unnumbered: assume in order
+        else:
+            day += offset
+        if start_day <= day <= end_day:
+            aligned.append({**item, "day": day})
+    return aligned
+
+
+def stitch_segments(segment_items: List[List[Dict]]) -> List[Dict]:
+    """
+    Merge segment results into one list ordered by day
+
+    When two segments produce the same day, the first one wins.
+    """
+    by_day = {}
+    for items in segment_items:
+        for item in items:
+            by_day.setdefault(item["day"], item)
+    return [by_day[day] for day in sorted(by_day)]
+
+
+def find_missing_days(items: List[Dict], timeframe: int) -> List[Tuple[int, int]]:
+    """
+    Find gaps in day continuity
+
+    Returns:
+        List of inclusive (start_day, end_day) ranges with no item
+    """
+    present = {item["day"] for item in items}
+    gaps = []
+    gap_start = None
+    for day in range(1, timeframe + 1):
+        if day not in present:
+            if gap_start is None:
+                gap_start = day
+        elif gap_start is not None:
+            gaps.append((gap_start, day - 1))
+            gap_start = None
+    if gap_start is not None:
+        gaps.append((gap_start, timeframe))
+    return gaps
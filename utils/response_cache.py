@@ -0,0 +1,238 @@
+"""
+AI response cache for LearnPath AI
+Content-addressed cache for repeatable AI calls, in memory and on disk
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .connection_pool import ConnectionPool
+
+
+_PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_CACHE_DB_PATH = os.path.join(_PROJECT_ROOT, "learnpath_cache.db")
+
+_DEFAULT_TTL_SECONDS = float(os.getenv("AI_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+_DEFAULT_MEMORY_SIZE = int(os.getenv("AI_CACHE_MEMORY_SIZE", "256"))
+_DEFAULT_MAX_ROWS = int(os.getenv("AI_CACHE_MAX_ROWS", "5000"))
+
+_TRAILING_SPACE = re.compile(r"[ \t]+\n")
+
+
+def normalize_prompt(text: str) -> str:
+    """Normalize whitespace that doesn't change a prompt's meaning"""
+    return _TRAILING_SPACE.sub("\n", text.replace("\r\n", "\n")).strip()
+
+
+def make_cache_key(model: str, system_prompt: str, prompt: str,
+                   max_tokens: int, temperature: float) -> str:
+    """
+    Build the cache key for a request
+
+    Returns:
+        SHA-256 hex digest of the normalized request parameters
+    """
+    payload = json.dumps(
+        [model, normalize_prompt(system_prompt or ""), normalize_prompt(prompt),
+         int(max_tokens), round(float(temperature), 3)],
+        ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of AI responses
+
+    An in-memory LRU sits in front of a SQLite table. Entries expire after
+    `ttl_seconds`; the on-disk tier is trimmed to `max_rows` by least recent
+    use. Only responses the caller has successfully parsed should be stored.
+    """
+
+    def __init__(self, db_path: str = _CACHE_DB_PATH, ttl_seconds: float = _DEFAULT_TTL_SECONDS,
+                 memory_size: int = _DEFAULT_MEMORY_SIZE, max_rows: int = _DEFAULT_MAX_ROWS):
+        """
+        Args:
+            db_path: Path to the SQLite cache file
+            ttl_seconds: How long a response stays valid
+            memory_size: Entries kept in the in-memory tier
+            max_rows: Entries kept in the SQLite tier
+        """
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.memory_size = max(1, memory_size)
+        self.max_rows = max(1, max_rows)
+
+        self._memory = OrderedDict()  # key -> (response, expires_at)
+        self._lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'writes': 0,
+            'evictions': 0,
+        }
+
+        self.pool = ConnectionPool(db_path, size=2)
+        self._init_table()
+
+    def _init_table(self):
+        conn = self.pool.acquire()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS response_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_response_cache_last_used ON response_cache(last_used)")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _remember(self, key: str, response: str, expires_at: float):
+        """Put an entry in the memory tier, evicting the least recently used"""
+        with self._lock:
+            self._memory[key] = (response, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on a miss"""
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return entry[0]
+                del self._memory[key]
+
+        conn = self.pool.acquire()
+        try:
+            row = conn.execute(
+                "SELECT response, expires_at FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count('misses')
+                return None
+            if row[1] <= now:
+                conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                conn.commit()
+                self._count('expired')
+                self._count('misses')
+                return None
+            conn.execute("UPDATE response_cache SET last_used = ? WHERE key = ?", (now, key))
+            conn.commit()
+        except sqlite3.Error:
+            # A broken cache must never break the feature it sits in front of
+            self._count('misses')
+            return None
+        finally:
+            conn.close()
+
+        self._remember(key, row[0], row[1])
+        self._count('disk_hits')
+        return row[0]
+
+    def put(self, key: str, response: str, model: str = ""):
+        """Store a response in both tiers"""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        self._remember(key, response, expires_at)
+
+        conn = self.pool.acquire()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO response_cache "
+                "(key, model, response, created_at, expires_at, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response, now, expires_at, now)
+            )
+            evicted = conn.execute(
+                "DELETE FROM response_cache WHERE expires_at <= ? OR key IN ("
+                "SELECT key FROM response_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (now, self.max_rows)
+            ).rowcount
+            conn.commit()
+        except sqlite3.Error:
+            return
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._stats['writes'] += 1
+            self._stats['evictions'] += max(0, evicted)
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._memory.clear()
+        conn = self.pool.acquire()
+        try:
+            conn.execute("DELETE FROM response_cache")
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict:
+        """Get hit/miss counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['memory_size'] = len(self._memory)
+
+        hits = stats['memory_hits'] + stats['disk_hits']
+        lookups = hits + stats['misses']
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+    def close(self):
+        self.pool.close()
+
+
+# Process-wide cache shared by every ClaudeAI instance
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    Get the shared response cache, creating it on first use
+
+    Returns None when disabled with AI_CACHE_ENABLED=false or when the cache
+    file can't be opened.
+    """
+    global _response_cache
+    if os.getenv("AI_CACHE_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                try:
+                    _response_cache = ResponseCache()
+                except sqlite3.Error:
+                    return None
+    return _response_cache
+
+
+def get_response_cache_stats() -> Dict:
+    """Get metrics for the shared response cache (empty if unused)"""
+    return _response_cache.get_stats() if _response_cache is not None else {}
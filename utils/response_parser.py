@@ -0,0 +1,266 @@
+"""
+AI response parsing for LearnPath AI
+Single-pass JSON extraction with repair for the usual model output problems
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple, TypedDict
+
+
+class ExtractionError(ValueError):
+    """Raised when no usable JSON can be recovered from a response"""
+
+
+# ============================================================================
+# TYPED RESULTS (one per goal type schema in ClaudeAI._get_prompt_template)
+# ============================================================================
+
+class LearningPlan(TypedDict, total=False):
+    overview: str
+    milestones: List[str]
+    curriculum: List[Dict]
+
+
+class CareerPlan(TypedDict, total=False):
+    overview: str
+    phases: List[str]
+    schedule: List[Dict]
+
+
+class FreelancePlan(TypedDict, total=False):
+    overview: str
+    revenue_milestones: List[str]
+    weekly_focus: List[Dict]
+
+
+class ProjectPlan(TypedDict, total=False):
+    overview: str
+    deliverables: List[str]
+    timeline: List[Dict]
+
+
+class PersonalPlan(TypedDict, total=False):
+    overview: str
+    key_habits: List[str]
+    daily_plan: List[Dict]
+
+
+# goal_type -> (result type, entry list key)
+PLAN_SCHEMAS = {
+    'learning': (LearningPlan, 'curriculum'),
+    'career': (CareerPlan, 'schedule'),
+    'freelance': (FreelancePlan, 'weekly_focus'),
+    'project': (ProjectPlan, 'timeline'),
+    'personal': (PersonalPlan, 'daily_plan'),
+}
+
+
+# ============================================================================
+# EXTRACTION
+# ============================================================================
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+# Structural characters and whole string literals; everything in between
+# (numbers, literals, whitespace, prose) is skipped inside the regex engine
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*(")?|[\[\]{},]')
+
+_decoder = json.JSONDecoder()
+
+
+def _is_entry_level(stack: List[str]) -> bool:
+    """Whether the open brackets are the top level or an array directly under it"""
+    return len(stack) == 1 or (len(stack) == 2 and stack[1] == "[")
+
+
+def _scan(text: str, start: int) -> Tuple[Optional[str], int]:
+    """
+    Scan one JSON value starting at text[start] and return it repaired
+
+    A single pass over the string and bracket tokens tracks depth. Along the
+    way it drops trailing commas before a closing bracket, stops at the
+    matching close (ignoring any prose after it), and remembers the last
+    point where every value so far was complete. If the text ends first, the
+    value is cut back to that point and the open brackets are closed.
+
+    Cut points are only taken at the top level or in an array directly
+    under it (the entries list), so a truncated plan keeps its complete
+    entries and drops a partial trailing one whole, rather than keeping it
+    with some of its subtopics missing.
+
+    Returns:
+        (repaired text or None, index where scanning stopped)
+    """
+    stack = []
+    drop = []             # Indexes of trailing commas to remove
+    last_comma = None     # Index of the most recent comma at the current level
+    safe_end = None       # Text end index of the last complete state
+    safe_stack = ""       # Open brackets at that point
+
+    pos = start
+    for match in _TOKEN.finditer(text, start):
+        token = match.group()
+        pos = match.start()
+
+        if token[0] == '"':
+            if match.group(1) is None:
+                break  # Cut off inside a string
+            last_comma = None
+        elif token in "{[":
+            stack.append(token)
+            last_comma = None
+        elif token in "}]":
+            if not stack or _CLOSERS[stack[-1]] != token:
+                break  # Mismatched bracket: treat as the end of usable text
+            if last_comma is not None and not text[last_comma + 1:pos].strip():
+                drop.append(last_comma)
+            last_comma = None
+            stack.pop()
+            if not stack:
+                return _assemble(text, start, pos + 1, drop, ""), pos + 1
+            if _is_entry_level(stack):
+                safe_end, safe_stack = pos + 1, "".join(stack)
+        else:  # ","
+            # Everything before a comma at the entry level is complete; any
+            # deeper, it could be part of a half-written entry
+            if not stack:
+                break
+            if _is_entry_level(stack):
+                if last_comma is None or text[last_comma + 1:pos].strip():
+                    safe_end, safe_stack = pos, "".join(stack)
+            last_comma = pos
+
+    # Truncated: close everything that was open at the last complete point
+    if safe_end is None:
+        return None, len(text)
+    closers = "".join(_CLOSERS[c] for c in reversed(safe_stack))
+    return _assemble(text, start, safe_end, [i for i in drop if i < safe_end], closers), len(text)
+
+
+def _assemble(text: str, start: int, end: int, drop: List[int], suffix: str) -> str:
+    """Slice text[start:end] without the dropped commas, plus suffix"""
+    if not drop:
+        return text[start:end] + suffix
+    parts = []
+    previous = start
+    for index in drop:
+        parts.append(text[previous:index])
+        previous = index + 1
+    parts.append(text[previous:end])
+    return "".join(parts) + suffix
+
+
+def _next_start(text: str, openers: str, position: int) -> int:
+    """Index of the next opening bracket at or after position, or -1"""
+    found = [p for p in (text.find(o, position) for o in openers) if p != -1]
+    return min(found) if found else -1
+
+
+def extract_json(text: str, expect: type = None) -> Any:
+    """
+    Extract a JSON object or array from a model response
+
+    Clean JSON takes a fast path straight to json.loads. Otherwise the value
+    is located (inside ```json fences or after stray prose) and decoded in
+    place; only if that fails is it repaired in a single pass (trailing
+    commas, truncated arrays/objects) and parsed.
+
+    Args:
+        text: Raw response text
+        expect: dict or list to only accept a value of that type
+
+    Returns:
+        The parsed value
+
+    Raises:
+        ExtractionError: If nothing parseable is found
+    """
+    if not text:
+        raise ExtractionError("Empty response")
+
+    openers = {dict: "{", list: "["}.get(expect, "{[")
+
+    # Fast path: the whole response is the JSON value
+    stripped = text.strip()
+    if stripped[:1] in openers and stripped[-1:] in ("}", "]"):
+        try:
+            return json.loads(stripped)
+        except ValueError:
+            pass
+
+    # Start inside the first code fence if there is one; brackets in prose
+    # before it (or before the value) are skipped candidate by candidate
+    fence = text.find("```")
+    start = _next_start(text, openers, fence if fence != -1 else 0)
+    if start == -1 and fence != -1:
+        start = _next_start(text, openers, 0)
+
+    for _attempt in range(5):
+        if start == -1:
+            break
+
+        # Well-formed value followed by prose or a closing fence
+        try:
+            value, end = _decoder.raw_decode(text, start)
+            if expect is None or isinstance(value, expect):
+                return value
+        except ValueError:
+            candidate, end = _scan(text, start)
+            if candidate is not None:
+                try:
+                    value = json.loads(candidate)
+                    if expect is None or isinstance(value, expect):
+                        return value
+                except ValueError:
+                    pass
+
+        # Not it: the value, if any, starts after this candidate
+        start = _next_start(text, openers, max(end, start + 1))
+
+    raise ExtractionError("No valid JSON found in response")
+
+
+def extract_list(text: str) -> List:
+    """
+    Extract a JSON array, unwrapping {"key": [...]} when that's all there is
+
+    Raises:
+        ExtractionError: If no array can be recovered
+    """
+    value = extract_json(text)
+    if isinstance(value, dict):
+        lists = [v for v in value.values() if isinstance(v, list)]
+        if len(lists) == 1:
+            value = lists[0]
+    if not isinstance(value, list):
+        raise ExtractionError("Expected a JSON array")
+    return value
+
+
+def extract_plan(text: str, goal_type: str = 'learning') -> Dict:
+    """
+    Extract a goal plan and check it against its goal type's schema
+
+    A bare array of entries is wrapped under the goal type's list key, and
+    the list key is required to hold a list.
+
+    Returns:
+        The plan (typed as LearningPlan, CareerPlan, ... for goal_type)
+
+    Raises:
+        ExtractionError: If no plan with entries can be recovered
+    """
+    _plan_type, list_key = PLAN_SCHEMAS.get(goal_type, PLAN_SCHEMAS['learning'])
+    value = extract_json(text)
+
+    if isinstance(value, list):
+        value = {list_key: value}
+    if not isinstance(value, dict):
+        raise ExtractionError("Expected a JSON object")
+
+    entries = value.get(list_key)
+    if not isinstance(entries, list) or not entries:
+        raise ExtractionError(f"Plan has no '{list_key}' entries")
+    value[list_key] = [entry for entry in entries if isinstance(entry, dict)]
+    return value
@@ -0,0 +1,462 @@
+"""
+Latency-aware routing for LearnPath AI
+Tracks per-model latency and errors, and hedges slow requests to a second model
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .ai_providers import AIProviderManager, TextChunk, parse_model_selection
+
+# Marks the end of a stream on HedgedRouter.stream_text's event queue
+_STREAM_DONE = object()
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class LatencyTracker:
+    """
+    Rolling latency and error statistics per (provider, model)
+
+    Keeps the last `window` outcomes for each model, so the numbers follow
+    the provider's current behaviour rather than its all-time average.
+    """
+
+    def __init__(self, window: int = 100):
+        self.window = max(1, window)
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider_name: str, model_name: str, latency: float, ok: bool):
+        """Record the outcome of one request"""
+        key = (provider_name, model_name)
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append((latency, ok))
+
+    def get_stats(self, provider_name: str, model_name: str) -> Dict:
+        """
+        Get rolling stats for a model
+
+        Returns:
+            Dictionary with count, errors, error_rate, p50 and p95 (seconds).
+            Percentiles only include successful requests.
+        """
+        with self._lock:
+            samples = list(self._samples.get((provider_name, model_name), ()))
+
+        latencies = sorted(latency for latency, ok in samples if ok)
+        errors = sum(1 for _latency, ok in samples if not ok)
+        return {
+            'count': len(samples),
+            'errors': errors,
+            'error_rate': round(errors / len(samples), 4) if samples else 0.0,
+            'p50': round(_percentile(latencies, 0.50), 4),
+            'p95': round(_percentile(latencies, 0.95), 4),
+            'successes': len(latencies)
+        }
+
+    def tracked_models(self) -> List[Tuple[str, str]]:
+        """Get every (provider, model) with recorded samples"""
+        with self._lock:
+            return list(self._samples.keys())
+
+
+class HedgePolicy:
+    """
+    Settings for when and where to send a hedge request
+
+    Defaults come from environment variables so deployments can tune them
+    without code changes:
+
+        AI_HEDGE_ENABLED        "true"/"false" (default false). A hedge can be
+                                answered by a different model than the one the
+                                user picked, so deployments opt in
+        AI_HEDGE_MODELS         comma-separated "Provider / Model" hedge targets,
+                                tried in order (default: pick automatically)
+        AI_HEDGE_P95_MULTIPLIER hedge once the primary exceeds p95 * this (default 1.0)
+        AI_HEDGE_MIN_DELAY      never hedge sooner than this many seconds (default 1.0)
+        AI_HEDGE_DEFAULT_DELAY  delay used until enough samples exist (default 8.0)
+        AI_HEDGE_MIN_SAMPLES    successful samples needed to trust p95 (default 5)
+        AI_HEDGE_MAX_ERROR_RATE hedge immediately above this error rate (default 0.5)
+        AI_HEDGE_TIMEOUT        overall time limit for a request in seconds (default 120)
+    """
+
+    def __init__(self, enabled: bool = None, hedge_models: List[str] = None,
+                 p95_multiplier: float = None, min_delay: float = None,
+                 default_delay: float = None, min_samples: int = None,
+                 max_error_rate: float = None, timeout: float = None):
+        if enabled is None:
+            enabled = os.getenv("AI_HEDGE_ENABLED", "false").lower() in ("1", "true", "yes")
+        if hedge_models is None:
+            hedge_models = [m.strip() for m in os.getenv("AI_HEDGE_MODELS", "").split(",") if m.strip()]
+
+        self.enabled = enabled
+        self.hedge_models = hedge_models
+        self.p95_multiplier = p95_multiplier if p95_multiplier is not None else float(os.getenv("AI_HEDGE_P95_MULTIPLIER", "1.0"))
+        self.min_delay = min_delay if min_delay is not None else float(os.getenv("AI_HEDGE_MIN_DELAY", "1.0"))
+        self.default_delay = default_delay if default_delay is not None else float(os.getenv("AI_HEDGE_DEFAULT_DELAY", "8.0"))
+        self.min_samples = min_samples if min_samples is not None else int(os.getenv("AI_HEDGE_MIN_SAMPLES", "5"))
+        self.max_error_rate = max_error_rate if max_error_rate is not None else float(os.getenv("AI_HEDGE_MAX_ERROR_RATE", "0.5"))
+        self.timeout = timeout if timeout is not None else float(os.getenv("AI_HEDGE_TIMEOUT", "120"))
+
+    def to_dict(self) -> Dict:
+        return {
+            'enabled': self.enabled,
+            'hedge_models': list(self.hedge_models),
+            'p95_multiplier': self.p95_multiplier,
+            'min_delay': self.min_delay,
+            'default_delay': self.default_delay,
+            'min_samples': self.min_samples,
+            'max_error_rate': self.max_error_rate,
+            'timeout': self.timeout
+        }
+
+
+class HedgedRouter:
+    """
+    Routes text generation through AIProviderManager with hedging
+
+    The primary model gets a deadline derived from its own rolling p95. If it
+    hasn't answered by then (or fails first), a hedge request goes to a second
+    configured model and whichever returns a non-empty answer first wins.
+    The losing request can't be cancelled mid-flight, but its outcome is
+    still recorded so the latency stats stay honest. Answers carry the
+    provider and model that produced them, so callers can attribute them.
+
+    stream_text() hedges the same way on time to first chunk, which is
+    tracked separately (stream_tracker) since it is much shorter than the
+    time to a full answer.
+    """
+
+    def __init__(self, manager: AIProviderManager = None, policy: HedgePolicy = None,
+                 tracker: LatencyTracker = None, max_workers: int = 8,
+                 stream_tracker: LatencyTracker = None):
+        self.manager = manager or AIProviderManager()
+        self.policy = policy or HedgePolicy()
+        self.tracker = tracker or LatencyTracker()
+        self.stream_tracker = stream_tracker or LatencyTracker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ai-hedge")
+        self._lock = threading.Lock()
+        self._counters = {
+            'requests': 0,
+            'hedges_fired': 0,
+            'hedge_wins': 0,
+            'primary_wins': 0,
+            'failures': 0
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counters[name] += 1
+
+    def get_hedge_delay(self, provider_name: str, model_name: str,
+                        tracker: LatencyTracker = None) -> float:
+        """Seconds to wait on the primary before sending a hedge"""
+        stats = (tracker or self.tracker).get_stats(provider_name, model_name)
+        if stats['count'] >= self.policy.min_samples and stats['error_rate'] > self.policy.max_error_rate:
+            # Primary is mostly failing right now: don't wait on it
+            return 0.0
+        if stats['successes'] < self.policy.min_samples:
+            return self.policy.default_delay
+        return max(self.policy.min_delay, stats['p95'] * self.policy.p95_multiplier)
+
+    def choose_hedge(self, provider_name: str, model_name: str,
+                     tracker: LatencyTracker = None) -> Optional[Tuple[str, str]]:
+        """
+        Pick the hedge target for a primary model
+
+        Uses the first configured entry of policy.hedge_models. Otherwise picks,
+        among configured models on other providers, the one with the lowest
+        rolling p95 (untried providers rank after measured healthy ones).
+        """
+        tracker = tracker or self.tracker
+        primary = (provider_name, model_name)
+
+        for selection in self.policy.hedge_models:
+            candidate = parse_model_selection(selection)
+            data = self.manager.providers.get(candidate[0])
+            if candidate != primary and data and data["configured"]:
+                return candidate
+
+        candidates = []
+        for other_provider, data in self.manager.providers.items():
+            if other_provider == provider_name or not data["configured"]:
+                continue
+            measured = [m for p, m in tracker.tracked_models() if p == other_provider]
+            for other_model in measured or data["models"][:1]:
+                candidates.append((other_provider, other_model))
+
+        if not candidates:
+            # Only one provider configured: hedge to another of its models
+            data = self.manager.providers.get(provider_name)
+            if data and data["configured"]:
+                candidates = [(provider_name, m) for m in data["models"] if m != model_name]
+
+        def rank(candidate):
+            stats = tracker.get_stats(*candidate)
+            unhealthy = stats['count'] >= self.policy.min_samples and stats['error_rate'] > self.policy.max_error_rate
+            measured = stats['successes'] >= self.policy.min_samples
+            return (unhealthy, not measured, stats['p95'])
+
+        return min(candidates, key=rank) if candidates else None
+
+    def _call(self, provider_name: str, model_name: str, prompt: str,
+              system_prompt: str, max_tokens: int) -> TextChunk:
+        """Run one request and record its outcome"""
+        started = time.perf_counter()
+        try:
+            text = self.manager.generate_text(provider_name, model_name, prompt, system_prompt, max_tokens)
+        except Exception:
+            self.tracker.record(provider_name, model_name, time.perf_counter() - started, False)
+            raise
+
+        ok = bool(text and text.strip())
+        self.tracker.record(provider_name, model_name, time.perf_counter() - started, ok)
+        if not ok:
+            raise ValueError(f"{provider_name} / {model_name} returned an empty response")
+        return TextChunk(text, provider_name, model_name, is_final=True)
+
+    def generate_text(self, provider_name: str, model_name: str, prompt: str,
+                      system_prompt: str = "", max_tokens: int = 2000) -> TextChunk:
+        """
+        Generate text, hedging to a second model if the primary is slow or fails
+
+        Args:
+            provider_name: Primary provider
+            model_name: Primary model
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Max tokens in the response
+
+        Returns:
+            The first non-empty answer as a final TextChunk; its provider and
+            model say which model answered (the hedge target if it won)
+
+        Raises:
+            The primary's exception if every attempt failed, or TimeoutError
+            if nothing answered within policy.timeout
+        """
+        self._count('requests')
+
+        if not self.policy.enabled:
+            try:
+                return self._call(provider_name, model_name, prompt, system_prompt, max_tokens)
+            except Exception:
+                self._count('failures')
+                raise
+
+        deadline = time.monotonic() + self.policy.timeout
+        primary = self._executor.submit(self._call, provider_name, model_name,
+                                        prompt, system_prompt, max_tokens)
+        attempts = {primary: 'primary'}
+
+        wait([primary], timeout=self.get_hedge_delay(provider_name, model_name))
+        if primary.done() and primary.exception() is None:
+            self._count('primary_wins')
+            return primary.result()
+
+        hedge_target = self.choose_hedge(provider_name, model_name)
+        if hedge_target is not None:
+            self._count('hedges_fired')
+            hedge = self._executor.submit(self._call, hedge_target[0], hedge_target[1],
+                                          prompt, system_prompt, max_tokens)
+            attempts[hedge] = 'hedge'
+
+        pending = {f for f in attempts if not f.done()}
+        finished = [f for f in attempts if f.done()]
+        while True:
+            for future in finished:
+                if future.exception() is None:
+                    self._count('primary_wins' if attempts[future] == 'primary' else 'hedge_wins')
+                    return future.result()
+            if not pending:
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._count('failures')
+                raise TimeoutError(f"No response from {provider_name} / {model_name} "
+                                   f"within {self.policy.timeout:g}s")
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            finished = list(done)
+
+        self._count('failures')
+        raise primary.exception()
+
+    def _stream_into(self, attempt: str, provider_name: str, model_name: str, prompt: str,
+                     system_prompt: str, max_tokens: int, events: queue.Queue,
+                     cancelled: threading.Event):
+        """
+        Run one stream on a worker, putting (attempt, item) on events
+
+        Items are TextChunks, then _STREAM_DONE or the exception that ended
+        the stream. Time to the first non-empty chunk is recorded in
+        stream_tracker. Stops early once cancelled (the other stream won).
+        """
+        started = time.perf_counter()
+        first_chunk = False
+        stream = None
+        try:
+            stream = self.manager.stream_text(provider_name, model_name, prompt, system_prompt, max_tokens)
+            for chunk in stream:
+                if cancelled.is_set():
+                    return
+                if chunk.text and not first_chunk:
+                    first_chunk = True
+                    self.stream_tracker.record(provider_name, model_name, time.perf_counter() - started, True)
+                events.put((attempt, chunk))
+            if not first_chunk:
+                raise ValueError(f"{provider_name} / {model_name} returned an empty response")
+            events.put((attempt, _STREAM_DONE))
+        except Exception as e:
+            if not first_chunk:
+                self.stream_tracker.record(provider_name, model_name, time.perf_counter() - started, False)
+            events.put((attempt, e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+    def stream_text(self, provider_name: str, model_name: str, prompt: str,
+                    system_prompt: str = "", max_tokens: int = 2000) -> Iterator[TextChunk]:
+        """
+        Stream text, hedging to a second model if the first chunk is slow
+
+        The primary stream gets a deadline from its rolling time-to-first-chunk
+        p95. If no text has arrived by then (or the primary fails first), a
+        hedge stream starts on a second model. Whichever produces text first
+        is committed to: its chunks are yielded and the other stream is
+        dropped.
+
+        Args:
+            provider_name: Primary provider
+            model_name: Primary model
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            max_tokens: Max tokens in the response
+
+        Yields:
+            TextChunks from the winning stream; their provider and model say
+            which model is answering
+
+        Raises:
+            The primary's exception if every attempt failed before producing
+            text, TimeoutError if no text arrived within policy.timeout, or
+            the winning stream's exception if it fails part way
+        """
+        self._count('requests')
+
+        events = queue.Queue()
+        cancelled = threading.Event()
+        deadline = time.monotonic() + self.policy.timeout
+        hedge_at = None
+        if self.policy.enabled:
+            hedge_at = time.monotonic() + self.get_hedge_delay(provider_name, model_name, self.stream_tracker)
+
+        self._executor.submit(self._stream_into, 'primary', provider_name, model_name, prompt,
+                              system_prompt, max_tokens, events, cancelled)
+        running = {'primary'}
+        errors = {}
+
+        def start_hedge():
+            hedge_target = self.choose_hedge(provider_name, model_name, self.stream_tracker)
+            if hedge_target is None:
+                return
+            self._count('hedges_fired')
+            self._executor.submit(self._stream_into, 'hedge', hedge_target[0], hedge_target[1], prompt,
+                                  system_prompt, max_tokens, events, cancelled)
+            running.add('hedge')
+
+        try:
+            winner = None
+            first = None
+            while winner is None:
+                now = time.monotonic()
+                if hedge_at is not None and now >= hedge_at:
+                    hedge_at = None
+                    start_hedge()
+                if not running:
+                    self._count('failures')
+                    raise errors['primary']
+
+                if now >= deadline:
+                    self._count('failures')
+                    raise TimeoutError(f"No response from {provider_name} / {model_name} "
+                                       f"within {self.policy.timeout:g}s")
+                wake_at = deadline if hedge_at is None else min(deadline, hedge_at)
+                try:
+                    attempt, item = events.get(timeout=max(0.0, wake_at - now))
+                except queue.Empty:
+                    continue
+
+                if isinstance(item, TextChunk):
+                    if item.text:
+                        winner, first = attempt, item
+                elif item is not _STREAM_DONE:
+                    # Failed before producing text: hedge now rather than wait
+                    errors[attempt] = item
+                    running.discard(attempt)
+                    if attempt == 'primary' and hedge_at is not None:
+                        hedge_at = time.monotonic()
+
+            self._count('primary_wins' if winner == 'primary' else 'hedge_wins')
+            yield first
+            while True:
+                attempt, item = events.get()
+                if attempt != winner:
+                    continue
+                if item is _STREAM_DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Stop the losing stream (or both, if the caller stopped reading)
+            cancelled.set()
+
+    def close(self):
+        """
+        Stop the hedging worker threads
+
+        Requests already running are left to finish (their answers are
+        discarded); the router can't be used afterwards.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_metrics(self) -> Dict:
+        """
+        Get routing metrics
+
+        Returns:
+            Dictionary with request/hedge counters, the active policy,
+            rolling stats per "Provider / Model", and rolling time-to-first-chunk
+            stats for streamed requests under 'first_chunk'
+        """
+        with self._lock:
+            metrics = dict(self._counters)
+
+        metrics['policy'] = self.policy.to_dict()
+        metrics['models'] = {
+            f"{provider_name} / {model_name}": self.tracker.get_stats(provider_name, model_name)
+            for provider_name, model_name in self.tracker.tracked_models()
+        }
+        metrics['first_chunk'] = {
+            f"{provider_name} / {model_name}": self.stream_tracker.get_stats(provider_name, model_name)
+            for provider_name, model_name in self.stream_tracker.tracked_models()
+        }
+        return metrics
+
@@ -0,0 +1,161 @@
+"""
+Batch scheduling engine for LearnPath AI
+Assigns due dates to whole columns of topics at once, with NumPy when available
+
+Reschedule every active goal from the command line with:
+    python -m utils.schedule_engine [--start 2025-11-20] [--dry-run]
+"""
+
+import time
+from datetime import date, datetime
+from typing import Dict, List, Sequence
+
+from .date_intervals import DateIntervalIndex, decode_weekly_pattern
+from .date_scheduler import AvailabilityCalendar, weekday_mask
+
+try:
+    import numpy as np
+except ImportError:  # Pure-Python engine below is used instead
+    np = None
+
+
+def numpy_available() -> bool:
+    """Whether the vectorized engine can be used"""
+    return np is not None
+
+
+def schedule_due_dates(start_date: date, estimated_hours: Sequence[float],
+                       hours_per_day: float = 2.0, unavailable_dates: List[date] = None,
+                       weekly_pattern: Dict[int, bool] = None, skip_weekends: bool = False,
+                       skip_weekdays: List[int] = None, use_numpy: bool = None) -> List[str]:
+    """
+    Due dates for a run of topics, given their estimated hours in order
+
+    Same rules and results as calculate_calendar_dates: each topic takes
+    round(hours / hours_per_day) available days (at least one), back to back.
+    With NumPy the day counts are computed as one array and every due date
+    comes from a single numpy.busday_offset call, using a weekmask from the
+    weekly rules and the unavailable dates as holidays. Without NumPy the
+    same positions are read from an AvailabilityCalendar.
+
+    Args:
+        start_date: First day topics can be scheduled on
+        estimated_hours: Hours per topic, in schedule order
+        hours_per_day: Hours available per day
+        unavailable_dates: Specific unavailable dates
+        weekly_pattern: Custom weekly pattern {0: True, 1: False, ...}
+        skip_weekends: Whether to skip weekends
+        skip_weekdays: List of weekdays to skip
+        use_numpy: Force (True) or avoid (False) the NumPy engine; default
+            uses it when installed
+
+    Returns:
+        'YYYY-MM-DD' due dates, one per topic
+
+    Raises:
+        ValueError: If every weekday is skipped
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    if not len(estimated_hours):
+        return []
+
+    mask = weekday_mask(weekly_pattern, skip_weekends, skip_weekdays)
+    if not any(mask):
+        raise ValueError("No available days: every weekday is skipped")
+
+    if not use_numpy:
+        calendar = AvailabilityCalendar(start_date, unavailable_dates, weekly_pattern,
+                                        skip_weekends, skip_weekdays)
+        due_dates = []
+        position = 0
+        for hours in estimated_hours:
+            position += max(1, round(hours / hours_per_day))
+            due_dates.append(calendar.nth_available(position - 1).isoformat())
+        return due_dates
+
+    # np.round rounds halves to even, like the built-in round()
+    days_needed = np.maximum(1, np.round(np.asarray(estimated_hours, dtype=float) / hours_per_day))
+    positions = np.cumsum(days_needed.astype(np.int64)) - 1
+
+    if isinstance(unavailable_dates, DateIntervalIndex):
+        blocked = unavailable_dates.dates_from(start_date)
+    else:
+        blocked = (d for d in (unavailable_dates or ()) if d >= start_date)
+    holidays = np.array([d.isoformat() for d in blocked], dtype='datetime64[D]')
+    due = np.busday_offset(np.datetime64(start_date.isoformat(), 'D'), positions, roll='forward',
+                           weekmask=[int(ok) for ok in mask], holidays=holidays)
+    return np.datetime_as_string(due, unit='D').tolist()
+
+
+def reschedule_active_paths(db, start_date: date = None, dry_run: bool = False,
+                            use_numpy: bool = None) -> Dict:
+    """
+    Reschedule the incomplete topics of every active goal in one batch
+
+    Each path's incomplete topics are packed back to back from start_date
+    (or the path's own start date, if later) using its stored hours per day,
+    unavailable date intervals and weekly pattern. All changed due dates are
+    written in a single transaction.
+
+    Args:
+        db: Database instance
+        start_date: Earliest new start (default: today)
+        dry_run: Compute and count changes without writing them
+        use_numpy: Passed to schedule_due_dates
+
+    Returns:
+        Dictionary with paths, topics, updated (due dates written), engine
+        and elapsed_ms
+    """
+    started = time.perf_counter()
+    start_date = start_date or date.today()
+
+    updates = []
+    schedules = db.get_active_schedules()
+    for schedule in schedules:
+        path_start = start_date
+        if schedule['start_date']:
+            try:
+                path_start = max(path_start, datetime.strptime(schedule['start_date'], '%Y-%m-%d').date())
+            except ValueError:
+                pass
+
+        try:
+            due_dates = schedule_due_dates(
+                path_start,
+                schedule['estimated_hours'],
+                schedule['hours_per_day'],
+                DateIntervalIndex.from_json(schedule['unavailable_dates']),
+                decode_weekly_pattern(schedule['weekly_pattern']),
+                use_numpy=use_numpy
+            )
+        except ValueError:
+            continue  # A pattern with no available days can't be scheduled
+        updates.extend(zip(schedule['topic_ids'], due_dates))
+
+    updated = 0 if dry_run else db.set_due_dates(updates)
+
+    return {
+        'paths': len(schedules),
+        'topics': len(updates),
+        'updated': updated,
+        'engine': 'numpy' if (use_numpy if use_numpy is not None else np is not None) else 'python',
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from .database import Database
+
+    parser = argparse.ArgumentParser(description="Reschedule incomplete topics of every active goal")
+    parser.add_argument("--start", help="Earliest new start date (YYYY-MM-DD, default today)")
+    parser.add_argument("--dry-run", action="store_true", help="Compute the new schedule without saving it")
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, '%Y-%m-%d').date() if args.start else None
+    result = reschedule_active_paths(Database(), start, dry_run=args.dry_run)
+    print(f"Rescheduled {result['topics']} topics across {result['paths']} goals "
+          f"({result['updated']} changed) in {result['elapsed_ms']} ms using the {result['engine']} engine")
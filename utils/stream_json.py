@@ -0,0 +1,200 @@
+"""
+Incremental JSON parsing for LearnPath AI
+Pulls complete day objects out of a plan while the model is still writing it
+"""
+
+import json
+from typing import Dict, Iterable, List
+
+
+# Top-level arrays whose elements are emitted as soon as they are complete
+PLAN_ARRAY_KEYS = ("curriculum", "schedule", "timeline", "daily_plan", "weekly_focus")
+
+
+class StreamingPlanParser:
+    """
+    Incremental parser for a streamed plan object
+
+    Feed it text as it arrives. Each object inside one of the `array_keys`
+    arrays of the top-level JSON object is returned by feed() the moment its
+    closing brace arrives. Other top-level fields (overview, milestones, ...)
+    are kept once their value is complete, so a truncated stream still yields
+    every finished field and day via partial_plan().
+
+    Leading prose or a ```json fence before the first "{" is ignored, and a
+    bare top-level array of objects is treated as the day list, stored under
+    `bare_array_key`.
+
+    Only the text of the value still being read is buffered, so feeding a
+    long stream in small chunks stays linear.
+    """
+
+    def __init__(self, array_keys: Iterable[str] = PLAN_ARRAY_KEYS, bare_array_key: str = "curriculum"):
+        self.array_keys = set(array_keys)
+        self.bare_array_key = bare_array_key
+        self._text = ""            # Unconsumed tail of the stream
+        self._pos = 0              # Scan position in _text
+
+        self._stack = []           # Open '{' / '[' characters
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None   # Last string closed at the top level
+
+        self._key = None           # Current top-level key
+        self._value_start = None   # Where the current top-level value starts
+        self._array_key = None     # Key of the day array being read, if any
+        self._item_start = None    # Where the current day object starts
+
+        self._done = False         # Top-level value closed; ignore trailing prose
+
+        self.fields = {}
+        self.items = {}            # array key -> completed objects
+        self.errors = 0            # Day objects that failed to parse
+
+    def feed(self, chunk: str) -> List[Dict]:
+        """
+        Add streamed text
+
+        Returns:
+            Day objects completed by this chunk, in order
+        """
+        if self._done:
+            return []
+
+        self._text += chunk
+        text = self._text
+        completed = []
+
+        for pos in range(self._pos, len(text)):
+            char = text[pos]
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if len(self._stack) == 1:
+                        self._last_string = text[self._string_start:pos + 1]
+                continue
+
+            if char == '"':
+                if self._stack:
+                    self._in_string = True
+                    self._string_start = pos
+                continue
+
+            depth = len(self._stack)
+
+            if char in "{[":
+                if depth == 0:
+                    if char == "[":
+                        self._array_key = ""  # Bare array of days
+                elif depth == 1 and self._stack[0] == "{" and char == "[" and self._key in self.array_keys:
+                    self._array_key = self._key
+                    self._value_start = None  # Stored from items on close, not re-parsed
+                elif depth == 2 and char == "{" and self._array_key is not None and self._stack[1] == "[":
+                    self._item_start = pos
+                elif depth == 1 and self._stack[0] == "[" and char == "{" and self._array_key == "":
+                    self._item_start = pos
+                self._stack.append(char)
+                continue
+
+            if char in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+                depth = len(self._stack)
+
+                item_depth = 1 if self._array_key == "" else 2
+                if char == "}" and depth == item_depth and self._item_start is not None:
+                    item = self._parse_item(text[self._item_start:pos + 1])
+                    if item is not None:
+                        self.items.setdefault(self._array_key or self.bare_array_key, []).append(item)
+                        completed.append(item)
+                    self._item_start = None
+                elif char == "]" and depth == item_depth - 1 and self._array_key is not None:
+                    key = self._array_key or self.bare_array_key
+                    if key in self.items or self._array_key:
+                        self.fields[key] = list(self.items.get(key, []))
+                    self._array_key = None
+                    self._value_start = None
+                elif char == "}" and depth == 0:
+                    self._finish_value(text, pos)
+
+                if depth == 0:
+                    if self.fields or self.items:
+                        self._done = True
+                        break
+                    # A bracket in leading prose, not the plan itself
+                    self._array_key = None
+                continue
+
+            if depth == 1 and self._stack[0] == "{":
+                if char == ":":
+                    self._key = self._decode_key(self._last_string)
+                    self._value_start = pos + 1
+                elif char == ",":
+                    self._finish_value(text, pos)
+
+        self._discard_consumed(text)
+        return completed
+
+    def _discard_consumed(self, text: str):
+        """Keep only the text from the earliest start that is still needed"""
+        starts = [p for p in (self._item_start, self._value_start,
+                              self._string_start if self._in_string else None) if p is not None]
+        keep = min(starts) if starts else len(text)
+        if keep:
+            text = text[keep:]
+            if self._item_start is not None:
+                self._item_start -= keep
+            if self._value_start is not None:
+                self._value_start -= keep
+            if self._string_start is not None:
+                self._string_start -= keep
+        self._text = text
+        self._pos = len(text)
+
+    def _parse_item(self, raw: str):
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            self.errors += 1
+            return None
+        return item if isinstance(item, dict) else None
+
+    @staticmethod
+    def _decode_key(raw: str):
+        try:
+            return json.loads(raw) if raw else None
+        except ValueError:
+            return None
+
+    def _finish_value(self, text: str, end: int):
+        """Store a completed top-level scalar/object/array value"""
+        if self._key is not None and self._value_start is not None and self._key not in self.fields:
+            try:
+                self.fields[self._key] = json.loads(text[self._value_start:end])
+            except ValueError:
+                pass
+        self._key = None
+        self._value_start = None
+
+    @property
+    def complete(self) -> bool:
+        """Whether the top-level JSON value has been closed"""
+        return self._done
+
+    def partial_plan(self) -> Dict:
+        """
+        Everything complete so far, shaped like the final plan
+
+        Day arrays that were cut off contain every object that finished.
+        """
+        plan = dict(self.fields)
+        for key, items in self.items.items():
+            plan[key] = list(items)
+        return plan